@@ -1,32 +1,131 @@
 from django.contrib import admin
-from .models import Room, Booking, TeamMember, GalleryImage
+from .models import (
+    ArchivedBooking,
+    ArchivedContactMessage,
+    Booking,
+    GalleryImage,
+    Hotel,
+    MediaBlob,
+    Review,
+    Room,
+    TeamMember,
+    WaitlistEntry,
+)
+from .search import search
+
+
+class FullTextSearchMixin:
+    """
+    Extend admin search with hits from the full-text index (hotel.search).
+    """
+
+    search_kind = None
+    search_limit = 1000
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            ids = [hit["id"] for hit in search(search_term, [self.search_kind], self.search_limit)]
+            results |= queryset.filter(pk__in=ids)
+        return results, may_have_duplicates
+
+
+@admin.register(Hotel)
+class HotelAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "is_active", "created_at")
+    search_fields = ("name", "slug")
+    list_filter = ("is_active",)
+    prepopulated_fields = {"slug": ("name",)}
 
 
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
-    list_display = ("number", "room_type", "price_per_night", "capacity", "is_available")
+class RoomAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ("number", "hotel", "room_type", "price_per_night", "capacity", "is_available", "rating")
     search_fields = ("number", "room_type")
-    list_filter = ("room_type", "is_available")
+    search_kind = "room"
+    list_filter = ("hotel", "room_type", "is_available")
+    # Maintained from the reviews (hotel.reviews)
+    readonly_fields = Room.RATING_FIELDS
 
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "room", "check_in", "check_out", "status", "created_at")
+    list_display = ("id", "hotel", "user", "room", "check_in", "check_out", "status", "created_at")
     search_fields = ("user__username", "room__number")
-    list_filter = ("status",)
+    list_filter = ("hotel", "status")
     raw_id_fields = ("user", "room")
 
 
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ("id", "room", "user", "rating", "created_at")
+    list_filter = ("rating",)
+    search_fields = ("user__username", "room__number", "comment")
+    raw_id_fields = ("room", "user", "booking")
+    readonly_fields = ("created_at",)
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "hotel", "user", "room_type", "check_in", "check_out", "status", "created_at")
+    list_filter = ("hotel", "status", "room_type")
+    search_fields = ("user__username",)
+    raw_id_fields = ("user", "booking")
+    readonly_fields = ("created_at", "offered_at")
+
+
 @admin.register(TeamMember)
 class TeamMemberAdmin(admin.ModelAdmin):
-    list_display = ("name", "role", "order")
+    list_display = ("name", "hotel", "role", "order")
+    list_filter = ("hotel",)
     search_fields = ("name", "role")
     ordering = ("order", "id")
 
 
 @admin.register(GalleryImage)
-class GalleryImageAdmin(admin.ModelAdmin):
-    list_display = ("__str__", "is_featured", "created_at")
-    list_filter = ("is_featured", "created_at")
+class GalleryImageAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ("__str__", "hotel", "is_featured", "created_at")
+    list_filter = ("hotel", "is_featured", "created_at")
     search_fields = ("title",)
+    search_kind = "gallery"
     readonly_fields = ("created_at",)
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Archived rows are history: viewable, never edited."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(ReadOnlyAdmin):
+    list_display = ("id", "hotel", "username", "room_number", "check_in", "check_out", "status", "archived_at")
+    search_fields = ("username", "room_number")
+    list_filter = ("hotel", "status")
+
+
+@admin.register(ArchivedContactMessage)
+class ArchivedContactMessageAdmin(ReadOnlyAdmin):
+    list_display = ("__str__", "email", "created_at", "archived_at")
+    search_fields = ("name", "email", "subject")
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """Counts are maintained by hotel.media; use `cleanup_media` to delete."""
+
+    list_display = ("name", "refcount", "orphaned_at", "created_at")
+    search_fields = ("name",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,218 @@
+"""
+Room assignment: bookings made against a room type get a physical room
+chosen to keep each room's calendar tightly packed.
+
+New bookings get a best-fit room straight away (`best_room`), and
+`reoptimize` periodically re-packs every future unlocked booking of a type
+with an interval-scheduling sweep (`assign`), so nights left between stays
+are long enough to sell instead of scattered single-night gaps.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict, deque, namedtuple
+from datetime import timedelta
+from itertools import product
+
+from django.db import transaction
+from django.db.models import Exists, Max, Min, OuterRef, Q
+from django.utils import timezone
+
+from .bookings import overlapping
+from .feed import record
+from .models import Booking, Hotel, Room
+from .summaries import invalidate_booking_summaries
+
+# Free gaps shorter than this many nights are considered unsellable.
+MIN_STAY = 2
+
+# Dates are date ordinals so the sweep works on plain ints
+Stay = namedtuple("Stay", "id room check_in check_out guests locked")
+
+
+# ---------- CORE ----------
+
+def assign(capacities, stays):
+    """
+    Assign every unlocked stay to a room, keeping locked stays where they
+    are. `capacities` maps room id -> capacity for the candidate rooms.
+
+    Stays are swept in check-in order; each unlocked stay goes to the room
+    that became free most recently before its check-in (best fit), which
+    minimises the gap left in front of it. Returns {stay id: room id}, or
+    None if the stays don't fit.
+    """
+    locked = defaultdict(deque)
+    for stay in sorted(stays, key=lambda s: s.check_in):
+        if stay.locked:
+            locked[stay.room].append(stay.check_in)
+
+    floor = min((stay.check_in for stay in stays), default=0) - 1
+    room_end = {room: floor for room in capacities}
+    ends = sorted((floor, room) for room in capacities)
+
+    def place(room, check_out):
+        old = room_end[room]
+        if check_out > old:
+            del ends[bisect_left(ends, (old, room))]
+            insort(ends, (check_out, room))
+            room_end[room] = check_out
+
+    # Locked stays first on the same day; longer stays first among the rest
+    order = sorted(stays, key=lambda s: (s.check_in, not s.locked, s.check_in - s.check_out))
+    result = {}
+    for stay in order:
+        if stay.locked:
+            locked[stay.room].popleft()
+            if stay.room in room_end:
+                place(stay.room, stay.check_out)
+            result[stay.id] = stay.room
+            continue
+
+        i = bisect_right(ends, (stay.check_in, float("inf"))) - 1
+        while i >= 0:
+            room = ends[i][1]
+            upcoming = locked[room]
+            if capacities[room] >= stay.guests and (not upcoming or upcoming[0] >= stay.check_out):
+                break
+            i -= 1
+        else:
+            return None
+        result[stay.id] = room
+        place(room, stay.check_out)
+    return result
+
+
+def orphan_nights(assignment, stays, min_stay=MIN_STAY):
+    """
+    Nights left free between two stays in the same room by gaps shorter
+    than `min_stay`, i.e. nights that can't realistically be sold.
+    """
+    by_room = defaultdict(list)
+    for stay in stays:
+        by_room[assignment[stay.id]].append((stay.check_in, stay.check_out))
+    total = 0
+    for intervals in by_room.values():
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            if 0 < start - end < min_stay:
+                total += start - end
+    return total
+
+
+# ---------- DATABASE ----------
+
+def best_room(hotel, room_type, check_in, check_out, guests):
+    """
+    The free room of `room_type` in `hotel` whose neighbouring bookings
+    leave the smallest (and fewest unsellable) gaps around the stay, or None.
+    """
+    active = Q(bookings__status__in=Booking.ACTIVE_STATUSES)
+    rooms = (
+        Room.objects.filter(hotel=hotel, room_type=room_type, is_available=True, capacity__gte=guests)
+        .exclude(id__in=overlapping(check_in, check_out, hotel).values("room_id"))
+        .annotate(
+            prev_end=Max("bookings__check_out", filter=active & Q(bookings__check_out__lte=check_in)),
+            next_start=Min("bookings__check_in", filter=active & Q(bookings__check_in__gte=check_out)),
+        )
+        .order_by("number")
+    )
+
+    def score(room):
+        gaps = [
+            (check_in - room.prev_end).days if room.prev_end else None,
+            (room.next_start - check_out).days if room.next_start else None,
+        ]
+        orphans = sum(1 for gap in gaps if gap is not None and 0 < gap < MIN_STAY)
+        return orphans, sum(gap if gap is not None else 10**6 for gap in gaps)
+
+    return min(rooms, key=score, default=None)
+
+
+def _load_stays(hotel_id, room_type, start, end):
+    capacities = dict(
+        Room.objects.filter(hotel_id=hotel_id, room_type=room_type, is_available=True).values_list("id", "capacity")
+    )
+    rows = (
+        Booking.objects.filter(
+            hotel_id=hotel_id, status__in=Booking.ACTIVE_STATUSES, check_out__gt=start, check_in__lt=end
+        )
+        .filter(Q(room_id__in=list(capacities)) | Q(room_type=room_type, room_locked=False))
+        .values_list("id", "room_id", "check_in", "check_out", "guests", "room_locked", "room_type")
+    )
+    stays = [
+        Stay(
+            booking_id,
+            room_id,
+            check_in.toordinal(),
+            check_out.toordinal(),
+            guests,
+            # Stays that already started, or were booked for a specific
+            # room, stay put.
+            locked or room_type != rtype or check_in <= start,
+        )
+        for booking_id, room_id, check_in, check_out, guests, locked, rtype in rows
+    ]
+    return capacities, stays
+
+
+def reoptimize(room_types=None, days=365, dry_run=False, hotels=None):
+    """
+    Re-pack future unlocked bookings for the next `days` days, one hotel
+    and room type at a time. Returns stats keyed by (hotel slug, room
+    type): bookings moved, unsellable nights before/after, and the error
+    that left that type unchanged, if any.
+    """
+    start = timezone.localdate()
+    end = start + timedelta(days=days)
+    stats = {}
+    hotels = hotels if hotels is not None else Hotel.objects.filter(is_active=True)
+    for hotel, room_type in product(hotels, room_types or [choice for choice, _ in Room.ROOM_TYPES]):
+        stats[hotel.slug, room_type] = _reoptimize_type(hotel, room_type, start, end, dry_run)
+    return stats
+
+
+def _reoptimize_type(hotel, room_type, start, end, dry_run):
+    with transaction.atomic():
+        capacities, stays = _load_stays(hotel.id, room_type, start, end)
+        # Lock the rooms (PostgreSQL) while we move bookings between them
+        list(Room.objects.select_for_update().filter(id__in=list(capacities)).values_list("id", flat=True))
+
+        current = {stay.id: stay.room for stay in stays}
+        before = orphan_nights(current, stays)
+        row = {"moved": 0, "orphans_before": before, "orphans_after": None, "error": None}
+        assignment = assign(capacities, stays)
+        if assignment is None:
+            return row
+
+        after = orphan_nights(assignment, stays)
+        moved = [stay_id for stay_id, room in assignment.items() if current[stay_id] != room]
+        if after >= before:
+            # The sweep is a heuristic; only move guests for a real gain
+            moved, after = [], before
+        row.update(moved=len(moved), orphans_after=after)
+        if dry_run or not moved:
+            return row
+
+        Booking.objects.bulk_update(
+            [Booking(id=stay_id, hotel_id=hotel.id, room_id=assignment[stay_id]) for stay_id in moved],
+            ["room"],
+            batch_size=500,
+        )
+        # A booking created while we were computing could collide with a
+        # moved one; roll this type back rather than double-book. Only the
+        # moved bookings can have gained a clash.
+        clash = Booking.objects.filter(id__in=moved).filter(
+            Exists(
+                overlapping(OuterRef("check_in"), OuterRef("check_out"))
+                .filter(room_id=OuterRef("room_id"))
+                .exclude(pk=OuterRef("pk"))
+            )
+        )
+        if clash.exists():
+            # Only this type is rolled back; the others go ahead
+            transaction.set_rollback(True)
+            row.update(moved=0, orphans_after=before, error="Concurrent bookings changed these rooms, try again.")
+            return row
+        moved_bookings = list(Booking.objects.filter(id__in=moved))
+        record(moved_bookings)
+        invalidate_booking_summaries(booking.user_id for booking in moved_bookings)
+    return row
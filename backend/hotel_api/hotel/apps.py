@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class HotelConfig(AppConfig):
     name = "hotel"
+
+    def ready(self):
+        # Signal handlers keeping the search index, caches and media
+        # reference counts fresh
+        from . import ari, feed, hotels, media, reviews, search, similarity, summaries, waitlist  # noqa: F401
@@ -0,0 +1,121 @@
+"""
+Archival of history out of the hot tables.
+
+Bookings that checked out more than ARCHIVE["BOOKING_MONTHS"] ago and read
+contact messages older than ARCHIVE["MESSAGE_DAYS"] are copied to
+ArchivedBooking / ArchivedContactMessage and deleted from the live tables,
+so Booking and ContactMessage (and their indexes) only hold recent data.
+
+Work is done in batches of ARCHIVE["BATCH_SIZE"] rows, each in its own
+transaction: copy, then delete exactly the copied ids. An interrupted run
+loses nothing and the next run carries on where it stopped.
+"""
+import calendar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .feed import deletes_recorded_as
+from .models import ArchivedBooking, ArchivedContactMessage, Booking, ContactMessage, Hotel
+
+DEFAULTS = {"BOOKING_MONTHS": 12, "MESSAGE_DAYS": 90, "BATCH_SIZE": 1000}
+
+
+def get_archive_setting(name):
+    return getattr(settings, "ARCHIVE", {}).get(name, DEFAULTS[name])
+
+
+def months_before(day, months):
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    # Clamp to the end of shorter months (e.g. 31 March - 1 month)
+    last = calendar.monthrange(year, month + 1)[1]
+    return day.replace(year=year, month=month + 1, day=min(day.day, last))
+
+
+def booking_cutoff(months=None, today=None):
+    months = get_archive_setting("BOOKING_MONTHS") if months is None else months
+    return months_before(today or timezone.localdate(), months)
+
+
+def message_cutoff(days=None, now=None):
+    days = get_archive_setting("MESSAGE_DAYS") if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def _archived_booking(booking):
+    return ArchivedBooking(
+        id=booking.id,
+        hotel_id=booking.hotel_id,
+        user_id=booking.user_id,
+        username=booking.user.username,
+        room_id=booking.room_id,
+        room_number=booking.room.number,
+        room_type=booking.room.room_type,
+        price_per_night=booking.price_per_night,
+        check_in=booking.check_in,
+        check_out=booking.check_out,
+        guests=booking.guests,
+        status=booking.status,
+        checked_in_at=booking.checked_in_at,
+        created_at=booking.created_at,
+    )
+
+
+def _archived_message(message):
+    return ArchivedContactMessage(
+        id=message.id,
+        name=message.name,
+        email=message.email,
+        subject=message.subject,
+        message=message.message,
+        created_at=message.created_at,
+    )
+
+
+def _move(queryset, to_archive, archive_model, batch_size, dry_run):
+    """
+    Copy `queryset` rows to `archive_model` and delete them, a batch at a
+    time. Returns the number of rows moved (or that would be, on dry_run).
+    """
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(queryset.order_by("pk")[:batch_size])
+            if not batch:
+                return total
+            archive_model.objects.bulk_create([to_archive(row) for row in batch])
+            # Deleting through the ORM fires post_delete, which keeps the
+            # search index and cached summaries in step; the change feed
+            # records an `archive`, not a `delete`.
+            with deletes_recorded_as("archive"):
+                queryset.model.objects.filter(pk__in=[row.pk for row in batch]).delete()
+        total += len(batch)
+
+
+def archive_bookings(months=None, batch_size=None, dry_run=False, today=None):
+    """
+    Archive bookings that checked out before the cutoff, hotel by hotel so
+    the (hotel, check_out) index drives the scan. Returns {hotel slug: count}.
+    """
+    cutoff = booking_cutoff(months, today)
+    batch_size = batch_size or get_archive_setting("BATCH_SIZE")
+    moved = {}
+    for hotel in Hotel.objects.all():
+        queryset = Booking.objects.filter(hotel=hotel, check_out__lt=cutoff).select_related("user", "room")
+        moved[hotel.slug] = _move(queryset, _archived_booking, ArchivedBooking, batch_size, dry_run)
+    return moved
+
+
+def archive_messages(days=None, batch_size=None, dry_run=False, now=None):
+    """
+    Archive read contact messages created before the cutoff. Unread
+    messages are never archived. Returns the count.
+    """
+    queryset = ContactMessage.objects.filter(is_read=True, created_at__lt=message_cutoff(days, now))
+    batch_size = batch_size or get_archive_setting("BATCH_SIZE")
+    return _move(queryset, _archived_message, ArchivedContactMessage, batch_size, dry_run)
@@ -0,0 +1,356 @@
+"""
+ARI (availability, rates and inventory) feed for channel managers.
+
+Channel managers sell rooms by room type and night. AriNight holds what
+was last exported for each (hotel, room type, night) of the next
+ARI["HORIZON_DAYS"]: rooms free to sell, rooms in service and the lowest
+nightly price. Whenever a value changes the new values are also appended
+to AriChange, whose position is the cursor consumers pull deltas from:
+
+    GET /api/admin/ari/changes/?after=<cursor>
+
+returns the nights changed after the cursor, each once with its latest
+values, as compact rows. A consumer starts from the gzipped snapshot
+written by `export_ari` (GET /api/admin/ari/snapshot/), which carries the
+cursor it was taken at, and follows the deltas from there: the work of a
+sync is proportional to what changed, not to the inventory.
+
+Every booking and room write goes through hotel.feed.record, which sends
+`changes_recorded`. The nights it touches (a booking's stay, or the whole
+horizon of a room's type) are recomputed after the transaction commits
+and compared with AriNight, so only real changes are logged. A refresh
+reads and writes a room type in one transaction holding its AriLock row,
+so two refreshes can't commit in the opposite order of their reads and
+leave older availability behind.
+
+Refreshes of different room types commit in any order, so a change's id
+can be below one a consumer already read. As in hotel.feed, the cursor is
+`position` instead, handed out by `sequence` after the refresh commits in
+the order the changes became readable; unsequenced changes are never
+read, and the next refresh (or `export_ari`) sequences any a crashed
+process left behind. `export_ari` also recomputes every night, which
+rolls the horizon forward daily and repairs anything missed, before
+writing the snapshots and pruning changes older than ARI["RETENTION"].
+"""
+import gzip
+import os
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Min
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bookings import overlapping
+from .models import AriChange, AriLock, AriNight, AriSequence, Booking, Hotel, Room
+from .renderers import dumps
+from .signals import changes_recorded
+from .snapshots import stored
+
+DEFAULTS = {
+    "HORIZON_DAYS": 365,
+    "BATCH_SIZE": 5000,
+    "RETENTION": timedelta(days=7),
+    "SNAPSHOT_DIR": None,
+}
+
+# Columns of the rows in deltas and snapshots
+FIELDS = ("room_type", "date", "available", "inventory", "rate")
+
+
+def get_ari_setting(name):
+    return getattr(settings, "ARI", {}).get(name, DEFAULTS[name])
+
+
+def horizon(today=None):
+    today = today or timezone.localdate()
+    return today, today + timedelta(days=get_ari_setting("HORIZON_DAYS"))
+
+
+def lock_room_type(hotel_id, room_type):
+    """
+    Lock a room type's ARI until the transaction ends. The first statement
+    is a write, so SQLite takes its write lock here too instead of failing
+    to upgrade a read lock later.
+    """
+    now = timezone.now()
+    if AriLock.objects.filter(hotel_id=hotel_id, room_type=room_type).update(refreshed_at=now):
+        return
+    try:
+        with transaction.atomic():
+            AriLock.objects.create(hotel_id=hotel_id, room_type=room_type, refreshed_at=now)
+    except IntegrityError:
+        # Created concurrently: wait for its holder
+        AriLock.objects.filter(hotel_id=hotel_id, room_type=room_type).update(refreshed_at=now)
+
+
+def refresh(hotel_id, room_type, start, end):
+    """
+    Recompute a room type's nights in [start, end) (clipped to the
+    horizon) and store the ones that changed. Returns how many did.
+    """
+    first, last = horizon()
+    start, end = max(start, first), min(end, last)
+    if start >= end:
+        return 0
+    with transaction.atomic():
+        lock_room_type(hotel_id, room_type)
+        changed = _refresh(hotel_id, room_type, start, end)
+        if changed:
+            transaction.on_commit(sequence, robust=True)
+        return changed
+
+
+def _refresh(hotel_id, room_type, start, end):
+    days = (end - start).days
+
+    rooms = Room.objects.filter(hotel_id=hotel_id, room_type=room_type, is_available=True).aggregate(
+        inventory=Count("id"), rate=Min("price_per_night")
+    )
+    inventory, rate = rooms["inventory"], rooms["rate"]
+    stays = (
+        overlapping(start, end)
+        .filter(hotel_id=hotel_id, room__room_type=room_type, room__is_available=True)
+        .values_list("check_in", "check_out")
+    )
+    # Rooms sold per night as a running sum of arrivals and departures
+    delta = [0] * (days + 1)
+    for check_in, check_out in stays:
+        delta[max((check_in - start).days, 0)] += 1
+        delta[min((check_out - start).days, days)] -= 1
+    wanted, sold = {}, 0
+    for offset in range(days):
+        sold += delta[offset]
+        wanted[start + timedelta(days=offset)] = (max(inventory - sold, 0), inventory, rate)
+
+    stored = {
+        date: values
+        for date, *values in AriNight.objects.filter(
+            hotel_id=hotel_id, room_type=room_type, date__gte=start, date__lt=end
+        ).values_list("date", "available", "inventory", "rate")
+    }
+    changed = [(date, values) for date, values in wanted.items() if tuple(stored.get(date, ())) != values]
+    AriNight.objects.bulk_create(
+        [
+            AriNight(hotel_id=hotel_id, room_type=room_type, date=date, available=available, inventory=total, rate=price)
+            for date, (available, total, price) in changed
+        ],
+        update_conflicts=True,
+        unique_fields=["hotel", "room_type", "date"],
+        update_fields=["available", "inventory", "rate"],
+    )
+    AriChange.objects.bulk_create(
+        AriChange(hotel_id=hotel_id, room_type=room_type, date=date, available=available, inventory=total, rate=price)
+        for date, (available, total, price) in changed
+    )
+    return len(changed)
+
+
+def refresh_nights(nights):
+    """`nights` maps (hotel_id, room_type) to a (start, end) range."""
+    return sum(refresh(hotel_id, room_type, start, end) for (hotel_id, room_type), (start, end) in nights.items())
+
+
+def sync_hotel(hotel_id):
+    """Recompute every night of the horizon and drop past ones."""
+    first, last = horizon()
+    changed = sum(refresh(hotel_id, room_type, first, last) for room_type, _ in Room.ROOM_TYPES)
+    AriNight.objects.filter(hotel_id=hotel_id, date__lt=first).delete()
+    return changed
+
+
+def sync_all():
+    return sum(sync_hotel(hotel_id) for hotel_id in Hotel.objects.values_list("id", flat=True))
+
+
+# ---------- SIGNALS ----------
+
+@receiver(pre_save, sender=Booking)
+def remember_stay(sender, instance, raw=False, **kwargs):
+    row = None if raw else stored(instance)
+    instance._ari_before = row and (row["room_id"], row["check_in"], row["check_out"])
+
+
+@receiver(pre_save, sender=Room)
+def remember_room_type(sender, instance, raw=False, **kwargs):
+    row = None if raw else stored(instance)
+    instance._ari_before = row and (row["hotel_id"], row["room_type"])
+
+
+def _widen(nights, key, start, end):
+    if key in nights:
+        start, end = min(start, nights[key][0]), max(end, nights[key][1])
+    nights[key] = (start, end)
+
+
+def _stay(booking):
+    # The instance holds what the caller assigned, e.g. "2041-01-01"
+    to_date = Booking._meta.get_field("check_in").to_python
+    return booking.room_id, to_date(booking.check_in), to_date(booking.check_out)
+
+
+@receiver(changes_recorded)
+def follow_changes(sender, instances, **kwargs):
+    first, last = horizon()
+    nights, stays = {}, []
+    for instance in instances:
+        if isinstance(instance, Room):
+            # Price, type or service changes move every night of the type
+            _widen(nights, (instance.hotel_id, instance.room_type), first, last)
+            before = getattr(instance, "_ari_before", None)
+            if before:
+                _widen(nights, before, first, last)
+        elif isinstance(instance, Booking):
+            stays.append(_stay(instance))
+            before = getattr(instance, "_ari_before", None)
+            if before:
+                stays.append(before)
+    stays = [(room_id, check_in, check_out) for room_id, check_in, check_out in stays if check_out > first]
+    if stays:
+        # Bulk writes may leave Booking.room_type blank: go by the room
+        rooms = {
+            room_id: (hotel_id, room_type)
+            for room_id, hotel_id, room_type in Room.objects.filter(
+                id__in={room_id for room_id, _, _ in stays}
+            ).values_list("id", "hotel_id", "room_type")
+        }
+        for room_id, check_in, check_out in stays:
+            if room_id in rooms:
+                _widen(nights, rooms[room_id], check_in, check_out)
+    if nights:
+        # A failed refresh is logged and repaired by `export_ari`; the
+        # write that triggered it has already committed
+        transaction.on_commit(partial(refresh_nights, nights), robust=True)
+
+
+# ---------- SEQUENCING ----------
+
+def _lock_sequence(now):
+    """
+    The AriSequence row, locked until the transaction ends. The first
+    statement is a write, so SQLite takes its write lock here too.
+    """
+    if not AriSequence.objects.filter(pk=1).update(sequenced_at=now):
+        try:
+            with transaction.atomic():
+                position = AriChange.objects.aggregate(position=Max("position"))["position"] or 0
+                AriSequence.objects.create(pk=1, position=position, sequenced_at=now)
+        except IntegrityError:
+            # Created concurrently: wait for its holder
+            AriSequence.objects.filter(pk=1).update(sequenced_at=now)
+    return AriSequence.objects.get(pk=1)
+
+
+def sequence():
+    """
+    Give the committed changes without a position the next positions, in
+    id order. Returns how many were sequenced.
+    """
+    if not AriChange.objects.filter(position__isnull=True).exists():
+        return 0
+    with transaction.atomic():
+        state = _lock_sequence(timezone.now())
+        ids = AriChange.objects.filter(position__isnull=True).order_by("id").values_list("id", flat=True)
+        changes = [AriChange(id=change_id, position=state.position + n) for n, change_id in enumerate(ids, 1)]
+        AriChange.objects.bulk_update(changes, ["position"], batch_size=500)
+        AriSequence.objects.filter(pk=1).update(position=state.position + len(changes))
+    return len(changes)
+
+
+# ---------- READING ----------
+
+def latest_cursor():
+    return AriChange.objects.aggregate(cursor=Max("position"))["cursor"] or 0
+
+
+def cursor_expired(cursor):
+    """True when changes after `cursor` may already have been pruned."""
+    positions = AriChange.objects.filter(position__isnull=False).order_by("position")
+    oldest = positions.values_list("position", flat=True).first()
+    return cursor > 0 and oldest is not None and cursor < oldest - 1
+
+
+def _row(room_type, date, available, inventory, rate):
+    return [room_type, date, available, inventory, None if rate is None else f"{rate:.2f}"]
+
+
+def read_deltas(hotel, cursor):
+    """
+    One page of deltas: {"cursor", "reset", "more", "fields", "changes"},
+    each changed night once with its latest values. Without a cursor it
+    starts from now; `reset` means changes were pruned past the cursor and
+    the client must reload the snapshot.
+    """
+    page = {"cursor": cursor, "reset": False, "more": False, "fields": FIELDS, "changes": []}
+    if cursor is None or cursor_expired(cursor):
+        return {**page, "cursor": latest_cursor(), "reset": cursor is not None}
+
+    batch_size = get_ari_setting("BATCH_SIZE")
+    rows = list(
+        AriChange.objects.filter(hotel=hotel, position__gt=cursor)
+        .order_by("position")
+        .values_list("position", *FIELDS)[:batch_size]
+    )
+    latest = {}
+    for position, room_type, date, *values in rows:
+        # Keep a night's last values, in the order of its last change
+        latest.pop((room_type, date), None)
+        latest[room_type, date] = _row(room_type, date, *values)
+    if rows:
+        page.update(cursor=rows[-1][0], more=len(rows) == batch_size, changes=list(latest.values()))
+    return page
+
+
+# ---------- SNAPSHOTS ----------
+
+def snapshot_path(hotel):
+    directory = get_ari_setting("SNAPSHOT_DIR") or Path(settings.BASE_DIR) / "var" / "ari"
+    return Path(directory) / f"{hotel.slug}.json.gz"
+
+
+def build_snapshot(hotel):
+    today = timezone.localdate()
+    with transaction.atomic():
+        # Cursor first: changes after it are replayed on top of the
+        # snapshot, and replaying a night it already has is harmless
+        cursor = latest_cursor()
+        nights = [
+            _row(*row)
+            for row in AriNight.objects.filter(hotel=hotel, date__gte=today)
+            .order_by("room_type", "date")
+            .values_list(*FIELDS)
+        ]
+    return {
+        "hotel": hotel.slug,
+        "cursor": cursor,
+        "generated_at": timezone.now(),
+        "fields": FIELDS,
+        "nights": nights,
+    }
+
+
+def write_snapshot(hotel):
+    """Write the hotel's snapshot file, replacing the previous one atomically."""
+    path = snapshot_path(hotel)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(path.name + ".part")
+    with gzip.open(partial_path, "wb") as file:
+        file.write(dumps(build_snapshot(hotel)))
+    os.replace(partial_path, path)
+    return path
+
+
+# ---------- MAINTENANCE ----------
+
+def prune(retention=None):
+    """Delete changes older than `retention`. Returns the number deleted."""
+    # Also sequences changes a crashed process left behind
+    sequence()
+    cutoff = timezone.now() - (get_ari_setting("RETENTION") if retention is None else retention)
+    with transaction.atomic():
+        deleted, _ = AriChange.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
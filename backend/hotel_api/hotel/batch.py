@@ -0,0 +1,176 @@
+"""
+Batched API calls: POST /api/batch/ runs several sub-requests in one round
+trip.
+
+    {"requests": [
+        {"method": "GET", "path": "/api/auth/me/"},
+        {"method": "GET", "path": "/api/rooms/?fields=id,number,image"},
+        {"method": "POST", "path": "/api/contact/", "body": {...}}
+    ]}
+
+Each sub-request is resolved against the URLconf and handed to its view
+in-process, with the outer request's headers (X-Hotel, language, ...) plus
+its own `headers`, and authenticated as the outer request's user without
+decoding the token again. The reply lists {"status", "headers", "body"} in
+request order. Sub-requests are independent: one failing doesn't stop the
+others and nothing is rolled back (/api/bookings/group/ is all-or-nothing).
+
+Writes run one at a time, in order, on the request's own database
+connection. Consecutive reads between them run concurrently on up to
+BATCH["READ_WORKERS"] threads; Django connections are per thread, so each
+worker opens its own and closes it when done. With READ_WORKERS = 1 every
+sub-request shares the request's connection, which is usually the faster
+choice on SQLite. Inside a transaction reads always run inline, so they
+see its uncommitted writes.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, connections
+from django.urls import Resolver404, resolve
+
+from .renderers import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "MAX_REQUESTS": 20,
+    "READ_WORKERS": 4,
+}
+
+API_PREFIX = "/api/"
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE")
+READ_METHODS = ("GET", "HEAD")
+BATCH_URL_NAME = "batch"
+
+# Response headers passed back; the rest only describe the outer transport
+RESPONSE_HEADERS = ("Content-Type", "Location", "ETag", "Last-Modified", "Retry-After", "Allow")
+# Outer request headers that must not leak into sub-requests (a call
+# sends its own Idempotency-Key in `headers`)
+DROPPED_META = (
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_MATCH",
+    "HTTP_RANGE",
+    "HTTP_CONTENT_ENCODING",
+    "HTTP_IDEMPOTENCY_KEY",
+)
+
+
+def get_batch_setting(name):
+    return getattr(settings, "BATCH", {}).get(name, DEFAULTS[name])
+
+
+def build_request(request, call):
+    """A WSGIRequest for one sub-request, carrying the outer request's META."""
+    url = urlsplit(call["path"])
+    payload = b"" if call.get("body") is None else dumps(call["body"])
+
+    meta = {key: value for key, value in request.META.items() if key not in DROPPED_META}
+    meta.update(
+        {
+            "REQUEST_METHOD": call["method"],
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(payload)),
+            "HTTP_ACCEPT": "application/json",
+            "wsgi.input": BytesIO(payload),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    for name, value in call.get("headers", {}).items():
+        key = name.upper().replace("-", "_")
+        meta[key if key in ("CONTENT_TYPE", "CONTENT_LENGTH") else "HTTP_" + key] = value
+
+    sub_request = WSGIRequest(meta)
+    if request.user.is_authenticated:
+        # DRF authenticates the sub-request as this user instead of
+        # decoding the JWT again
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def error(status, detail):
+    return {"status": status, "headers": {"Content-Type": "application/json"}, "body": {"detail": detail}}
+
+
+def to_result(response):
+    content_type = response.get("Content-Type", "")
+    body = None
+    if response.content:
+        if content_type.startswith("application/json"):
+            body = loads(response.content)
+        else:
+            body = response.content.decode(response.charset, "replace")
+    headers = {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)}
+    return {"status": response.status_code, "headers": headers, "body": body}
+
+
+def run_call(request, call):
+    """Dispatch one sub-request to its view and return its result."""
+    sub_request = build_request(request, call)
+    try:
+        match = resolve(sub_request.path_info)
+    except Resolver404:
+        return error(404, "Not found.")
+    if match.url_name == BATCH_URL_NAME:
+        return error(400, "Batches can't be nested.")
+
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+    except Exception:
+        logger.exception("Batched %s %s failed", call["method"], call["path"])
+        return error(500, "Server error.")
+
+    if response.streaming:
+        response.close()
+        return error(400, f"{call['path']} streams its response; call it directly.")
+    return to_result(response)
+
+
+def _run_read(request, call):
+    try:
+        return run_call(request, call)
+    finally:
+        # This worker thread's own connections
+        connections.close_all()
+
+
+def run_reads(request, calls, indexes, results):
+    workers = min(get_batch_setting("READ_WORKERS"), len(indexes))
+    if workers <= 1 or connection.in_atomic_block:
+        for index in indexes:
+            results[index] = run_call(request, calls[index])
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Each thread runs in a copy of this context (replica routing state)
+        futures = {index: pool.submit(copy_context().run, _run_read, request, calls[index]) for index in indexes}
+    for index, future in futures.items():
+        results[index] = future.result()
+
+
+def run_batch(request, calls):
+    """Results for `calls` in order; reads between writes run concurrently."""
+    results = [None] * len(calls)
+    reads = []
+    for index, call in enumerate(calls):
+        if call["method"] in READ_METHODS:
+            reads.append(index)
+            continue
+        if reads:
+            run_reads(request, calls, reads, results)
+            reads = []
+        results[index] = run_call(request, call)
+    if reads:
+        run_reads(request, calls, reads, results)
+    return results
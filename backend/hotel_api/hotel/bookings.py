@@ -0,0 +1,264 @@
+"""
+Booking lifecycle: status transitions and expiry of stale pending holds.
+
+A new booking is a pending hold on the room. It must be confirmed within
+settings.BOOKING_HOLD_TTL, otherwise `expire_stale_holds` (run by the
+`expire_bookings` command) moves it to expired so it stops blocking
+inventory. Every status change is recorded in the change feed (hotel.feed)
+and announced with the `booking_status_changed` signal once the
+transaction commits.
+"""
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from .feed import record
+from .models import Booking, Room
+from .signals import booking_status_changed
+from .summaries import invalidate_booking_summaries
+
+
+class InvalidTransition(ValueError):
+    pass
+
+
+def get_hold_ttl():
+    return getattr(settings, "BOOKING_HOLD_TTL", timedelta(minutes=30))
+
+
+def hold_expired(booking, now=None):
+    return booking.status == "pending" and booking.created_at < (now or timezone.now()) - get_hold_ttl()
+
+
+def _announce(bookings, from_status, to_status):
+    # Status changes are conditional UPDATEs, which send no post_save.
+    # Receivers run after commit: their errors are logged, not raised to a
+    # caller whose change already committed.
+    record(bookings)
+    transaction.on_commit(
+        partial(
+            booking_status_changed.send_robust,
+            sender=Booking,
+            bookings=bookings,
+            from_status=from_status,
+            to_status=to_status,
+        )
+    )
+
+
+def transition(booking, to_status):
+    """
+    Move `booking` to `to_status`, raising InvalidTransition for illegal
+    changes or when another request changed the status first.
+    """
+    from_status = booking.status
+    if to_status == from_status:
+        return booking
+    if not booking.can_transition_to(to_status):
+        raise InvalidTransition(f"Cannot change booking from {from_status} to {to_status}.")
+    if to_status == "confirmed" and hold_expired(booking):
+        expire_hold(booking)
+        raise InvalidTransition("The hold on this booking has expired.")
+
+    with transaction.atomic():
+        # Conditional UPDATE so concurrent transitions can't both win
+        updated = Booking.objects.filter(pk=booking.pk, status=from_status).update(status=to_status)
+        if not updated:
+            booking.refresh_from_db(fields=["status"])
+            raise InvalidTransition(f"Booking is already {booking.status}.")
+        booking.status = to_status
+        _announce([booking], from_status, to_status)
+    return booking
+
+
+def expire_hold(booking, now=None):
+    """
+    Expire one pending booking whose hold has run out, with the same
+    conditional UPDATE as the sweep. Returns True if this call expired it.
+    """
+    cutoff = (now or timezone.now()) - get_hold_ttl()
+    with transaction.atomic():
+        updated = Booking.objects.filter(pk=booking.pk, status="pending", created_at__lt=cutoff).update(
+            status="expired"
+        )
+        if updated:
+            booking.status = "expired"
+            _announce([booking], "pending", "expired")
+    return bool(updated)
+
+
+def expire_stale_holds(batch_size=500, now=None):
+    """
+    Expire pending bookings older than the hold TTL in batched UPDATEs,
+    walking the (status, created_at) index. Returns the number expired.
+    """
+    cutoff = (now or timezone.now()) - get_hold_ttl()
+    total = 0
+    while True:
+        batch = list(
+            Booking.objects.filter(status="pending", created_at__lt=cutoff)
+            .order_by("status", "created_at")
+            .only("id", "hotel", "user", "room", "check_in", "check_out", "guests", "status", "created_at")[:batch_size]
+        )
+        if not batch:
+            return total
+
+        ids = [booking.id for booking in batch]
+        with transaction.atomic():
+            updated = Booking.objects.filter(id__in=ids, status="pending").update(status="expired")
+            if updated != len(ids):
+                # Some were confirmed or cancelled in the meantime
+                expired_ids = set(Booking.objects.filter(id__in=ids, status="expired").values_list("id", flat=True))
+                batch = [booking for booking in batch if booking.id in expired_ids]
+            for booking in batch:
+                booking.status = "expired"
+            if batch:
+                _announce(batch, "pending", "expired")
+        total += updated
+
+
+# ---------- AVAILABILITY / GROUP BOOKINGS ----------
+
+class RoomsUnavailable(Exception):
+    pass
+
+
+def overlapping(check_in, check_out, hotel=None):
+    """
+    Active bookings that overlap the [check_in, check_out) stay, optionally
+    only those of `hotel`.
+    """
+    bookings = Booking.objects.filter(
+        status__in=Booking.ACTIVE_STATUSES,
+        check_in__lt=check_out,
+        check_out__gt=check_in,
+    )
+    return bookings.filter(hotel=hotel) if hotel is not None else bookings
+
+
+def pick_adjacent(rooms, count):
+    """
+    Choose `count` rooms spanning as few floors as possible, preferring
+    lower floors and room numbers. `rooms` must be ordered by floor.
+    """
+    best = None
+    for end in range(count - 1, len(rooms)):
+        start = end - count + 1
+        span = (rooms[end].floor or 0) - (rooms[start].floor or 0)
+        if best is None or span < best[0]:
+            best = (span, start)
+            if span == 0:
+                break
+    return rooms[best[1]:best[1] + count]
+
+
+def claim(room_ids, check_in, check_out, write):
+    """
+    Run `write()`, which saves and returns bookings of `room_ids` for the
+    [check_in, check_out) stay, in a transaction that is rolled back with
+    RoomsUnavailable when any other active booking overlaps them.
+    """
+    try:
+        with transaction.atomic():
+            if connection.features.has_select_for_update:
+                # Lock the rooms (PostgreSQL)
+                list(Room.objects.select_for_update().filter(id__in=room_ids).values_list("id", flat=True))
+            # On SQLite the write is the first statement, so it waits for
+            # the database write lock instead of failing to upgrade a read
+            # lock; the re-check after it is race free either way.
+            bookings = write()
+            conflicts = (
+                overlapping(check_in, check_out)
+                .filter(room_id__in=room_ids)
+                .exclude(id__in=[booking.id for booking in bookings])
+            )
+            if conflicts.exists():
+                raise RoomsUnavailable(
+                    "This room is already booked for these dates."
+                    if len(room_ids) == 1
+                    else "Some rooms were booked by someone else, please try again."
+                )
+    except OperationalError as exc:
+        # SQLite's busy timeout ran out: as good as losing the race
+        if "locked" not in str(exc):
+            raise
+        raise RoomsUnavailable("The rooms are being booked by someone else, please try again.") from exc
+    return bookings
+
+
+def book_room(room, check_in, check_out, guests, **fields):
+    """
+    Create one booking of `room` for the stay, or raise RoomsUnavailable
+    when it's taken. `fields` are the other Booking fields (user, ...).
+    """
+    fields.setdefault("room_type", room.room_type)
+
+    def write():
+        return [Booking.objects.create(room=room, check_in=check_in, check_out=check_out, guests=guests, **fields)]
+
+    return claim([room.id], check_in, check_out, write)[0]
+
+
+def change_booking(booking, changes):
+    """
+    Apply `changes` to `booking` and save it. Moving an active booking to
+    another room or other nights goes through the same check as book_room.
+    """
+    moved = any(
+        field in changes and changes[field] != getattr(booking, field) for field in ("room", "check_in", "check_out")
+    )
+    for field, value in changes.items():
+        setattr(booking, field, value)
+
+    def write():
+        booking.save()
+        return [booking]
+
+    if moved and booking.status in Booking.ACTIVE_STATUSES:
+        claim([booking.room_id], booking.check_in, booking.check_out, write)
+    else:
+        write()
+    return booking
+
+
+def reserve_group(user, hotel, count, check_in, check_out, guests, room_type=None, min_capacity=1, adjacent=True):
+    """
+    Reserve `count` rooms of `hotel` for the same stay in one transaction:
+    one availability query, one bulk_create, and a conflict re-check (see
+    `claim`) that rolls everything back if a concurrent booking took one
+    of the rooms.
+    """
+    rooms = Room.objects.filter(hotel=hotel, is_available=True, capacity__gte=max(min_capacity, guests))
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    rooms = rooms.exclude(id__in=overlapping(check_in, check_out, hotel).values("room_id"))
+    candidates = list(rooms.order_by("floor", "number").only("id", "floor", "number", "room_type", "price_per_night"))
+    if len(candidates) < count:
+        raise RoomsUnavailable(f"Only {len(candidates)} matching rooms are free for these dates.")
+
+    chosen = pick_adjacent(candidates, count) if adjacent else candidates[:count]
+
+    def write():
+        bookings = Booking.objects.bulk_create(
+            Booking(
+                hotel=hotel,
+                user=user,
+                room_id=room.id,
+                room_type=room.room_type,
+                check_in=check_in,
+                check_out=check_out,
+                guests=guests,
+                price_per_night=room.price_per_night,
+            )
+            for room in chosen
+        )
+        record(bookings)
+        return bookings
+
+    bookings = claim([room.id for room in chosen], check_in, check_out, write)
+    # bulk_create skips post_save
+    invalidate_booking_summaries([user.id])
+    return bookings
@@ -0,0 +1,287 @@
+"""
+Change feed of bookings, rooms and contact messages.
+
+Every change writes a ChangeEvent row (the outbox) carrying a compact delta
+of the row, in the same transaction as the change itself: saves and deletes
+through signals, and the bulk paths (status transitions, group bookings,
+room reassignment, buffered contact messages) by calling `record`. Clients
+read events after a cursor (the last event id they saw), either as JSON or
+as a Server-Sent Events stream that resumes from `Last-Event-ID`.
+
+Event ids are allocated when the row is inserted, so with concurrent
+writers a transaction that commits late can get an id below one already
+delivered. The cursor is therefore not the id but `position`, handed out
+by `sequence` after the transaction commits: sequencers take turns on the
+ChangeSequence row and number the committed events they find in id order,
+so an event is always placed after everything already readable, however
+long its transaction ran. Unsequenced events are never read; if a process
+dies between commit and sequencing, the next write (or
+`prune_change_feed`) sequences them. Rows moved out of the live tables by
+hotel.archive are recorded as `archive` rather than `delete`, so clients
+can tell history being filed away from a booking being removed. Events
+older than
+CHANGE_FEED["RETENTION"] are deleted by `prune_change_feed`; a client
+whose cursor fell behind that is told to reload.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Booking, ChangeEvent, ChangeSequence, ContactMessage, Room
+from .renderers import dumps
+from .signals import changes_recorded
+
+DEFAULTS = {
+    "POLL_INTERVAL": 1.0,
+    "HEARTBEAT": 15,
+    "MAX_DURATION": 300,
+    "BATCH_SIZE": 200,
+    "RETENTION": timedelta(days=7),
+}
+
+PUBLIC_TOPICS = ("room", "booking")
+STAFF_TOPICS = ("room", "booking", "message")
+# What anonymous clients see of a booking: enough to update availability
+PUBLIC_BOOKING_FIELDS = ("id", "hotel", "room", "check_in", "check_out", "status")
+
+# The action ORM deletes are recorded with, see `deletes_recorded_as`
+_delete_action = ContextVar("feed_delete_action", default="delete")
+
+
+def get_feed_setting(name):
+    return getattr(settings, "CHANGE_FEED", {}).get(name, DEFAULTS[name])
+
+
+def booking_delta(booking):
+    return {
+        "id": booking.id,
+        "hotel": booking.hotel_id,
+        "room": booking.room_id,
+        "user": booking.user_id,
+        "check_in": booking.check_in,
+        "check_out": booking.check_out,
+        "guests": booking.guests,
+        "status": booking.status,
+    }
+
+
+def room_delta(room):
+    return {
+        "id": room.id,
+        "hotel": room.hotel_id,
+        "number": room.number,
+        "room_type": room.room_type,
+        "price_per_night": room.price_per_night,
+        "capacity": room.capacity,
+        "is_available": room.is_available,
+    }
+
+
+def message_delta(message):
+    return {
+        "id": message.id,
+        "name": message.name,
+        "subject": message.subject,
+        "is_read": message.is_read,
+        "created_at": message.created_at,
+    }
+
+
+TOPICS = {
+    Booking: ("booking", booking_delta),
+    Room: ("room", room_delta),
+    ContactMessage: ("message", message_delta),
+}
+
+
+def record(instances, action="upsert"):
+    """
+    Add outbox rows for `instances`. Call it inside the transaction that
+    changed them when the write bypasses signals (update(), bulk_create(),
+    bulk_update()).
+    """
+    instances = list(instances)
+    events = []
+    for instance in instances:
+        topic, delta = TOPICS[type(instance)]
+        events.append(
+            ChangeEvent(
+                topic=topic,
+                action=action,
+                object_id=instance.pk,
+                hotel_id=getattr(instance, "hotel_id", None),
+                data=delta(instance),
+            )
+        )
+    ChangeEvent.objects.bulk_create(events)
+    transaction.on_commit(sequence, robust=True)
+    # Listeners keep derived data that can be rebuilt; a failing one is
+    # logged (django.dispatch) and must not fail the write
+    changes_recorded.send_robust(sender=ChangeEvent, instances=instances, action=action)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=ContactMessage)
+def record_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record([instance])
+
+
+@receiver(post_delete, sender=Booking)
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=ContactMessage)
+def record_delete(sender, instance, **kwargs):
+    record([instance], _delete_action.get())
+
+
+@contextmanager
+def deletes_recorded_as(action):
+    """Record the deletes made inside the block with `action`."""
+    token = _delete_action.set(action)
+    try:
+        yield
+    finally:
+        _delete_action.reset(token)
+
+
+# ---------- SEQUENCING ----------
+
+def _lock_sequence(now):
+    """
+    The ChangeSequence row, locked until the transaction ends. The first
+    statement is a write, so SQLite takes its write lock here too.
+    """
+    if not ChangeSequence.objects.filter(pk=1).update(sequenced_at=now):
+        try:
+            with transaction.atomic():
+                position = ChangeEvent.objects.aggregate(position=Max("position"))["position"] or 0
+                ChangeSequence.objects.create(pk=1, position=position, sequenced_at=now)
+        except IntegrityError:
+            # Created concurrently: wait for its holder
+            ChangeSequence.objects.filter(pk=1).update(sequenced_at=now)
+    return ChangeSequence.objects.get(pk=1)
+
+
+def sequence():
+    """
+    Give the committed events without a position the next positions, in
+    id order. Returns how many were sequenced.
+    """
+    if not ChangeEvent.objects.filter(position__isnull=True).exists():
+        return 0
+    with transaction.atomic():
+        state = _lock_sequence(timezone.now())
+        ids = ChangeEvent.objects.filter(position__isnull=True).order_by("id").values_list("id", flat=True)
+        events = [ChangeEvent(id=event_id, position=state.position + n) for n, event_id in enumerate(ids, 1)]
+        ChangeEvent.objects.bulk_update(events, ["position"], batch_size=500)
+        ChangeSequence.objects.filter(pk=1).update(position=state.position + len(events))
+    return len(events)
+
+
+# ---------- READING ----------
+
+def latest_cursor():
+    return ChangeEvent.objects.aggregate(cursor=Max("position"))["cursor"] or 0
+
+
+def cursor_expired(cursor):
+    """True when events after `cursor` may already have been pruned."""
+    positions = ChangeEvent.objects.filter(position__isnull=False).order_by("position")
+    oldest = positions.values_list("position", flat=True).first()
+    return cursor > 0 and oldest is not None and cursor < oldest - 1
+
+
+def serialize_event(event, staff=False):
+    data = event.data
+    if event.topic == "booking" and not staff:
+        data = {field: data.get(field) for field in PUBLIC_BOOKING_FIELDS}
+    return {"id": event.position, "topic": event.topic, "action": event.action, "data": data}
+
+
+def events_after(cursor, topics, hotel=None, staff=False, limit=None):
+    events = ChangeEvent.objects.filter(position__gt=cursor, topic__in=topics)
+    if hotel is not None:
+        events = events.filter(Q(hotel=hotel) | Q(hotel__isnull=True))
+    events = events.order_by("position")[: limit or get_feed_setting("BATCH_SIZE")]
+    return [serialize_event(event, staff) for event in events]
+
+
+def read_changes(cursor, topics, hotel=None, staff=False):
+    """
+    One page of the feed: {"cursor", "reset", "events"}. Without a cursor
+    it starts from now; `reset` means the client missed pruned events and
+    must reload its data before following the feed from `cursor`.
+    """
+    if cursor is None:
+        return {"cursor": latest_cursor(), "reset": False, "events": []}
+    if cursor_expired(cursor):
+        return {"cursor": latest_cursor(), "reset": True, "events": []}
+    events = events_after(cursor, topics, hotel, staff)
+    return {"cursor": events[-1]["id"] if events else cursor, "reset": False, "events": events}
+
+
+def sse_message(data, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append("data: " + dumps(data).decode())
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def event_stream(cursor, topics, hotel=None, staff=False):
+    """
+    Server-Sent Events: each change as `event: <topic>` with its id, a
+    comment every HEARTBEAT seconds to keep proxies from closing the
+    connection, and a clean end after MAX_DURATION so the browser
+    reconnects (with Last-Event-ID) and workers get recycled.
+    """
+    poll_interval = get_feed_setting("POLL_INTERVAL")
+    heartbeat = get_feed_setting("HEARTBEAT")
+    deadline = time.monotonic() + get_feed_setting("MAX_DURATION")
+    last_sent = time.monotonic()
+
+    yield b"retry: 3000\n\n"
+    if cursor is None:
+        cursor = await sync_to_async(latest_cursor)()
+    elif await sync_to_async(cursor_expired)(cursor):
+        cursor = await sync_to_async(latest_cursor)()
+        yield sse_message({"cursor": cursor}, event="reset", event_id=cursor)
+
+    while time.monotonic() < deadline:
+        events = await sync_to_async(events_after)(cursor, topics, hotel, staff)
+        for event in events:
+            yield sse_message(event, event=event["topic"], event_id=event["id"])
+            cursor = event["id"]
+        if events:
+            last_sent = time.monotonic()
+            if len(events) == get_feed_setting("BATCH_SIZE"):
+                continue
+        elif time.monotonic() - last_sent >= heartbeat:
+            yield b": ping\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(poll_interval)
+
+
+# ---------- MAINTENANCE ----------
+
+def prune(retention=None):
+    """Delete events older than `retention`. Returns the number deleted."""
+    # Also sequences events a crashed process left behind
+    sequence()
+    cutoff = timezone.now() - (get_feed_setting("RETENTION") if retention is None else retention)
+    with transaction.atomic():
+        deleted, _ = ChangeEvent.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
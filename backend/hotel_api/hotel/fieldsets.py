@@ -0,0 +1,185 @@
+"""
+Sparse fieldsets: `?fields=` and `?omit=` on read endpoints.
+
+    GET /api/rooms/?fields=id,number,price_per_night,image
+    GET /api/bookings/?fields=id,check_in,room_detail.number
+    GET /api/admin/rooms/?omit=description,cancellation_policy,gallery
+
+Dotted names reach into nested serializers. Fields that aren't asked for
+are dropped from the serializer, so their SerializerMethodFields never run,
+and the view trims the SQL to match: `.only()` on the columns the
+remaining fields read, and select_related/prefetch_related only for the
+relations they still use. Serializers declare what their method fields
+read in `Meta.field_sources` (columns), `Meta.field_relations` (joined
+relations) and `Meta.field_prefetches`; a method field without a
+declaration disables the column projection (never the trimming).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def parse_fieldset(value):
+    """'id,room_detail.number' -> {'id': {}, 'room_detail': {'number': {}}}"""
+    tree = {}
+    for path in (value or "").split(","):
+        node = tree
+        for part in path.strip().split("."):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _nested(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, SparseFieldsetMixin) else None
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin accepting `fields` / `omit` trees (see parse_fieldset).
+    `fields` keeps only the named fields; `omit` drops the named ones.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fieldset = fields or {}
+        self._omit = omit or {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        unknown = (set(self._fieldset) | set(self._omit)) - set(fields)
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: [f"Unknown field: {name}" for name in sorted(unknown)]})
+
+        for name, subtree in self._omit.items():
+            if not subtree:
+                fields.pop(name, None)
+        if self._fieldset:
+            fields = {name: field for name, field in fields.items() if name in self._fieldset}
+
+        for name, field in fields.items():
+            nested = _nested(field)
+            keep, omit = self._fieldset.get(name), self._omit.get(name)
+            if nested is not None and (keep or omit):
+                nested._fieldset, nested._omit = keep or {}, omit or {}
+        return fields
+
+
+def projection(serializer, prefix=""):
+    """
+    (columns, relations, prefetches) read by `serializer`'s fields, as
+    lookups relative to its model; columns is None when some field's
+    sources are unknown.
+    """
+    meta = serializer.Meta
+    model = meta.model
+    field_sources = getattr(meta, "field_sources", {})
+    field_relations = getattr(meta, "field_relations", {})
+    field_prefetches = getattr(meta, "field_prefetches", {})
+    columns, relations, prefetches = {prefix + model._meta.pk.name}, set(), set()
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        relations.update(prefix + lookup for lookup in field_relations.get(name, ()))
+        prefetches.update(prefix + lookup for lookup in field_prefetches.get(name, ()))
+        if name in field_sources:
+            if columns is not None:
+                columns.update(prefix + source for source in field_sources[name])
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+            columns = None
+            continue
+
+        source = field.source_attrs[0]
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            columns = None
+            continue
+        if not model_field.concrete:
+            columns = None
+            continue
+        if columns is not None:
+            columns.add(prefix + source)
+
+        nested = _nested(field)
+        if model_field.is_relation and (isinstance(field, serializers.BaseSerializer) or len(field.source_attrs) > 1):
+            relations.add(prefix + source)
+            if nested is not None:
+                sub_columns, sub_relations, sub_prefetches = projection(nested, f"{prefix}{source}__")
+                relations |= sub_relations
+                prefetches |= sub_prefetches
+                if columns is not None and sub_columns is not None:
+                    columns |= sub_columns
+    return columns, relations, prefetches
+
+
+def _select_related_paths(tree, prefix=""):
+    for name, subtree in tree.items():
+        yield prefix + name
+        yield from _select_related_paths(subtree, f"{prefix}{name}__")
+
+
+def project_queryset(queryset, serializer):
+    """
+    Trim `queryset` to what `serializer` reads: drop select_related and
+    prefetch_related lookups nothing uses, then defer unused columns.
+    """
+    columns, relations, prefetches = projection(serializer)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        # Keep a joined relation only if a kept field goes through it
+        used = [path for path in _select_related_paths(select_related) if path in relations]
+        queryset = queryset.select_related(None)
+        if used:
+            queryset = queryset.select_related(*used)
+            if columns is not None:
+                # Naming the relation itself keeps it joinable; models
+                # without projected columns are then loaded whole
+                columns.update(used)
+    elif select_related:
+        columns = None
+
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        kept = [
+            lookup for lookup in lookups
+            if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup) in prefetches
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+    return queryset.only(*columns) if columns is not None else queryset
+
+
+class SparseFieldsetViewMixin:
+    """
+    Honour ?fields= / ?omit= on GET: trims the serializer and, through
+    filter_queryset, the query behind it.
+    """
+
+    def get_fieldsets(self):
+        if self.request is None or self.request.method != "GET":
+            return {}, {}
+        params = self.request.query_params
+        return parse_fieldset(params.get(FIELDS_PARAM)), parse_fieldset(params.get(OMIT_PARAM))
+
+    def get_fieldset_kwargs(self):
+        fields, omit = self.get_fieldsets()
+        return {"fields": fields, "omit": omit} if fields or omit else {}
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, **{**self.get_fieldset_kwargs(), **kwargs})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_fieldset_kwargs():
+            queryset = project_queryset(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,228 @@
+"""
+Occupancy forecast: on-the-books rooms by room type for the next
+FORECAST["HORIZON_DAYS"] nights, projected with booking pace.
+
+Every active booking (live or archived) is one room on the books for each
+of its nights from the day it was made. Counting those room-nights by
+(room type, night, lead time) gives, for any night, how many rooms were
+already sold 0, 1, ... HORIZON_DAYS days ahead: its booking curve. Over
+the last HISTORY_DAYS nights the average pickup, the rooms a night still
+gained after being L days out, is taken per room type, weekday and lead
+time. A future night L days out is projected as its rooms on the books
+plus that pickup, capped at the room type's available rooms.
+
+Only the counting touches every booking, and it runs on arrays: bookings
+come grouped by (room type, booking day, check-in, check-out), are
+expanded to nights with np.repeat and counted with one np.bincount; the
+curves and averages work on the small histogram. Without NumPy the same
+histogram is counted in pure Python. The forecast only changes meaning
+once a day, so it is cached per hotel and day (`bench_forecast` times the
+computation on synthetic bookings).
+"""
+from collections import Counter
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking, Room
+
+DEFAULTS = {
+    "HORIZON_DAYS": 90,
+    "HISTORY_DAYS": 365,
+}
+
+CACHE_TIMEOUT = 60 * 60 * 24
+WEEKDAYS = 7
+
+
+def get_forecast_setting(name):
+    return getattr(settings, "FORECAST", {}).get(name, DEFAULTS[name])
+
+
+def forecast_cache_key(hotel_id, day):
+    return f"forecast:{hotel_id}:{day.isoformat()}"
+
+
+def history_rows(hotel, start, end):
+    """
+    (room_type, booked_on, check_in, check_out, bookings) for the active
+    bookings with a night in [start, end), grouped in the database. The
+    type is the booked room's: Booking.room_type is only the type asked for
+    and is blank for bookings made for a specific room. Archived bookings
+    keep a copy of the room's type.
+    """
+    rows = []
+    for model, room_type in ((Booking, "room__room_type"), (ArchivedBooking, "room_type")):
+        rows.extend(
+            model.objects.filter(
+                hotel=hotel,
+                status__in=Booking.ACTIVE_STATUSES,
+                check_in__lt=end,
+                check_out__gt=start,
+            )
+            .order_by()
+            .values_list(room_type, TruncDate("created_at"), "check_in", "check_out")
+            .annotate(bookings=Count("id"))
+        )
+    return rows
+
+
+def night_histogram(codes, booked, check_in, check_out, weights, types, days, horizon):
+    """
+    Room-nights counted by [type][night][lead], nights and dates as day
+    numbers from the first night; leads past `horizon` count as `horizon`.
+    """
+    leads = horizon + 1
+    if np is not None:
+        codes = np.asarray(codes, dtype=np.int64)
+        booked = np.asarray(booked, dtype=np.int64)
+        check_in = np.clip(np.asarray(check_in, dtype=np.int64), 0, days)
+        check_out = np.clip(np.asarray(check_out, dtype=np.int64), 0, days)
+        lengths = np.maximum(check_out - check_in, 0)
+        # One element per night: the booking it belongs to and its offset
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        nights = check_in[rows] + offsets
+        lead = np.clip(nights - booked[rows], 0, horizon)
+        index = (codes[rows] * days + nights) * leads + lead
+        counts = np.bincount(
+            index, weights=np.asarray(weights, dtype=np.float64)[rows], minlength=types * days * leads
+        )
+        return counts.reshape(types, days, leads).astype(np.int64).tolist()
+
+    counter = Counter()
+    for code, day, first, last, weight in zip(codes, booked, check_in, check_out, weights):
+        for night in range(max(first, 0), min(last, days)):
+            counter[code, night, min(max(night - day, 0), horizon)] += weight
+    return [
+        [[counter.get((code, night, lead), 0) for lead in range(leads)] for night in range(days)]
+        for code in range(types)
+    ]
+
+
+def project(histogram, history, horizon, first_weekday):
+    """
+    For one room type's histogram (nights: `history` past then `horizon`
+    future), the rooms on the books and the projected rooms of each
+    future night.
+    """
+    # on_books[night][lead]: rooms sold at least `lead` days ahead
+    on_books = []
+    for counts in histogram:
+        curve, total = [0] * len(counts), 0
+        for lead in range(len(counts) - 1, -1, -1):
+            total += counts[lead]
+            curve[lead] = total
+        on_books.append(curve)
+
+    pickup = [[0.0] * horizon for _ in range(WEEKDAYS)]
+    nights = [0] * WEEKDAYS
+    for night in range(history):
+        weekday = (first_weekday + night) % WEEKDAYS
+        final = on_books[night][0]
+        nights[weekday] += 1
+        row = pickup[weekday]
+        for lead in range(horizon):
+            row[lead] += final - on_books[night][lead]
+
+    booked, projected = [], []
+    for offset in range(horizon):
+        night = history + offset
+        weekday = (first_weekday + night) % WEEKDAYS
+        current = on_books[night][0]
+        expected = pickup[weekday][offset] / nights[weekday] if nights[weekday] else 0.0
+        booked.append(current)
+        projected.append(current + expected)
+    return booked, projected
+
+
+def _occupancy(rooms, count):
+    return round(count / rooms, 4) if rooms else None
+
+
+def build_forecast(hotel, today=None):
+    today = today or timezone.localdate()
+    horizon = get_forecast_setting("HORIZON_DAYS")
+    history = get_forecast_setting("HISTORY_DAYS")
+    start, end = today - timedelta(days=history), today + timedelta(days=horizon)
+    days = history + horizon
+
+    room_types = [value for value, _ in Room.ROOM_TYPES]
+    code_of = {room_type: code for code, room_type in enumerate(room_types)}
+    rooms = dict(
+        Room.objects.filter(hotel=hotel, is_available=True)
+        .order_by()
+        .values_list("room_type")
+        .annotate(count=Count("id"))
+    )
+
+    rows = [row for row in history_rows(hotel, start, end) if row[0] in code_of]
+    origin = start.toordinal()
+    histogram = night_histogram(
+        [code_of[row[0]] for row in rows],
+        [row[1].toordinal() - origin for row in rows],
+        [row[2].toordinal() - origin for row in rows],
+        [row[3].toordinal() - origin for row in rows],
+        [row[4] for row in rows],
+        len(room_types),
+        days,
+        horizon,
+    )
+
+    by_type = {}
+    for room_type in room_types:
+        booked, projected = project(histogram[code_of[room_type]], history, horizon, start.weekday())
+        capacity = rooms.get(room_type, 0)
+        if not capacity and not any(booked):
+            continue
+        # Pickup never takes rooms off the books or sells past capacity
+        projected = [max(count, min(expected, capacity)) for count, expected in zip(booked, projected)]
+        by_type[room_type] = (capacity, booked, projected)
+
+    total_rooms = sum(capacity for capacity, _, _ in by_type.values())
+    nights = []
+    for offset in range(horizon):
+        night = {"date": today + timedelta(days=offset), "room_types": {}}
+        total_booked = total_projected = 0
+        for room_type, (capacity, booked, projected) in by_type.items():
+            total_booked += booked[offset]
+            total_projected += projected[offset]
+            night["room_types"][room_type] = {
+                "on_the_books": booked[offset],
+                "projected": round(projected[offset], 1),
+                "occupancy": _occupancy(capacity, projected[offset]),
+            }
+        night.update(
+            on_the_books=total_booked,
+            projected=round(total_projected, 1),
+            occupancy=_occupancy(total_rooms, total_projected),
+        )
+        nights.append(night)
+
+    return {
+        "hotel": hotel.slug,
+        "date": today,
+        "history_days": history,
+        "horizon_days": horizon,
+        "rooms": {room_type: capacity for room_type, (capacity, _, _) in by_type.items()},
+        "nights": nights,
+    }
+
+
+def get_forecast(hotel, today=None):
+    today = today or timezone.localdate()
+    key = forecast_cache_key(hotel.id, today)
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = build_forecast(hotel, today)
+        cache.set(key, forecast, CACHE_TIMEOUT)
+    return forecast
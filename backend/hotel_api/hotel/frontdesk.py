@@ -0,0 +1,113 @@
+"""
+Front desk lists for a given day: arrivals, departures, in-house guests
+and no-shows, plus the night audit export.
+
+Every list is a hotel plus a range or equality filter on check_in /
+check_out, so it is served by the booking_hotel_check_in_idx /
+booking_hotel_check_out_idx indexes and its size depends on the day's
+occupancy at that property, not on the size of the table.
+"""
+import csv
+from datetime import date
+
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Booking
+
+MOVEMENTS = ("arrivals", "departures", "in-house", "no-shows")
+
+AUDIT_HEADER = ["movement", "room", "room_type", "guest", "email", "check_in", "check_out", "nights", "guests", "rate", "status"]
+
+
+class CheckInError(ValueError):
+    pass
+
+
+def parse_day(value):
+    """
+    `value` as a date (YYYY-MM-DD), today when empty. Raises ValueError.
+    """
+    if not value:
+        return timezone.localdate()
+    return date.fromisoformat(value)
+
+
+def movement_queryset(kind, day, hotel):
+    bookings = Booking.objects.filter(hotel=hotel)
+    active = bookings.filter(status__in=Booking.ACTIVE_STATUSES)
+    if kind == "arrivals":
+        queryset = active.filter(check_in=day)
+    elif kind == "departures":
+        queryset = active.filter(check_out=day)
+    elif kind == "in-house":
+        queryset = active.filter(check_in__lte=day, check_out__gt=day)
+    elif kind == "no-shows":
+        # Confirmed guests who were due on a past day and never checked in
+        queryset = bookings.filter(status="confirmed", check_in=day, checked_in_at__isnull=True)
+        if day >= timezone.localdate():
+            queryset = queryset.none()
+    else:
+        raise ValueError(f"Unknown movement {kind!r}.")
+    return queryset.select_related("user", "room").order_by("room__number", "id")
+
+
+def mark_checked_in(booking, now=None):
+    """
+    Mark a confirmed booking as arrived, from its check-in day onwards.
+    """
+    now = now or timezone.now()
+    if booking.status != "confirmed":
+        raise CheckInError("Only confirmed bookings can be checked in.")
+    if booking.checked_in_at:
+        raise CheckInError("Booking is already checked in.")
+    if not booking.check_in <= timezone.localdate(now) < booking.check_out:
+        raise CheckInError("Guests can only check in during their stay.")
+    booking.checked_in_at = now
+    booking.save(update_fields=["checked_in_at"])
+    return booking
+
+
+# ---------- NIGHT AUDIT ----------
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def night_audit_rows(day, hotel, chunk_size=1000):
+    """
+    CSV lines for every room occupied on the night of `day`, then that
+    day's departures and no-shows. Rows are read with .values() and a
+    server-side iterator, so memory stays flat however big the property is.
+    """
+    writer = csv.writer(_Echo())
+    fields = (
+        "room__number", "room__room_type", "user__username", "user__email",
+        "check_in", "check_out", "guests", "price_per_night", "status",
+    )
+    yield writer.writerow(AUDIT_HEADER)
+    sections = (
+        ("arrival", movement_queryset("arrivals", day, hotel)),
+        ("stayover", movement_queryset("in-house", day, hotel).exclude(check_in=day)),
+        ("departure", movement_queryset("departures", day, hotel)),
+        ("no-show", movement_queryset("no-shows", day, hotel)),
+    )
+    for movement, queryset in sections:
+        rows = queryset.annotate(nights=F("check_out") - F("check_in")).values_list(*fields, "nights")
+        for number, room_type, username, email, check_in, check_out, guests, rate, status, nights in rows.iterator(
+            chunk_size=chunk_size
+        ):
+            yield writer.writerow([
+                movement, number, room_type, username, email,
+                check_in, check_out, nights.days, guests, rate, status,
+            ])
+
+
+def night_audit_response(day, hotel):
+    response = StreamingHttpResponse(night_audit_rows(day, hotel), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="night-audit-{hotel.slug}-{day.isoformat()}.csv"'
+    return response
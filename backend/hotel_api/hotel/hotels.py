@@ -0,0 +1,134 @@
+"""
+Property scoping: which hotel a request is about, and per-hotel cache
+namespaces.
+
+Clients pick a property with `?hotel=<slug>` (or the `X-Hotel` header).
+Public and operational endpoints fall back to the default property, so a
+single-hotel install never has to send it.
+
+Each hotel's cached data lives under its own versioned key prefix. A
+change bumps only that hotel's version, so a busy property churning its
+cache never evicts or invalidates the entries of the others.
+"""
+from django.core.cache import cache
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.exceptions import NotFound
+
+from .models import GalleryImage, Hotel, Room, RoomImage, TeamMember, get_default_hotel_id
+
+HOTEL_PARAM = "hotel"
+HOTEL_HEADER = "X-Hotel"
+
+
+def get_default_hotel():
+    # Read-only: the default hotel comes from the migrations
+    hotel = Hotel.objects.filter(pk=get_default_hotel_id()).first()
+    if hotel is None:
+        raise NotFound(f"No default hotel: pass ?{HOTEL_PARAM}=<slug>.")
+    return hotel
+
+
+def resolve_hotel(request, default=True):
+    """
+    The hotel named by the request, the default hotel when none is named
+    (or None with default=False). Raises NotFound for unknown slugs.
+    """
+    slug = request.query_params.get(HOTEL_PARAM) or request.headers.get(HOTEL_HEADER)
+    if not slug:
+        return get_default_hotel() if default else None
+    try:
+        return Hotel.objects.get(slug=slug, is_active=True)
+    except Hotel.DoesNotExist:
+        raise NotFound(f"Unknown hotel {slug!r}.")
+
+
+class CurrentHotelDefault:
+    """
+    Serializer field default: the current hotel of the row being updated,
+    else the hotel the view resolved for the request (serializer context
+    "hotel"), else the default hotel.
+    """
+
+    requires_context = True
+
+    def __call__(self, serializer_field):
+        instance = getattr(serializer_field.parent, "instance", None)
+        if isinstance(instance, models.Model):
+            return instance.hotel
+        return serializer_field.context.get("hotel") or get_default_hotel()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+# ---------- CACHE NAMESPACES ----------
+
+def _version_key(hotel_id):
+    return f"hotel:{hotel_id}:version"
+
+
+def hotel_cache_key(hotel_id, name):
+    version = cache.get_or_set(_version_key(hotel_id), 1, None)
+    return f"hotel:{hotel_id}:v{version}:{name}"
+
+
+def invalidate_hotel_cache(hotel_id):
+    try:
+        cache.incr(_version_key(hotel_id))
+    except ValueError:
+        # Not set yet (or evicted): nothing cached under a known version
+        pass
+
+
+def cached_for_hotel(hotel_id, name, build, timeout=300):
+    key = hotel_cache_key(hotel_id, name)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=GalleryImage)
+@receiver(post_delete, sender=GalleryImage)
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_on_change(sender, instance, **kwargs):
+    invalidate_hotel_cache(instance.hotel_id)
+
+
+@receiver(post_save, sender=RoomImage)
+@receiver(post_delete, sender=RoomImage)
+def invalidate_on_room_image_change(sender, instance, **kwargs):
+    hotel_id = Room.objects.filter(pk=instance.room_id).values_list("hotel_id", flat=True).first()
+    if hotel_id:
+        invalidate_hotel_cache(hotel_id)
+
+
+# ---------- VIEWS ----------
+
+class HotelScopedMixin:
+    """
+    Filters the view's queryset to the requested hotel and hands it to the
+    serializer as the default for new rows. With `hotel_default = False`
+    both only apply when a hotel is named.
+    """
+
+    hotel_field = "hotel"
+    hotel_default = True
+
+    def get_hotel(self):
+        if not hasattr(self, "_hotel"):
+            self._hotel = resolve_hotel(self.request, default=self.hotel_default)
+        return self._hotel
+
+    def scope_queryset(self, queryset):
+        hotel = self.get_hotel()
+        return queryset.filter(**{self.hotel_field: hotel}) if hotel else queryset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "hotel": self.get_hotel()}
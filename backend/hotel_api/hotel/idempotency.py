@@ -0,0 +1,191 @@
+"""
+Idempotency keys for POST endpoints.
+
+A client that times out can't tell whether its booking or sign-up went
+through. Sending the same `Idempotency-Key` header on the retry makes it
+safe: the first request's response is stored in IdempotencyKey and every
+retry within IDEMPOTENCY["TTL"] gets it back from a single unique-index
+lookup, without running the view (or hashing a password) again.
+
+- Keys are scoped to the user, or to the client IP for anonymous requests.
+- Reusing a key for a different request (method, path or body) is a 422.
+- A retry that arrives while the first request is still running gets 409;
+  after IDEMPOTENCY["PENDING_TIMEOUT"] the first request is presumed dead
+  (worker killed, timed out) and the retry takes the key over.
+- Only responses the view returned are stored (status below 500); when the
+  view raises (validation errors, server errors) the key is released so
+  the client can retry with the same key.
+
+The fingerprint is an HMAC keyed with SECRET_KEY, so stored rows reveal
+nothing about request bodies (passwords included). Views choose what is
+stored and replayed (`idempotent_response` / `idempotent_replay`): sign-up
+stores the user id and issues fresh tokens to the retry, never keeping
+tokens in the table.
+
+Expired keys are ignored on lookup and deleted by `prune_idempotency_keys`.
+"""
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Response headers replayed along with the body
+STORED_HEADERS = ("Location",)
+
+DEFAULTS = {
+    "TTL": timedelta(hours=24),
+    "PENDING_TIMEOUT": timedelta(seconds=60),
+}
+
+
+def get_idempotency_setting(name):
+    return getattr(settings, "IDEMPOTENCY", {}).get(name, DEFAULTS[name])
+
+
+def get_scope(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{BaseThrottle().get_ident(request)}"
+
+
+def fingerprint(request):
+    data = request.data
+    if isinstance(data, QueryDict):
+        data = sorted(data.lists())
+    body = json.dumps(data, sort_keys=True, default=str)
+    message = f"{request.method} {request.path}\n{body}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def replay(record, body=None):
+    body = record.response if body is None else body
+    response = Response(body, status=record.status_code, headers=record.headers)
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def claim(scope, key, digest):
+    """
+    The live record for `key`, from one indexed read when it exists; else a
+    new pending one, marked `claimed`, that this request must complete. A
+    record left pending past PENDING_TIMEOUT is claimed by a retry of the
+    same request.
+    """
+    now = timezone.now()
+    while True:
+        record = IdempotencyKey.objects.filter(scope=scope, key=key, expires_at__gt=now).first()
+        if record is not None:
+            record.claimed = False
+            stale = record.created_at <= now - get_idempotency_setting("PENDING_TIMEOUT")
+            if record.status_code is None and stale and record.fingerprint == digest:
+                # Conditional UPDATE so only one retry takes over
+                record.claimed = bool(
+                    IdempotencyKey.objects.filter(
+                        pk=record.pk, status_code__isnull=True, created_at=record.created_at
+                    ).update(created_at=now)
+                )
+                record.created_at = now
+            return record
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.filter(scope=scope, key=key, expires_at__lte=now).delete()
+                record = IdempotencyKey.objects.create(
+                    scope=scope,
+                    key=key,
+                    fingerprint=digest,
+                    expires_at=now + get_idempotency_setting("TTL"),
+                )
+        except IntegrityError:
+            # A concurrent request claimed it first: read its record
+            continue
+        record.claimed = True
+        return record
+
+
+def idempotent(request, handler, store=None, restore=None):
+    """
+    Run `handler()` (the view's POST handler) at most once per
+    Idempotency-Key and return its response, stored or fresh. `store(data)`
+    is what to keep of the response body, `restore(data)` turns it back
+    into the body a replay returns.
+    """
+    key = request.headers.get(HEADER)
+    if not key:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError({HEADER: [f"At most {MAX_KEY_LENGTH} characters."]})
+
+    scope = get_scope(request)
+    digest = fingerprint(request)
+    record = claim(scope, key, digest)
+    if record.fingerprint != digest:
+        return Response(
+            {"detail": f"This {HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if not record.claimed:
+        if record.status_code is None:
+            return Response(
+                {"detail": f"A request with this {HEADER} is still in progress."},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Retry-After": "1"},
+            )
+        return replay(record, restore(record.response) if restore else None)
+
+    try:
+        response = handler()
+    except Exception:
+        record.delete()
+        raise
+
+    if response.status_code >= 500 or not isinstance(response, Response):
+        record.delete()
+        return response
+    record.status_code = response.status_code
+    record.response = store(response.data) if store else response.data
+    record.headers = {name: response[name] for name in STORED_HEADERS if response.has_header(name)}
+    record.save(update_fields=["status_code", "response", "headers"])
+    return response
+
+
+class IdempotentMixin:
+    """Honour the Idempotency-Key header on the view's POST handler."""
+
+    def post(self, request, *args, **kwargs):
+        handler = super().post
+        return idempotent(
+            request,
+            lambda: handler(request, *args, **kwargs),
+            store=self.idempotent_response,
+            restore=self.idempotent_replay,
+        )
+
+    def idempotent_response(self, data):
+        """What to store of a response body for replays."""
+        return data
+
+    def idempotent_replay(self, data):
+        """The body a replay returns, from what was stored."""
+        return data
+
+
+# ---------- MAINTENANCE ----------
+
+def prune():
+    """Delete expired keys. Returns the number deleted."""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
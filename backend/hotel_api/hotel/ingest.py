@@ -0,0 +1,269 @@
+"""
+Buffered ingestion of contact form submissions.
+
+Instead of one INSERT (and one SQLite write lock) per submission, messages
+are queued in memory and written with a single bulk_create once BATCH_SIZE
+messages are pending or FLUSH_INTERVAL seconds have passed.
+
+With LOG_DIR set, every accepted message is first appended to a per-process
+NDJSON log. The log is rotated when a batch is taken and the rotated segment
+deleted once the batch is committed. Each process holds an flock on its
+own lock file for as long as it logs; the lock goes with the process, so a
+segment whose owner's lock can be taken belongs to a process that is gone
+(a recycled pid can't hold it). Those segments are replayed when a buffer
+starts and by `python manage.py replay_contact_log`, which deploys run
+before serving. Delivery is at-least-once: a crash between commit and
+segment removal replays that batch again.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no durability log
+    fcntl = None
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+from . import feed
+from .models import ContactMessage
+from .search import index_many
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("name", "email", "subject", "message")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 1.0,
+    "LOG_DIR": None,
+    "FSYNC": False,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "CONTACT_INGEST", {})}
+
+
+def _lock_path(log_dir, pid):
+    return log_dir / f"contact-{pid}.lock"
+
+
+def _try_lock(path, blocking=False):
+    """
+    An open file holding an exclusive flock on `path`, or None when another
+    process holds it. Retries when the file was unlinked by a previous
+    holder between our open and flock.
+    """
+    while True:
+        fh = open(path, "a")
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            fh.close()
+            return None
+        try:
+            if os.stat(path).st_ino == os.fstat(fh.fileno()).st_ino:
+                return fh
+        except FileNotFoundError:
+            pass
+        fh.close()
+
+
+class ContactMessageBuffer:
+    def __init__(self, batch_size=100, flush_interval=1.0, log_dir=None, fsync=False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.log_file = None
+        self.lock_file = None
+        self.segment = 0
+        # Rotated log segments whose messages are back in `pending` after a
+        # failed flush; removed once a later flush succeeds.
+        self.unflushed = []
+        self.thread = None
+
+    def _log_path(self, suffix):
+        return self.log_dir / f"contact-{os.getpid()}.{suffix}.ndjson"
+
+    # ---------- PRODUCER ----------
+
+    def submit(self, data):
+        """
+        Queue one validated message. Returns once it is in the log (if any).
+        """
+        record = {field: data[field] for field in FIELDS}
+        with self.lock:
+            if self.log_file:
+                self.log_file.write(json.dumps(record) + "\n")
+                self.log_file.flush()
+                if self.fsync:
+                    os.fsync(self.log_file.fileno())
+            self.pending.append(record)
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.wakeup.set()
+
+    # ---------- CONSUMER ----------
+
+    def _hold_lock(self):
+        """Lock this process's segments for its lifetime."""
+        if self.lock_file is None:
+            if fcntl is None:
+                raise ImproperlyConfigured("CONTACT_INGEST['LOG_DIR'] needs fcntl (POSIX).")
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self.lock_file = _try_lock(_lock_path(self.log_dir, os.getpid()), blocking=True)
+
+    def start(self):
+        if self.log_dir:
+            self.replay()
+            self.log_file = open(self._log_path("active"), "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self._run, name="contact-ingest", daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        try:
+            while not self.stopped.is_set():
+                self.wakeup.wait(self.flush_interval)
+                self.wakeup.clear()
+                try:
+                    self.flush()
+                except Exception:
+                    # The batch went back into `pending`; retried next tick.
+                    logger.exception("Flushing contact messages failed")
+        finally:
+            connection.close()
+
+    def flush(self):
+        """
+        Write everything pending with one bulk_create. Returns the count.
+        """
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+                if not batch:
+                    return 0
+                segments = self.unflushed + [segment for segment in [self._rotate()] if segment]
+                self.unflushed = []
+            try:
+                self._write(batch)
+            except Exception:
+                with self.lock:
+                    self.pending = batch + self.pending
+                    self.unflushed = segments + self.unflushed
+                raise
+            for segment in segments:
+                segment.unlink()
+            return len(batch)
+
+    def _rotate(self):
+        if not self.log_file:
+            return None
+        self.log_file.close()
+        self.segment += 1
+        segment = self._log_path(f"flushing-{self.segment}")
+        os.replace(self._log_path("active"), segment)
+        self.log_file = open(self._log_path("active"), "a", encoding="utf-8")
+        return segment
+
+    def _write(self, records):
+        with transaction.atomic():
+            messages = ContactMessage.objects.bulk_create(ContactMessage(**record) for record in records)
+            index_many(messages)
+            feed.record(messages)
+
+    def replay(self):
+        """
+        Re-ingest log segments left behind by processes that are gone.
+        """
+        if not self.log_dir:
+            return 0
+        self._hold_lock()
+        # Segments by pid; a lock file alone is a process that left none
+        segments = {}
+        for path in sorted(self.log_dir.glob("contact-*")):
+            pid = int(path.name.split(".")[0].split("-")[1])
+            paths = segments.setdefault(pid, [])
+            if path.suffix == ".ndjson":
+                paths.append(path)
+        total = 0
+        for pid, paths in segments.items():
+            if pid == os.getpid():
+                # Left by an earlier process with our pid: we hold its lock
+                total += self._replay_segments(paths)
+                continue
+            lock = _try_lock(_lock_path(self.log_dir, pid))
+            if lock is None:
+                continue  # a live process is still logging
+            with lock:
+                total += self._replay_segments(paths)
+                _lock_path(self.log_dir, pid).unlink()
+        if total:
+            logger.info("Replayed %d contact messages from %s", total, self.log_dir)
+        return total
+
+    def _replay_segments(self, paths):
+        total = 0
+        for path in paths:
+            # Claim the segment under our own pid (and lock) so a replay
+            # running at the same time skips it
+            self.segment += 1
+            claimed = self._log_path(f"replay-{self.segment}")
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            with open(claimed, encoding="utf-8") as fh:
+                records = [json.loads(line) for line in fh if line.strip()]
+            if records:
+                self._write(records)
+                total += len(records)
+            claimed.unlink()
+        return total
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """
+    The process-wide buffer, started on first use (None when disabled).
+    """
+    global _buffer
+    config = get_config()
+    if not config["ENABLED"]:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                buffer = ContactMessageBuffer(
+                    batch_size=config["BATCH_SIZE"],
+                    flush_interval=config["FLUSH_INTERVAL"],
+                    log_dir=config["LOG_DIR"],
+                    fsync=config["FSYNC"],
+                )
+                buffer.start()
+                _buffer = buffer
+    return _buffer
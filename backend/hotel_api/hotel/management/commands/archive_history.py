@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from hotel.archive import archive_bookings, archive_messages
+
+
+class Command(BaseCommand):
+    help = "Move old bookings and read contact messages to the archive tables (settings.ARCHIVE)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--booking-months", type=int, help="Archive bookings checked out this many months ago.")
+        parser.add_argument("--message-days", type=int, help="Archive read messages older than this many days.")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, **options):
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        bookings = archive_bookings(options["booking_months"], options["batch_size"], options["dry_run"])
+        for hotel, count in bookings.items():
+            self.stdout.write(f"{verb} {count} bookings from {hotel}.")
+        messages = archive_messages(options["message_days"], options["batch_size"], options["dry_run"])
+        self.stdout.write(f"{verb} {messages} contact messages.")
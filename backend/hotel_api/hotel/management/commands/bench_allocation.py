@@ -0,0 +1,79 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.allocation import MIN_STAY, Stay, assign, orphan_nights
+
+
+class Command(BaseCommand):
+    help = "Benchmark the room allocator on a synthetic calendar (no database needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=1000)
+        parser.add_argument("--nights", type=int, default=365)
+        parser.add_argument("--occupancy", type=float, default=0.75, help="Occupancy to fill before optimizing.")
+        parser.add_argument("--extra", type=int, default=20000, help="Extra requests sold after optimizing.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        rooms, nights = options["rooms"], options["nights"]
+
+        # Guests pick rooms themselves: each stay lands in a random free room
+        calendar = [bytearray(nights) for _ in range(rooms)]
+        stays = []
+        target = rooms * nights * options["occupancy"]
+        booked = 0
+        attempts = 0
+        while booked < target and attempts < target:
+            attempts += 1
+            length = rng.choice([1, 1, 2, 2, 3, 3, 4, 5, 7])
+            check_in = rng.randrange(nights - length)
+            room = self._first_free(calendar, check_in, check_in + length, rng.randrange(rooms))
+            if room is None:
+                continue
+            calendar[room][check_in:check_in + length] = b"\x01" * length
+            stays.append(Stay(len(stays), room, check_in, check_in + length, 2, False))
+            booked += length
+
+        capacities = {room: 2 for room in range(rooms)}
+        baseline = {stay.id: stay.room for stay in stays}
+
+        start = time.perf_counter()
+        optimized = assign(capacities, stays)
+        solve = time.perf_counter() - start
+        if optimized is None:
+            self.stdout.write("Allocator could not place every stay.")
+            return
+
+        self.stdout.write(f"{rooms} rooms x {nights} nights, {len(stays)} stays, solved in {solve * 1000:.0f} ms")
+        extra_requests = []
+        for _ in range(options["extra"]):
+            length = rng.randint(MIN_STAY, 5)
+            check_in = rng.randrange(nights - length)
+            extra_requests.append((check_in, check_in + length))
+
+        for label, assignment in (("guest-picked", baseline), ("optimized", optimized)):
+            layout = [bytearray(nights) for _ in range(rooms)]
+            for stay in stays:
+                layout[assignment[stay.id]][stay.check_in:stay.check_out] = b"\x01" * (stay.check_out - stay.check_in)
+            sold = 0
+            for check_in, check_out in extra_requests:
+                room = self._first_free(layout, check_in, check_out, 0)
+                if room is not None:
+                    layout[room][check_in:check_out] = b"\x01" * (check_out - check_in)
+                    sold += check_out - check_in
+            occupancy = (booked + sold) / (rooms * nights)
+            self.stdout.write(
+                f"{label:<13} unsellable gap nights {orphan_nights(assignment, stays):>7}  "
+                f"extra nights sold {sold:>7}  final occupancy {occupancy:.1%}"
+            )
+
+    def _first_free(self, calendar, check_in, check_out, offset):
+        rooms = len(calendar)
+        for i in range(rooms):
+            room = (offset + i) % rooms
+            if calendar[room].find(1, check_in, check_out) == -1:
+                return room
+        return None
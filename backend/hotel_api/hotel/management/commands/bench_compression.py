@@ -0,0 +1,75 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hotel.middleware import brotli
+from hotel.models import Booking, Room
+
+
+class Command(BaseCommand):
+    help = "Measure bytes on the wire and time-to-first-byte for large list responses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=5000, help="Synthetic bookings to add (rolled back afterwards).")
+
+    def handle(self, *args, **options):
+        rooms = list(Room.objects.all())
+        if not rooms:
+            raise CommandError("No rooms in the database, run `migrate` first.")
+
+        with transaction.atomic():
+            admin = User.objects.filter(is_staff=True).first() or User.objects.create_superuser("bench-admin", password="x")
+            today = timezone.localdate()
+            Booking.objects.bulk_create(
+                Booking(
+                    hotel_id=rooms[i % len(rooms)].hotel_id,
+                    user=admin,
+                    room=rooms[i % len(rooms)],
+                    check_in=today + timedelta(days=i % 365),
+                    check_out=today + timedelta(days=i % 365 + 2),
+                    guests=2,
+                    price_per_night=rooms[i % len(rooms)].price_per_night,
+                )
+                for i in range(options["bookings"])
+            )
+
+            client = APIClient(HTTP_HOST="localhost")
+            client.force_authenticate(admin)
+
+            cases = [
+                ("/api/rooms/", ""),
+                ("/api/rooms/", "gzip"),
+                ("/api/admin/bookings/", ""),
+                ("/api/admin/bookings/", "gzip"),
+                ("/api/admin/bookings/export/", ""),
+                ("/api/admin/bookings/export/", "gzip"),
+            ]
+            if brotli is not None:
+                cases += [("/api/rooms/", "br"), ("/api/admin/bookings/export/", "br")]
+
+            self.stdout.write(f"{'path':<28} {'encoding':<9} {'bytes':>11} {'ttfb ms':>9} {'total ms':>9}")
+            for path, encoding in cases:
+                size, ttfb, total = self._fetch(client, path, encoding)
+                self.stdout.write(f"{path:<28} {encoding or 'identity':<9} {size:>11,} {ttfb * 1000:>9.1f} {total * 1000:>9.1f}")
+
+            transaction.set_rollback(True)
+
+    def _fetch(self, client, path, encoding):
+        start = time.perf_counter()
+        response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+        if not response.streaming:
+            elapsed = time.perf_counter() - start
+            return len(response.content), elapsed, elapsed
+
+        ttfb = None
+        size = 0
+        for chunk in response.streaming_content:
+            if chunk and ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+        return size, ttfb, time.perf_counter() - start
@@ -0,0 +1,68 @@
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.ingest import ContactMessageBuffer
+from hotel.models import ContactMessage
+from hotel.serializers import ContactMessageSerializer
+
+BENCH_DOMAIN = "bench.invalid"
+
+
+class Command(BaseCommand):
+    help = "Compare contact message throughput: one INSERT per submission vs buffered bulk_create."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=2000)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--fsync", action="store_true", help="fsync the durability log on every submission.")
+
+    def handle(self, *args, **options):
+        count = options["messages"]
+        payloads = [
+            {
+                "name": f"Guest {i}",
+                "email": f"guest{i}@{BENCH_DOMAIN}",
+                "subject": "Late checkout",
+                "message": "Could we check out at 2pm instead of 11am? " * 4,
+            }
+            for i in range(count)
+        ]
+
+        try:
+            start = time.perf_counter()
+            for payload in payloads:
+                serializer = ContactMessageSerializer(data=payload)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+            self._report("direct INSERT", count, time.perf_counter() - start, None)
+            self._cleanup()
+
+            with tempfile.TemporaryDirectory() as log_dir:
+                buffer = ContactMessageBuffer(
+                    batch_size=options["batch_size"],
+                    flush_interval=1.0,
+                    log_dir=log_dir,
+                    fsync=options["fsync"],
+                )
+                buffer.start()
+                start = time.perf_counter()
+                for payload in payloads:
+                    serializer = ContactMessageSerializer(data=payload)
+                    serializer.is_valid(raise_exception=True)
+                    buffer.submit(serializer.validated_data)
+                accepted = time.perf_counter() - start
+                buffer.stop()
+                self._report("buffered", count, time.perf_counter() - start, accepted)
+        finally:
+            self._cleanup()
+
+    def _report(self, label, count, elapsed, accepted):
+        line = f"{label:<14} {count} msgs  {elapsed * 1000:9.1f} ms  {count / elapsed:9.0f} msg/s committed"
+        if accepted is not None:
+            line += f"  {count / accepted:9.0f} msg/s accepted"
+        self.stdout.write(line)
+
+    def _cleanup(self):
+        ContactMessage.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").delete()
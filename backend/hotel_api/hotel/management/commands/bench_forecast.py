@@ -0,0 +1,45 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.forecast import np, night_histogram, project
+
+
+class Command(BaseCommand):
+    help = "Benchmark the occupancy forecast on synthetic booking history (no database needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=2000000)
+        parser.add_argument("--types", type=int, default=4)
+        parser.add_argument("--history", type=int, default=365)
+        parser.add_argument("--horizon", type=int, default=90)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        types, history, horizon = options["types"], options["history"], options["horizon"]
+        days = history + horizon
+
+        codes, booked, check_in, check_out = [], [], [], []
+        for _ in range(options["bookings"]):
+            night = rng.randrange(days)
+            codes.append(rng.randrange(types))
+            # Most bookings are made within a few weeks of the stay
+            booked.append(min(night - int(rng.expovariate(1 / 21)), history))
+            check_in.append(night)
+            check_out.append(night + rng.choice([1, 1, 2, 2, 3, 4, 5, 7]))
+        weights = [1] * len(codes)
+
+        start = time.perf_counter()
+        histogram = night_histogram(codes, booked, check_in, check_out, weights, types, days, horizon)
+        counted = time.perf_counter() - start
+        for code in range(types):
+            project(histogram[code], history, horizon, 0)
+        total = time.perf_counter() - start
+
+        backend = "NumPy" if np is not None else "pure Python"
+        self.stdout.write(
+            f"{len(codes)} bookings, {types} room types: histogram {counted:.2f}s, "
+            f"forecast {total:.2f}s ({backend})"
+        )
@@ -0,0 +1,70 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from hotel.models import Booking, Room
+from hotel.renderers import FastJSONRenderer, orjson
+from hotel.serializers import AdminBookingSerializer, RoomSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare JSON encode throughput of the stock and orjson renderers on API payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows per payload (rooms are repeated to reach it).")
+        parser.add_argument("--repeat", type=int, default=20, help="Encodes per renderer.")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+
+        rooms = list(Room.objects.prefetch_related("images"))
+        if not rooms:
+            raise CommandError("No rooms in the database, run `migrate` first.")
+        user = User.objects.first() or User(id=1, username="bench")
+
+        room_data = list(RoomSerializer(rooms, many=True).data)
+        today = timezone.localdate()
+        bookings = [
+            Booking(
+                id=i + 1,
+                hotel_id=rooms[i % len(rooms)].hotel_id,
+                user=user,
+                room=rooms[i % len(rooms)],
+                check_in=today + timedelta(days=i % 90),
+                check_out=today + timedelta(days=i % 90 + 2),
+                guests=2,
+                price_per_night=rooms[i % len(rooms)].price_per_night,
+                status="pending",
+                created_at=timezone.now(),
+            )
+            for i in range(len(rooms))
+        ]
+        booking_data = list(AdminBookingSerializer(bookings, many=True).data)
+
+        payloads = {
+            "rooms": (room_data * (rows // len(room_data) + 1))[:rows],
+            "bookings": (booking_data * (rows // len(booking_data) + 1))[:rows],
+        }
+
+        self.stdout.write(f"orjson installed: {orjson is not None}")
+        for name, payload in payloads.items():
+            # A speed-up only counts if the bytes on the wire are unchanged
+            if JSONRenderer().render(payload) != FastJSONRenderer().render(payload):
+                raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer.")
+            baseline = None
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                size = len(renderer.render(payload))
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    renderer.render(payload)
+                elapsed = (time.perf_counter() - start) / repeat
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{name:<9} {type(renderer).__name__:<17} {rows} rows  {size / 1024:9.1f} KiB  "
+                    f"{elapsed * 1000:8.2f} ms  {size / elapsed / 2**20:8.1f} MiB/s  x{baseline / elapsed:.2f}"
+                )
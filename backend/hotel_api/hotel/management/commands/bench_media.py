@@ -0,0 +1,46 @@
+import os
+import time
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+
+class Command(BaseCommand):
+    help = "Measure requests/s for image fetches through /media/ (full, conditional, range and offloaded)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--size", type=int, default=256 * 1024, help="Bytes in the synthetic image.")
+
+    def handle(self, *args, **options):
+        # Random bytes: a fresh blob that no row references
+        name = default_storage.save("bench.jpg", ContentFile(os.urandom(options["size"]), "bench.jpg"))
+        try:
+            url = default_storage.url(name)
+            client = Client(HTTP_HOST="localhost")
+            etag = client.get(url)["ETag"]
+
+            cases = [
+                ("full body", {}, {}),
+                ("If-None-Match (304)", {"HTTP_IF_NONE_MATCH": etag}, {}),
+                ("Range first 64 KiB", {"HTTP_RANGE": "bytes=0-65535"}, {}),
+                ("X-Accel-Redirect", {}, {"MEDIA_SENDFILE": "x-accel-redirect"}),
+            ]
+            self.stdout.write(f"{name} ({options['size']:,} bytes)")
+            self.stdout.write(f"{'case':<22} {'status':>6} {'req/s':>9} {'bytes/req':>10}")
+            for label, headers, overrides in cases:
+                with override_settings(**overrides):
+                    status, rate, size = self._run(client, url, headers, options["requests"])
+                self.stdout.write(f"{label:<22} {status:>6} {rate:>9,.0f} {size:>10,}")
+        finally:
+            default_storage.delete(name)
+
+    def _run(self, client, url, headers, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            response = client.get(url, **headers)
+            size = sum(len(chunk) for chunk in response.streaming_content) if response.streaming else len(response.content)
+            response.close()
+        return response.status_code, count / (time.perf_counter() - start), size
@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+
+from hotel.hotels import get_default_hotel
+from hotel.models import Room
+from hotel.routers import get_replicas, replica_reads
+from hotel.serializers import RoomSerializer
+
+
+class Command(BaseCommand):
+    help = "Measure read throughput of the public room list with 0..N read replicas (settings.DATABASE_REPLICAS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--sync", action="store_true", help="Copy the primary into SQLite replicas first.")
+
+    def handle(self, *args, **options):
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError("No replicas configured; try HOTEL_DB_REPLICAS=2 with --sync.")
+        if options["sync"]:
+            for alias in replicas:
+                self._copy_sqlite(alias)
+
+        hotel = get_default_hotel()
+        self.stdout.write(f"{'replicas':>8} {'threads':>7} {'reads/s':>9}  distribution")
+        for count in range(len(replicas) + 1):
+            with override_settings(DATABASE_REPLICAS=replicas[:count]):
+                rate, used = self._run(hotel, options["requests"], options["threads"])
+            spread = ", ".join(f"{alias} {n}" for alias, n in sorted(used.items()))
+            self.stdout.write(f"{count:>8} {options['threads']:>7} {rate:>9,.0f}  {spread}")
+
+    def _copy_sqlite(self, alias):
+        primary, replica = settings.DATABASES["default"], settings.DATABASES[alias]
+        if not (primary["ENGINE"] == replica["ENGINE"] == "django.db.backends.sqlite3"):
+            raise CommandError(f"--sync only copies SQLite databases ({alias} isn't).")
+        connections[alias].close()
+        with sqlite3.connect(primary["NAME"]) as source, sqlite3.connect(replica["NAME"]) as target:
+            source.backup(target)
+        self.stdout.write(f"Copied {primary['NAME']} to {replica['NAME']}.")
+
+    def _run(self, hotel, total, threads):
+        used = Counter()
+        lock = threading.Lock()
+
+        def worker(count):
+            seen = Counter()
+            with replica_reads():
+                for _ in range(count):
+                    rooms = list(Room.objects.filter(hotel=hotel).prefetch_related("images"))
+                    seen[rooms[0]._state.db if rooms else "none"] += 1
+                    RoomSerializer(rooms, many=True).data
+            connections.close_all()
+            with lock:
+                used.update(seen)
+
+        per_thread = max(total // threads, 1)
+        workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return per_thread * threads / (time.perf_counter() - start), used
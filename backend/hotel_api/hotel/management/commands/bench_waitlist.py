@@ -0,0 +1,114 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from hotel.models import Room, WaitlistEntry
+from hotel.waitlist import candidates
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark waitlist matching on synthetic entries (written in a transaction that is rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entries", type=int, default=100000)
+        parser.add_argument("--lookups", type=int, default=200, help="Freed intervals to match.")
+        parser.add_argument("--days", type=int, default=365, help="Spread of the waitlisted stays.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        room = Room.objects.select_related("hotel").first()
+        if room is None:
+            raise CommandError("Needs at least one room.")
+        try:
+            with transaction.atomic():
+                self._run(room, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, room, options):
+        rng = random.Random(options["seed"])
+        today = timezone.localdate()
+        days = options["days"]
+        user = User.objects.create(username=f"bench-waitlist-{time.time_ns()}")
+        room_types = [value for value, _ in Room.ROOM_TYPES]
+
+        entries = []
+        for _ in range(options["entries"]):
+            check_in = today + timedelta(days=rng.randrange(days))
+            entries.append(
+                WaitlistEntry(
+                    hotel_id=room.hotel_id,
+                    user=user,
+                    # Most entries want other room types; the index skips them
+                    room_type=room.room_type if rng.random() < 0.25 else rng.choice(room_types),
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=rng.choice([1, 1, 2, 2, 3, 4, 5, 7])),
+                    guests=rng.randint(1, 4),
+                    status="waiting" if rng.random() < 0.9 else "lapsed",
+                )
+            )
+        start = time.perf_counter()
+        WaitlistEntry.objects.bulk_create(entries, batch_size=2000)
+        self.stdout.write(f"Inserted {len(entries)} entries in {time.perf_counter() - start:.2f}s")
+
+        freed = []
+        for _ in range(options["lookups"]):
+            check_in = today + timedelta(days=rng.randrange(days))
+            check_out = check_in + timedelta(days=rng.randint(1, 5))
+            # The free gap around the freed nights
+            freed.append((check_in - timedelta(days=rng.randint(0, 3)), check_out + timedelta(days=rng.randint(0, 3)), check_in, check_out))
+
+        indexed, found = [], 0
+        for gap_start, gap_end, freed_in, freed_out in freed:
+            start = time.perf_counter()
+            found += len(list(candidates(room, gap_start, gap_end, freed_in, freed_out)))
+            indexed.append(time.perf_counter() - start)
+
+        # What matching costs without the index: read every waiting entry
+        # of the hotel and filter in Python
+        naive = []
+        for gap_start, gap_end, freed_in, freed_out in freed[:20]:
+            start = time.perf_counter()
+            rows = WaitlistEntry.objects.filter(hotel_id=room.hotel_id, status="waiting").values_list(
+                "id", "room_type", "check_in", "check_out", "guests"
+            )
+            [
+                row for row in rows
+                if row[1] == room.room_type
+                and gap_start <= row[2] < min(gap_end, freed_out)
+                and freed_in < row[3] <= gap_end
+                and row[4] <= room.capacity
+            ]
+            naive.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f"indexed  median {statistics.median(indexed) * 1000:7.2f} ms  "
+            f"max {max(indexed) * 1000:7.2f} ms  ({found / len(freed):.1f} candidates per gap)"
+        )
+        self.stdout.write(
+            f"scan     median {statistics.median(naive) * 1000:7.2f} ms  max {max(naive) * 1000:7.2f} ms"
+        )
+
+        gap_start, gap_end, freed_in, freed_out = freed[0]
+        sql, params = candidates(room, gap_start, gap_end, freed_in, freed_out).query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            else:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                plan = [row[0] for row in cursor.fetchall()]
+        self.stdout.write("Plan:")
+        for line in plan:
+            self.stdout.write(f"  {line}")
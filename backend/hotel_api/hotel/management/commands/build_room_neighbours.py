@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.similarity import np, rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Precompute similar rooms for every hotel (SIMILAR_ROOMS['K'] per room)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--k", type=int, help="Neighbours per room.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        changed = rebuild_all(options["k"])
+        backend = "NumPy" if np is not None else "pure Python"
+        self.stdout.write(
+            f"Rewrote neighbours of {changed} rooms in {time.perf_counter() - start:.2f}s ({backend})."
+        )
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from hotel.media import collect_orphans, reconcile
+
+
+class Command(BaseCommand):
+    help = "Delete media blobs that no row has referenced for settings.MEDIA_ORPHAN_GRACE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reconcile", action="store_true", help="Recount references from the tables first.")
+        parser.add_argument("--grace-minutes", type=int, help="Override MEDIA_ORPHAN_GRACE.")
+        parser.add_argument("--dry-run", action="store_true", help="Only list the blobs that would be deleted.")
+
+    def handle(self, *args, **options):
+        if options["reconcile"]:
+            self.stdout.write(f"Corrected {reconcile()} reference counts.")
+        grace = options["grace_minutes"]
+        grace = None if grace is None else timedelta(minutes=grace)
+        names = collect_orphans(grace, options["dry_run"])
+        for name in names:
+            self.stdout.write(name)
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(f"{verb} {len(names)} media blobs.")
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.bookings import expire_stale_holds
+
+
+class Command(BaseCommand):
+    help = "Expire pending bookings whose hold (BOOKING_HOLD_TTL) has run out."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and sweep every INTERVAL seconds instead of once.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_stale_holds(batch_size=options["batch_size"])
+            if expired or not options["interval"]:
+                self.stdout.write(f"Expired {expired} pending bookings.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hotel.ari import prune, sync_all, write_snapshot
+from hotel.models import Hotel
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the ARI feed for every night of the horizon, write a gzipped snapshot per hotel "
+        "and delete changes older than ARI['RETENTION']. Run it daily."
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        changed = sync_all()
+        self.stdout.write(f"Recomputed ARI: {changed} nights changed in {time.perf_counter() - start:.2f}s.")
+        for hotel in Hotel.objects.filter(is_active=True):
+            path = write_snapshot(hotel)
+            self.stdout.write(f"Wrote {path} ({path.stat().st_size} bytes).")
+        self.stdout.write(f"Deleted {prune()} ARI changes.")
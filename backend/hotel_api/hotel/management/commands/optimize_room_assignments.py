@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hotel.allocation import reoptimize
+from hotel.models import Hotel, Room
+
+
+class Command(BaseCommand):
+    help = "Re-pack future room-type bookings onto physical rooms to minimise unsellable gaps."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365, help="How far ahead to optimize.")
+        parser.add_argument(
+            "--type",
+            action="append",
+            dest="room_types",
+            choices=[choice for choice, _ in Room.ROOM_TYPES],
+            help="Only this room type (repeatable).",
+        )
+        parser.add_argument("--hotel", action="append", dest="hotels", help="Only this hotel slug (repeatable).")
+        parser.add_argument("--dry-run", action="store_true", help="Report the gain without moving bookings.")
+
+    def handle(self, *args, **options):
+        hotels = None
+        if options["hotels"]:
+            hotels = list(Hotel.objects.filter(slug__in=options["hotels"]))
+            unknown = set(options["hotels"]) - {hotel.slug for hotel in hotels}
+            if unknown:
+                raise CommandError(f"Unknown hotel: {', '.join(sorted(unknown))}")
+        stats = reoptimize(options["room_types"], days=options["days"], dry_run=options["dry_run"], hotels=hotels)
+
+        for (hotel, room_type), row in stats.items():
+            label = f"{hotel}/{room_type}"
+            if row["error"]:
+                self.stderr.write(f"{label:<24} left unchanged: {row['error']}")
+                continue
+            if row["orphans_after"] is None:
+                self.stdout.write(f"{label:<24} could not be re-packed, left unchanged")
+                continue
+            self.stdout.write(
+                f"{label:<24} moved {row['moved']:>5}  "
+                f"unsellable nights {row['orphans_before']} -> {row['orphans_after']}"
+            )
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from hotel.feed import prune
+
+
+class Command(BaseCommand):
+    help = "Delete change feed events older than CHANGE_FEED['RETENTION']."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override the retention period.")
+
+    def handle(self, *args, **options):
+        retention = None if options["days"] is None else timedelta(days=options["days"])
+        self.stdout.write(f"Deleted {prune(retention)} change events.")
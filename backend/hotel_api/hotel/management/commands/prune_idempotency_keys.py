@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from hotel.idempotency import prune
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key responses older than IDEMPOTENCY['TTL']."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Deleted {prune()} idempotency keys.")
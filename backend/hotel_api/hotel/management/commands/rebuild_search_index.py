@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from hotel.models import SearchDocument
+from hotel.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents (e.g. after bulk imports that bypass signals)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=[kind for kind, _ in SearchDocument.KIND_CHOICES],
+            help="Only rebuild this kind (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_index(options["kind"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from hotel.reviews import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute room ratings and review counts from the reviews table."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Fixed review totals of {reconcile()} rooms.")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from hotel.ingest import ContactMessageBuffer, get_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the contact messages left in CONTACT_INGEST['LOG_DIR'] by processes that are gone. "
+        "Run on deploy, before serving."
+    )
+
+    def handle(self, *args, **options):
+        log_dir = get_config()["LOG_DIR"]
+        if not log_dir:
+            self.stdout.write("CONTACT_INGEST['LOG_DIR'] is not set.")
+            return
+        self.stdout.write(f"Replayed {ContactMessageBuffer(log_dir=log_dir).replay()} contact messages.")
@@ -0,0 +1,165 @@
+"""
+Reference counting of media files across the models that hold them.
+
+Every file name stored in one of MEDIA_FIELDS has a MediaBlob row counting
+how many rows use it. Saves and deletes adjust the counts through signals
+(including rows removed by on_delete=CASCADE), so a photo shared by several
+rooms stays on disk until the last room lets go of it.
+
+Blobs are not deleted the moment their count reaches zero: an upload of the
+same content could be about to reuse them. `collect_orphans` (run by the
+`cleanup_media` command) deletes blobs that have been unreferenced for
+MEDIA_ORPHAN_GRACE, and `reconcile` rebuilds the counts from the tables
+after bulk updates that bypass signals. An upload `hold`s its blob's row
+while it decides whether to write the file, and the collector deletes the
+row and the file in one transaction, so the file can't disappear under an
+upload that found it in place.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .models import GalleryImage, MediaBlob, Profile, Room, RoomImage
+from .snapshots import stored
+
+MEDIA_FIELDS = {
+    Room: ("cover_image",),
+    RoomImage: ("image",),
+    GalleryImage: ("image",),
+    Profile: ("avatar",),
+}
+
+
+def get_orphan_grace():
+    return getattr(settings, "MEDIA_ORPHAN_GRACE", timedelta(hours=1))
+
+
+def _names(instance, fields):
+    return Counter(name for name in (getattr(instance, field).name for field in fields) if name)
+
+
+def acquire(names):
+    """Add one reference to each name in `names` (a Counter or iterable)."""
+    for name, count in Counter(names).items():
+        MediaBlob.objects.get_or_create(name=name)
+        MediaBlob.objects.filter(name=name).update(refcount=F("refcount") + count, orphaned_at=None)
+
+
+def hold(name):
+    """
+    Lock the blob row of `name` until the transaction ends, creating it if
+    needed, and restart the grace period of an unreferenced blob. The first
+    statement is a write, so SQLite takes its write lock here too.
+    """
+    now = timezone.now()
+    orphaned_at = Case(When(refcount=0, then=Value(now)))
+    if MediaBlob.objects.filter(name=name).update(orphaned_at=orphaned_at):
+        return
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(name=name, orphaned_at=now)
+    except IntegrityError:
+        # Created concurrently: wait for its holder
+        MediaBlob.objects.filter(name=name).update(orphaned_at=orphaned_at)
+
+
+def release(names):
+    """Drop one reference from each name; blobs reaching zero become orphans."""
+    now = timezone.now()
+    for name, count in Counter(names).items():
+        MediaBlob.objects.filter(name=name, refcount__gte=count).update(refcount=F("refcount") - count)
+        MediaBlob.objects.filter(name=name, refcount=0, orphaned_at__isnull=True).update(orphaned_at=now)
+
+
+# ---------- SIGNALS ----------
+
+def remember_names(sender, instance, raw=False, **kwargs):
+    before = Counter()
+    row = None if raw else stored(instance)
+    if row:
+        before = Counter(name for name in (row[field] for field in MEDIA_FIELDS[sender]) if name)
+    instance._media_names_before = before
+
+
+def update_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_media_names_before", Counter())
+    after = _names(instance, MEDIA_FIELDS[sender])
+    acquire(after - before)
+    release(before - after)
+    instance._media_names_before = after
+
+
+def release_names(sender, instance, **kwargs):
+    release(_names(instance, MEDIA_FIELDS[sender]))
+
+
+for model in MEDIA_FIELDS:
+    pre_save.connect(remember_names, sender=model, dispatch_uid=f"media-pre-save-{model.__name__}")
+    post_save.connect(update_counts, sender=model, dispatch_uid=f"media-post-save-{model.__name__}")
+    post_delete.connect(release_names, sender=model, dispatch_uid=f"media-post-delete-{model.__name__}")
+
+
+# ---------- MAINTENANCE ----------
+
+def count_references():
+    counts = Counter()
+    for model, fields in MEDIA_FIELDS.items():
+        for field in fields:
+            names = model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+            counts.update(names.values_list(field, flat=True).iterator())
+    return counts
+
+
+@transaction.atomic
+def reconcile():
+    """
+    Recount references from the tables. Returns the number of blobs whose
+    count was wrong.
+    """
+    counts = count_references()
+    now = timezone.now()
+    fixed = 0
+    for blob in MediaBlob.objects.select_for_update():
+        refcount = counts.pop(blob.name, 0)
+        if blob.refcount != refcount:
+            blob.refcount = refcount
+            blob.orphaned_at = None if refcount else (blob.orphaned_at or now)
+            blob.save(update_fields=["refcount", "orphaned_at"])
+            fixed += 1
+    # Names referenced but never counted (e.g. rows created with bulk_create)
+    MediaBlob.objects.bulk_create(MediaBlob(name=name, refcount=count) for name, count in counts.items())
+    return fixed + len(counts)
+
+
+def collect_orphans(grace=None, dry_run=False, storage=None):
+    """
+    Delete blobs unreferenced for longer than `grace` from storage and from
+    the MediaBlob table. Returns the names removed.
+    """
+    storage = storage or default_storage
+    cutoff = timezone.now() - (get_orphan_grace() if grace is None else grace)
+    candidates = list(
+        MediaBlob.objects.filter(refcount=0, orphaned_at__lte=cutoff).values_list("name", flat=True)
+    )
+    if dry_run:
+        return candidates
+
+    removed = []
+    for name in candidates:
+        # Conditional delete: skip blobs re-referenced or held by an upload
+        # since we listed them. The row stays locked until the file is gone.
+        with transaction.atomic():
+            deleted, _ = MediaBlob.objects.filter(name=name, refcount=0, orphaned_at__lte=cutoff).delete()
+            if deleted:
+                storage.delete(name)
+        if deleted:
+            removed.append(name)
+    return removed
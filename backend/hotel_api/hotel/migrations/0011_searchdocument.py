@@ -0,0 +1,139 @@
+# Generated by Django 6.0 on 2026-10-19 18:08
+
+from django.db import OperationalError, migrations, models, transaction
+
+FTS_SQL = [
+    # External-content FTS5 table over hotel_searchdocument, kept in sync by
+    # triggers. Altering hotel_searchdocument on SQLite rebuilds the table and
+    # drops the triggers, so any such migration must re-create them.
+    "CREATE VIRTUAL TABLE hotel_searchdocument_fts USING fts5("
+    "title, body, content='hotel_searchdocument', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER hotel_searchdocument_ai AFTER INSERT ON hotel_searchdocument BEGIN "
+    "INSERT INTO hotel_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+    "CREATE TRIGGER hotel_searchdocument_ad AFTER DELETE ON hotel_searchdocument BEGIN "
+    "INSERT INTO hotel_searchdocument_fts(hotel_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "END",
+    "CREATE TRIGGER hotel_searchdocument_au AFTER UPDATE ON hotel_searchdocument BEGIN "
+    "INSERT INTO hotel_searchdocument_fts(hotel_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO hotel_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+]
+
+PG_SQL = [
+    "CREATE INDEX hotel_searchdocument_tsv ON hotel_searchdocument USING GIN "
+    "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(body, '')))",
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        try:
+            with transaction.atomic(using=connection.alias):
+                for sql in FTS_SQL:
+                    schema_editor.execute(sql)
+        except OperationalError:
+            # SQLite built without FTS5: hotel.search falls back to icontains.
+            pass
+    elif connection.vendor == "postgresql":
+        for sql in PG_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        for name in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS hotel_searchdocument_{name}")
+        schema_editor.execute("DROP TABLE IF EXISTS hotel_searchdocument_fts")
+    elif connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS hotel_searchdocument_tsv")
+
+
+# Frozen copies of hotel.search's document builders as of this migration, so
+# later changes to the live ones (or to the models) can't break it.
+
+def room_document(room):
+    room_types = dict(room._meta.get_field("room_type").choices)
+    title = f"Room {room.number} {room_types.get(room.room_type, room.room_type)}"
+    body = " ".join(
+        [room.description or "", room.view or "", room.bed_preference or ""]
+        + [str(item) for item in room.amenities or []]
+        + [str(item) for item in room.special_features or []]
+    )
+    return title, body
+
+
+def gallery_document(image):
+    return image.title or "", ""
+
+
+def message_document(message):
+    return message.subject, message.message
+
+
+def backfill_search_documents(apps, schema_editor):
+    SearchDocument = apps.get_model("hotel", "SearchDocument")
+    sources = {
+        "room": (apps.get_model("hotel", "Room"), room_document),
+        "gallery": (apps.get_model("hotel", "GalleryImage"), gallery_document),
+        "message": (apps.get_model("hotel", "ContactMessage"), message_document),
+    }
+    for kind, (model, builder) in sources.items():
+        documents = []
+        for obj in model.objects.iterator():
+            title, body = builder(obj)
+            documents.append(SearchDocument(kind=kind, object_id=obj.pk, title=title[:255], body=body))
+        SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0010_contactmessage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("room", "Room"),
+                            ("gallery", "Gallery image"),
+                            ("message", "Contact message"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("title", models.CharField(blank=True, default="", max_length=255)),
+                ("body", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"), name="unique_search_document"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-19 18:15
+
+from django.db import migrations, models
+
+
+def backfill_room_type(apps, schema_editor):
+    Booking = apps.get_model("hotel", "Booking")
+    Room = apps.get_model("hotel", "Room")
+    Booking.objects.update(
+        room_type=models.Subquery(
+            Room.objects.filter(pk=models.OuterRef("room_id")).values("room_type")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0012_booking_lifecycle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="room_locked",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="room_type",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("single", "Single"),
+                    ("double", "Double"),
+                    ("suite", "Suite"),
+                    ("family_suite", "Family Suite"),
+                ],
+                default="",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(backfill_room_type, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-19 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0013_booking_room_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["user", "check_in"], name="booking_user_check_in_idx"
+            ),
+        ),
+    ]
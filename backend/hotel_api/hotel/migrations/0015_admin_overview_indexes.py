@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 18:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0014_booking_user_check_in_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["check_in"], name="booking_check_in_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["check_out"], name="booking_check_out_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                fields=["is_read", "created_at"], name="contact_read_created_idx"
+            ),
+        ),
+    ]
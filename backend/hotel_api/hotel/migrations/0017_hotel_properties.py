@@ -0,0 +1,120 @@
+# Generated by Django 6.0 on 2026-10-19 18:50
+
+import django.db.models.deletion
+import hotel.models
+from django.conf import settings
+from django.db import migrations, models
+
+SCOPED_MODELS = ("room", "booking", "galleryimage", "teammember")
+RELATED_NAMES = {"room": "rooms", "booking": "bookings", "galleryimage": "gallery", "teammember": "team"}
+
+
+def assign_default_hotel(apps, schema_editor):
+    Hotel = apps.get_model("hotel", "Hotel")
+    default, _ = Hotel.objects.get_or_create(slug="main", defaults={"name": "Main"})
+    for model_name in SCOPED_MODELS:
+        apps.get_model("hotel", model_name).objects.update(hotel=default)
+
+
+def hotel_field(model_name, **kwargs):
+    return models.ForeignKey(
+        on_delete=django.db.models.deletion.CASCADE,
+        related_name=RELATED_NAMES[model_name],
+        to="hotel.hotel",
+        **kwargs,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0016_booking_checked_in_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Hotel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=150)),
+                ("slug", models.SlugField(unique=True)),
+                ("address", models.CharField(blank=True, default="", max_length=255)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["name", "id"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_check_in_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_check_out_idx",
+        ),
+        migrations.AlterField(
+            model_name="room",
+            name="number",
+            field=models.CharField(max_length=10),
+        ),
+        # Nullable first, filled with the default property, then required
+        *[
+            migrations.AddField(model_name=model_name, name="hotel", field=hotel_field(model_name, null=True))
+            for model_name in SCOPED_MODELS
+        ],
+        migrations.RunPython(assign_default_hotel, migrations.RunPython.noop),
+        *[
+            migrations.AlterField(
+                model_name=model_name,
+                name="hotel",
+                field=hotel_field(model_name, default=hotel.models.get_default_hotel_id),
+            )
+            for model_name in SCOPED_MODELS
+        ],
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["hotel", "check_in"], name="booking_hotel_check_in_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["hotel", "check_out"], name="booking_hotel_check_out_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="galleryimage",
+            index=models.Index(
+                fields=["hotel", "-is_featured", "-created_at"],
+                name="gallery_hotel_featured_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["hotel", "room_type"], name="room_hotel_type_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teammember",
+            index=models.Index(fields=["hotel", "order"], name="team_hotel_order_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="room",
+            constraint=models.UniqueConstraint(
+                fields=("hotel", "number"), name="room_hotel_number_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 6.0 on 2026-10-19 19:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0017_hotel_properties"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedContactMessage",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=100)),
+                ("email", models.EmailField(max_length=254)),
+                ("subject", models.CharField(max_length=200)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField(db_index=True)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at", "id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedBooking",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("username", models.CharField(max_length=150)),
+                ("room_id", models.BigIntegerField()),
+                ("room_number", models.CharField(max_length=10)),
+                ("room_type", models.CharField(max_length=20)),
+                (
+                    "price_per_night",
+                    models.DecimalField(decimal_places=2, max_digits=8),
+                ),
+                ("check_in", models.DateField()),
+                ("check_out", models.DateField()),
+                ("guests", models.IntegerField()),
+                ("status", models.CharField(max_length=20)),
+                ("checked_in_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "hotel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_bookings",
+                        to="hotel.hotel",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_bookings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-check_in", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["hotel", "check_in"],
+                        name="archbooking_hotel_check_in_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "check_in"],
+                        name="archbooking_user_check_in_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-19 18:31
+
+from collections import Counter
+
+from django.db import migrations, models
+
+MEDIA_FIELDS = (
+    ("Room", "cover_image"),
+    ("RoomImage", "image"),
+    ("GalleryImage", "image"),
+    ("Profile", "avatar"),
+)
+
+
+def count_existing_media(apps, schema_editor):
+    counts = Counter()
+    for model_name, field in MEDIA_FIELDS:
+        model = apps.get_model("hotel", model_name)
+        names = model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+        counts.update(names.values_list(field, flat=True).iterator())
+    MediaBlob = apps.get_model("hotel", "MediaBlob")
+    MediaBlob.objects.bulk_create(MediaBlob(name=name, refcount=count) for name, count in counts.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0018_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("refcount", models.PositiveIntegerField(default=0)),
+                (
+                    "orphaned_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(count_existing_media, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-19 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0022_reviews"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomNeighbour",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "neighbour",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbour_of",
+                        to="hotel.room",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbours",
+                        to="hotel.room",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["room", "rank"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("room", "rank"), name="roomneighbour_room_rank_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
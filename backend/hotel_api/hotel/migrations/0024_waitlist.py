@@ -0,0 +1,106 @@
+# Generated by Django 6.0 on 2026-10-19 20:31
+
+import django.db.models.deletion
+import hotel.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0023_room_neighbours"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitlistEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "room_type",
+                    models.CharField(
+                        choices=[
+                            ("single", "Single"),
+                            ("double", "Double"),
+                            ("suite", "Suite"),
+                            ("family_suite", "Family Suite"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("check_in", models.DateField()),
+                ("check_out", models.DateField()),
+                ("guests", models.PositiveSmallIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("waiting", "Waiting"),
+                            ("offered", "Offered"),
+                            ("booked", "Booked"),
+                            ("lapsed", "Offer lapsed"),
+                        ],
+                        default="waiting",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("offered_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "booking",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="waitlist_entry",
+                        to="hotel.booking",
+                    ),
+                ),
+                (
+                    "hotel",
+                    models.ForeignKey(
+                        default=hotel.models.get_default_hotel_id,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist",
+                        to="hotel.hotel",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "hotel",
+                            "room_type",
+                            "status",
+                            "check_in",
+                            "check_out",
+                        ],
+                        name="waitlist_match_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "created_at"], name="waitlist_user_created_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-20 10:40
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def sequence_existing(apps, schema_editor):
+    # Committed events keep their id as position: clients' cursors stay valid
+    ChangeEvent = apps.get_model("hotel", "ChangeEvent")
+    ChangeSequence = apps.get_model("hotel", "ChangeSequence")
+    ChangeEvent.objects.update(position=F("id"))
+    position = ChangeEvent.objects.aggregate(position=Max("id"))["position"] or 0
+    ChangeSequence.objects.create(pk=1, position=position)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0026_ari_lock"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.BigIntegerField(default=0)),
+                ("sequenced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="changeevent",
+            name="position",
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.RunPython(sequence_existing, migrations.RunPython.noop),
+    ]
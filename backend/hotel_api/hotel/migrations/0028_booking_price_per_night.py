@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-20 11:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_price_per_night(apps, schema_editor):
+    # The rate at the time of the booking is unknown: use the current one
+    Booking = apps.get_model("hotel", "Booking")
+    Room = apps.get_model("hotel", "Room")
+    Booking.objects.update(
+        price_per_night=Subquery(Room.objects.filter(pk=OuterRef("room_id")).values("price_per_night")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0027_change_position"),
+    ]
+
+    operations = [
+        # Nullable first, filled from the rooms, then required
+        migrations.AddField(
+            model_name="booking",
+            name="price_per_night",
+            field=models.DecimalField(decimal_places=2, max_digits=8, null=True),
+        ),
+        migrations.RunPython(fill_price_per_night, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="booking",
+            name="price_per_night",
+            field=models.DecimalField(decimal_places=2, max_digits=8),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-20 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0028_booking_price_per_night"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="changeevent",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("upsert", "Created or updated"),
+                    ("delete", "Deleted"),
+                    ("archive", "Moved to the archive"),
+                ],
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 6.0 on 2026-10-20 11:30
+
+import heapq
+import math
+
+from django.conf import settings
+from django.db import migrations
+
+# A frozen copy of hotel.similarity's features as of this migration, in
+# pure Python: rooms that existed before RoomNeighbour get their neighbours
+# without waiting for `build_room_neighbours`.
+FEATURE_WEIGHTS = {
+    "room_type": 2.0,
+    "capacity": 1.5,
+    "price_per_night": 1.5,
+    "floor": 0.5,
+    "view": 1.0,
+    "amenities": 1.0,
+    "special_features": 0.5,
+}
+
+
+def terms(values):
+    if not isinstance(values, list):
+        return set()
+    return {str(value).strip().lower() for value in values if str(value).strip()}
+
+
+def feature_vectors(rooms):
+    columns = []
+
+    def one_hot(labels, weight):
+        for term in sorted(set(labels)):
+            columns.append([weight if label == term else 0.0 for label in labels])
+
+    def multi_hot(term_sets, weight):
+        for term in sorted(set().union(*term_sets)):
+            columns.append([weight / math.sqrt(len(found)) if term in found else 0.0 for found in term_sets])
+
+    def numeric(values, weight):
+        low, high = min(values), max(values)
+        columns.append([weight * (value - low) / (high - low) if high > low else 0.0 for value in values])
+
+    one_hot([room.room_type for room in rooms], FEATURE_WEIGHTS["room_type"])
+    one_hot([room.view.strip().lower() for room in rooms], FEATURE_WEIGHTS["view"])
+    multi_hot([terms(room.amenities) for room in rooms], FEATURE_WEIGHTS["amenities"])
+    multi_hot([terms(room.special_features) for room in rooms], FEATURE_WEIGHTS["special_features"])
+    numeric([room.capacity for room in rooms], FEATURE_WEIGHTS["capacity"])
+    numeric([math.log1p(float(room.price_per_night)) for room in rooms], FEATURE_WEIGHTS["price_per_night"])
+    numeric([room.floor or 0 for room in rooms], FEATURE_WEIGHTS["floor"])
+    return [list(row) for row in zip(*columns)]
+
+
+def backfill_room_neighbours(apps, schema_editor):
+    Room = apps.get_model("hotel", "Room")
+    RoomNeighbour = apps.get_model("hotel", "RoomNeighbour")
+    k = getattr(settings, "SIMILAR_ROOMS", {}).get("K", 6)
+
+    rows = []
+    for hotel_id in Room.objects.order_by().values_list("hotel_id", flat=True).distinct():
+        rooms = list(Room.objects.filter(hotel_id=hotel_id).order_by("id"))
+        vectors = feature_vectors(rooms)
+        for i, room in enumerate(rooms):
+            scored = (
+                (sum((x - y) ** 2 for x, y in zip(vectors[i], other)), j)
+                for j, other in enumerate(vectors)
+                if j != i
+            )
+            for rank, (distance, j) in enumerate(heapq.nsmallest(k, scored), start=1):
+                rows.append(
+                    RoomNeighbour(room=room, neighbour=rooms[j], rank=rank, score=round(1 / (1 + distance), 6))
+                )
+    RoomNeighbour.objects.all().delete()
+    RoomNeighbour.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0029_changeevent_archive_action"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_room_neighbours, migrations.RunPython.noop),
+    ]
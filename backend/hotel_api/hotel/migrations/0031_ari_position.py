@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-20 11:40
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def sequence_existing(apps, schema_editor):
+    # Committed changes keep their id as position: consumers' cursors stay valid
+    AriChange = apps.get_model("hotel", "AriChange")
+    AriSequence = apps.get_model("hotel", "AriSequence")
+    AriChange.objects.update(position=F("id"))
+    position = AriChange.objects.aggregate(position=Max("id"))["position"] or 0
+    AriSequence.objects.create(pk=1, position=position)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0030_backfill_room_neighbours"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AriSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.BigIntegerField(default=0)),
+                ("sequenced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="arichange",
+            name="arichange_hotel_id_idx",
+        ),
+        migrations.AddField(
+            model_name="arichange",
+            name="position",
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.RunPython(sequence_existing, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="arichange",
+            index=models.Index(
+                fields=["hotel", "position"], name="arichange_hotel_position_idx"
+            ),
+        ),
+    ]
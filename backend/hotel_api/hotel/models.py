@@ -1,9 +1,48 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 
+DEFAULT_HOTEL_SLUG = "main"
+
+
+class Hotel(models.Model):
+    """A property. Rooms, bookings, gallery and team all belong to one."""
+
+    name = models.CharField(max_length=150)
+    slug = models.SlugField(max_length=50, unique=True)
+    address = models.CharField(max_length=255, blank=True, default="")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name", "id"]
+
+    def __str__(self):
+        return self.name
+
+
+_default_hotel_id = None
+
+
+def get_default_hotel_id():
+    # Single-property installs never have to mention the hotel. The default
+    # hotel is created by migration 0017; this only reads it (so it can't
+    # pin a request to the primary), once per process.
+    global _default_hotel_id
+    if _default_hotel_id is None:
+        _default_hotel_id = Hotel.objects.filter(slug=DEFAULT_HOTEL_SLUG).values_list("pk", flat=True).first()
+    return _default_hotel_id
+
+
+@receiver([post_save, post_delete], sender=Hotel)
+def forget_default_hotel_id(sender, instance, **kwargs):
+    global _default_hotel_id
+    _default_hotel_id = None
+
+
 class Room(models.Model):
     ROOM_TYPES = (
         ("single", "Single"),
@@ -12,7 +51,8 @@ class Room(models.Model):
         ("family_suite", "Family Suite"),
     )
 
-    number = models.CharField(max_length=10, unique=True)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="rooms", default=get_default_hotel_id)
+    number = models.CharField(max_length=10)
     room_type = models.CharField(max_length=20, choices=ROOM_TYPES)
     price_per_night = models.DecimalField(max_digits=8, decimal_places=2)
     capacity = models.IntegerField()
@@ -26,8 +66,12 @@ class Room(models.Model):
     view = models.CharField(max_length=100, blank=True, default="City View")
     check_in = models.CharField(max_length=50, blank=True, default="2:00 PM")
     check_out = models.CharField(max_length=50, blank=True, default="11:00 AM")
-    rating = models.DecimalField(max_digits=3, decimal_places=1, default=4.5)
+    # Review aggregates, kept current by hotel.reviews (`reconcile_ratings`
+    # recomputes them): rating = rating_sum / reviews_count, 0 when unrated
+    RATING_FIELDS = ("rating", "reviews_count", "rating_sum")
+    rating = models.DecimalField(max_digits=3, decimal_places=1, default=0)
     reviews_count = models.IntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
     cancellation_policy = models.TextField(blank=True, default="Free cancellation available.")
     room_service = models.CharField(max_length=100, blank=True, default="Available 24/7")
     breakfast_included = models.BooleanField(default=True)
@@ -40,6 +84,17 @@ class Room(models.Model):
     # Media
     cover_image = models.ImageField(upload_to="rooms/", blank=True, null=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hotel", "number"], name="room_hotel_number_uniq"),
+        ]
+        indexes = [
+            # Availability by type within a property
+            models.Index(fields=["hotel", "room_type"], name="room_hotel_type_idx"),
+            # The catalogue sorted by rating (?sort=rating)
+            models.Index(fields=["hotel", "-rating", "id"], name="room_hotel_rating_idx"),
+        ]
+
     def __str__(self):
         return f"Room {self.number} ({self.room_type})"
 
@@ -77,21 +132,68 @@ class Booking(models.Model):
         ('pending', 'Pending'),
         ('confirmed', 'Confirmed'),
         ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
     )
 
+    # Legal status changes. Pending bookings are time-limited holds that
+    # either get confirmed, cancelled, or expired by `expire_bookings`.
+    TRANSITIONS = {
+        'pending': ('confirmed', 'cancelled', 'expired'),
+        'confirmed': ('cancelled',),
+        'cancelled': (),
+        'expired': (),
+    }
+
+    # Statuses that occupy the room for their dates
+    ACTIVE_STATUSES = ('pending', 'confirmed')
+
+    # Denormalized from room so per-property queries don't need the join
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='bookings', default=get_default_hotel_id)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings')
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='bookings')
+    # Bookings made against a room type get a provisional room that the
+    # allocator (hotel.allocation) may move to another room of the same
+    # type; bookings for a room the guest picked stay locked to it.
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES, blank=True, default='')
+    room_locked = models.BooleanField(default=True)
     check_in = models.DateField()
     check_out = models.DateField()
     guests = models.IntegerField()
+    # The room's rate when the booking was made; later price changes don't
+    # touch it (filled in by save() when not given)
+    price_per_night = models.DecimalField(max_digits=8, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Set by the front desk when the guest arrives (hotel.frontdesk)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Finding stale pending holds
+            models.Index(fields=["status", "created_at"], name="booking_status_created_idx"),
+            # A guest's booking history by stay date
+            models.Index(fields=["user", "check_in"], name="booking_user_check_in_idx"),
+            # Arrivals / departures on a given day, per property
+            models.Index(fields=["hotel", "check_in"], name="booking_hotel_check_in_idx"),
+            models.Index(fields=["hotel", "check_out"], name="booking_hotel_check_out_idx"),
+        ]
+
     def __str__(self):
         return f"Booking #{self.id} by {self.user.username} for Room {self.room.number}"
 
+    def save(self, *args, **kwargs):
+        if self.room_id and self.hotel_id != self.room.hotel_id:
+            self.hotel_id = self.room.hotel_id
+        if self.room_id and self.price_per_night is None:
+            self.price_per_night = self.room.price_per_night
+        super().save(*args, **kwargs)
+
+    def can_transition_to(self, status):
+        return status == self.status or status in self.TRANSITIONS.get(self.status, ())
+
 
 class TeamMember(models.Model):
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="team", default=get_default_hotel_id)
     name = models.CharField(max_length=100)
     role = models.CharField(max_length=100)
     image_url = models.URLField(blank=True, default="")
@@ -99,6 +201,7 @@ class TeamMember(models.Model):
 
     class Meta:
         ordering = ["order", "id"]
+        indexes = [models.Index(fields=["hotel", "order"], name="team_hotel_order_idx")]
 
     def __str__(self):
         return f"{self.name} - {self.role}"
@@ -107,6 +210,7 @@ class TeamMember(models.Model):
 class GalleryImage(models.Model):
     """Simple gallery for marketing photos uploaded via Django admin."""
 
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="gallery", default=get_default_hotel_id)
     title = models.CharField(max_length=150, blank=True)
     image = models.ImageField(upload_to="gallery/")
     is_featured = models.BooleanField(default=False)
@@ -114,6 +218,9 @@ class GalleryImage(models.Model):
 
     class Meta:
         ordering = ["-is_featured", "-created_at", "id"]
+        indexes = [
+            models.Index(fields=["hotel", "-is_featured", "-created_at"], name="gallery_hotel_featured_idx"),
+        ]
 
     def __str__(self):
         return self.title or f"Image {self.id}"
@@ -131,6 +238,366 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ["-created_at", "id"]
+        indexes = [
+            # Unread count and newest unread messages
+            models.Index(fields=["is_read", "created_at"], name="contact_read_created_idx"),
+        ]
 
     def __str__(self):
         return f"Message from {self.name} - {self.subject}"
+
+
+class ArchivedBooking(models.Model):
+    """
+    A booking moved out of the hot table by hotel.archive. Keeps the
+    original id and a snapshot of the room and guest at archive time.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='archived_bookings')
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='archived_bookings')
+    username = models.CharField(max_length=150)
+    room_id = models.BigIntegerField()
+    room_number = models.CharField(max_length=10)
+    room_type = models.CharField(max_length=20)
+    price_per_night = models.DecimalField(max_digits=8, decimal_places=2)
+    check_in = models.DateField()
+    check_out = models.DateField()
+    guests = models.IntegerField()
+    status = models.CharField(max_length=20)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-check_in", "-id"]
+        indexes = [
+            models.Index(fields=["hotel", "check_in"], name="archbooking_hotel_check_in_idx"),
+            models.Index(fields=["user", "check_in"], name="archbooking_user_check_in_idx"),
+        ]
+
+    def __str__(self):
+        return f"Archived booking #{self.id} by {self.username} for Room {self.room_number}"
+
+
+class ArchivedContactMessage(models.Model):
+    """A read contact message moved out of the hot table by hotel.archive."""
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "id"]
+
+    def __str__(self):
+        return f"Archived message from {self.name} - {self.subject}"
+
+
+class MediaBlob(models.Model):
+    """
+    Reference count of a stored media file (hotel.media): how many
+    Room.cover_image, RoomImage, GalleryImage and Profile.avatar values
+    point at `name`. Blobs at zero are removed by `cleanup_media`.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.PositiveIntegerField(default=0)
+    # When the count last dropped to zero
+    orphaned_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
+
+class ChangeEvent(models.Model):
+    """
+    Transactional outbox of booking, room and contact message changes
+    (hotel.feed). Rows are written in the same transaction as the change;
+    `position` is given once they have committed, in commit order, and is
+    the cursor clients resume the change feed from.
+    """
+
+    TOPIC_CHOICES = (
+        ("booking", "Booking"),
+        ("room", "Room"),
+        ("message", "Contact message"),
+    )
+    ACTION_CHOICES = (
+        ("upsert", "Created or updated"),
+        ("delete", "Deleted"),
+        ("archive", "Moved to the archive"),
+    )
+
+    topic = models.CharField(max_length=20, choices=TOPIC_CHOICES)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    object_id = models.BigIntegerField()
+    # Messages aren't tied to a property
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Null until hotel.feed.sequence reaches it
+    position = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"#{self.id} {self.topic} {self.object_id} {self.action}"
+
+
+class ChangeSequence(models.Model):
+    """
+    The last ChangeEvent position handed out (one row). hotel.feed.sequence
+    updates it first, which serialises the sequencers.
+    """
+
+    position = models.BigIntegerField(default=0)
+    sequenced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return str(self.position)
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized text of a searchable row (room, gallery image, contact
+    message), kept current by the signal handlers in hotel.search and
+    indexed for full-text search by the database.
+    """
+
+    KIND_CHOICES = (
+        ("room", "Room"),
+        ("gallery", "Gallery image"),
+        ("message", "Contact message"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A POST answered under an `Idempotency-Key` header (hotel.idempotency).
+    Retries with the same key get the stored response back; status_code
+    is null while the first request is still running (or died).
+    """
+
+    # "user:<id>" or "ip:<address>" for anonymous clients
+    scope = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    # HMAC of method, path and body: the same key must mean the same request
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    headers = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "key"], name="idempotency_scope_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key} ({self.status_code or 'pending'})"
+
+
+class Review(models.Model):
+    """
+    A guest's rating of a stay. Saving or deleting one adjusts the room's
+    rating aggregates (hotel.reviews).
+    """
+
+    RATING_CHOICES = [(value, str(value)) for value in range(1, 6)]
+
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="reviews")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reviews")
+    # Kept when the booking is archived (hotel.archive deletes live rows)
+    booking = models.OneToOneField(
+        Booking, on_delete=models.SET_NULL, null=True, blank=True, related_name="review"
+    )
+    rating = models.PositiveSmallIntegerField(choices=RATING_CHOICES)
+    comment = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name="review_rating_range"),
+        ]
+        indexes = [
+            models.Index(fields=["room", "-created_at"], name="review_room_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.rating}/5 for Room {self.room_id} by {self.user_id}"
+
+
+class RoomNeighbour(models.Model):
+    """
+    One of a room's most similar rooms in the same hotel, precomputed by
+    hotel.similarity; rank 1 is the closest.
+    """
+
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="neighbours")
+    neighbour = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="neighbour_of")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["room", "rank"]
+        constraints = [
+            # Also the index similar-room lookups read
+            models.UniqueConstraint(fields=["room", "rank"], name="roomneighbour_room_rank_uniq"),
+        ]
+
+    def __str__(self):
+        return f"Room {self.room_id} -> {self.neighbour_id} (#{self.rank})"
+
+
+class WaitlistEntry(models.Model):
+    """
+    A guest waiting for a room type on dates that were sold out. When a
+    cancellation frees matching nights, hotel.waitlist offers them as a
+    pending booking (a hold) linked here.
+    """
+
+    STATUS_CHOICES = (
+        ("waiting", "Waiting"),
+        ("offered", "Offered"),
+        ("booked", "Booked"),
+        ("lapsed", "Offer lapsed"),
+    )
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="waitlist", default=get_default_hotel_id)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="waitlist")
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES)
+    check_in = models.DateField()
+    check_out = models.DateField()
+    guests = models.PositiveSmallIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="waiting")
+    booking = models.OneToOneField(
+        Booking, on_delete=models.SET_NULL, null=True, blank=True, related_name="waitlist_entry"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    offered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # First come, first served
+        ordering = ["created_at", "id"]
+        indexes = [
+            # Interval lookups on cancellation: waiting entries of a room
+            # type whose stay starts inside the freed gap (hotel.waitlist)
+            models.Index(
+                fields=["hotel", "room_type", "status", "check_in", "check_out"],
+                name="waitlist_match_idx",
+            ),
+            models.Index(fields=["user", "created_at"], name="waitlist_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} waiting for {self.room_type} {self.check_in}–{self.check_out} ({self.status})"
+
+
+class AriNight(models.Model):
+    """
+    Current availability, rate and inventory of a room type on one night,
+    as last exported to channel managers (hotel.ari).
+    """
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="+")
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES)
+    date = models.DateField()
+    # Rooms still free to sell
+    available = models.PositiveIntegerField()
+    # Rooms of the type that are in service
+    inventory = models.PositiveIntegerField()
+    # Lowest nightly price among those rooms; null without inventory
+    rate = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        ordering = ["hotel", "room_type", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["hotel", "room_type", "date"], name="ari_night_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.room_type} {self.date}: {self.available}/{self.inventory} @ {self.rate}"
+
+
+class AriLock(models.Model):
+    """
+    One row per (hotel, room type) the ARI feed is kept for. A refresh
+    updates it first, which locks the room type until it commits, so
+    concurrent refreshes can't store their results out of order.
+    """
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="+")
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["hotel", "room_type"], name="ari_lock_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel_id} {self.room_type}"
+
+
+class AriChange(models.Model):
+    """
+    Append-only log of AriNight values: one row each time a night's
+    availability, rate or inventory changes. `position` is given once the
+    row has committed, in commit order, and is the cursor channel managers
+    pull deltas from.
+    """
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="+")
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES)
+    date = models.DateField()
+    available = models.PositiveIntegerField()
+    inventory = models.PositiveIntegerField()
+    rate = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Null until hotel.ari.sequence reaches it
+    position = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["hotel", "position"], name="arichange_hotel_position_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.room_type} {self.date}: {self.available}/{self.inventory} @ {self.rate}"
+
+
+class AriSequence(models.Model):
+    """
+    The last AriChange position handed out (one row). hotel.ari.sequence
+    updates it first, which serialises the sequencers.
+    """
+
+    position = models.BigIntegerField(default=0)
+    sequenced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return str(self.position)
@@ -0,0 +1,68 @@
+"""
+Admin dashboard overview: counts, recent activity and today's
+arrivals/departures from a fixed number of aggregate queries, so the
+response stays the same size however large the tables get.
+"""
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Booking, ContactMessage, GalleryImage, Room, TeamMember
+
+RECENT_LIMIT = 5
+MOVEMENT_LIMIT = 20
+
+BOOKING_FIELDS = ("id", "guest", "room_number", "check_in", "check_out", "guests", "status", "created_at")
+
+
+def _bookings(queryset, limit):
+    return list(
+        queryset.annotate(guest=F("user__username"), room_number=F("room__number"))
+        .values(*BOOKING_FIELDS)[:limit]
+    )
+
+
+def _movements(queryset):
+    return {"count": queryset.count(), "results": _bookings(queryset.order_by("room__number"), MOVEMENT_LIMIT)}
+
+
+def build_admin_overview(hotel, today=None):
+    today = today or timezone.localdate()
+    bookings = Booking.objects.filter(hotel=hotel)
+    active = bookings.filter(status__in=Booking.ACTIVE_STATUSES)
+
+    rooms = Room.objects.filter(hotel=hotel).aggregate(
+        total=Count("id"), available=Count("id", filter=Q(is_available=True))
+    )
+    gallery = GalleryImage.objects.filter(hotel=hotel).aggregate(
+        total=Count("id"), featured=Count("id", filter=Q(is_featured=True))
+    )
+    # Contact messages aren't tied to a property
+    messages = ContactMessage.objects.aggregate(total=Count("id"), unread=Count("id", filter=Q(is_read=False)))
+    by_status = dict(bookings.order_by().values_list("status").annotate(count=Count("id")))
+
+    return {
+        "hotel": hotel.slug,
+        "date": today,
+        "counts": {
+            "rooms": rooms["total"],
+            "available_rooms": rooms["available"],
+            "gallery_images": gallery["total"],
+            "featured_images": gallery["featured"],
+            "bookings": sum(by_status.values()),
+            "bookings_by_status": {status: by_status.get(status, 0) for status, _ in Booking.STATUS_CHOICES},
+            "users": User.objects.count(),
+            "team_members": TeamMember.objects.filter(hotel=hotel).count(),
+            "messages": messages["total"],
+            "unread_messages": messages["unread"],
+            "in_house": active.filter(check_in__lte=today, check_out__gt=today).count(),
+        },
+        "arrivals": _movements(active.filter(check_in=today)),
+        "departures": _movements(active.filter(check_out=today)),
+        "recent_bookings": _bookings(bookings.order_by("-id"), RECENT_LIMIT),
+        "unread_messages": list(
+            ContactMessage.objects.filter(is_read=False)
+            .order_by("-created_at")
+            .values("id", "name", "email", "subject", "created_at")[:RECENT_LIMIT]
+        ),
+    }
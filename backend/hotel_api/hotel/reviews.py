@@ -0,0 +1,113 @@
+"""
+Guest reviews and the room rating aggregates built from them.
+
+Room.rating_sum and Room.reviews_count are running totals of a room's
+reviews. Saves and deletes (including rows removed by on_delete=CASCADE)
+adjust them through signals with one UPDATE of F() expressions that also
+recomputes Room.rating from the new totals, so concurrent reviews can't
+lose each other's increments and listing or sorting rooms by rating never
+touches the reviews table. `reconcile` (the `reconcile_ratings` command)
+rebuilds the aggregates from the reviews after writes that bypass signals.
+
+A room that has never been reviewed keeps the rating it was seeded or
+entered with; its first review replaces it with the average of the
+reviews.
+"""
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .hotels import invalidate_hotel_cache
+from .models import Hotel, Review, Room
+
+
+def can_review(booking, today=None):
+    """Guests review stays they completed: confirmed and checked out."""
+    today = today or timezone.localdate()
+    return booking.status == "confirmed" and booking.check_out <= today
+
+
+def rating_expression(rating_sum, reviews_count):
+    """rating_sum / reviews_count to one decimal, 0 without reviews."""
+    return Coalesce(Round(Cast(rating_sum, FloatField()) / NullIf(reviews_count, Value(0)), 1), Value(0.0))
+
+
+def adjust(room_id, sum_delta, count_delta):
+    """Add to a room's running totals and recompute its rating in one UPDATE."""
+    rating_sum = F("rating_sum") + sum_delta
+    reviews_count = F("reviews_count") + count_delta
+    updated = Room.objects.filter(pk=room_id).update(
+        rating_sum=rating_sum,
+        reviews_count=reviews_count,
+        # SET expressions read the row as it was, so this is the new average
+        rating=rating_expression(rating_sum, reviews_count),
+    )
+    if updated:
+        # Bypasses Room's post_save, which would clear the cached room lists
+        hotel_id = Room.objects.filter(pk=room_id).values_list("hotel_id", flat=True).first()
+        invalidate_hotel_cache(hotel_id)
+
+
+# ---------- SIGNALS ----------
+
+@receiver(pre_save, sender=Review)
+def remember_rating(sender, instance, raw=False, **kwargs):
+    before = None
+    if instance.pk and not raw:
+        before = Review.objects.filter(pk=instance.pk).values_list("room_id", "rating").first()
+    instance._rating_before = before
+
+
+@receiver(post_save, sender=Review)
+def add_rating(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_rating_before", None)
+    if before is None:
+        adjust(instance.room_id, instance.rating, 1)
+    elif before != (instance.room_id, instance.rating):
+        room_id, rating = before
+        if room_id == instance.room_id:
+            adjust(room_id, instance.rating - rating, 0)
+        else:
+            adjust(room_id, -rating, -1)
+            adjust(instance.room_id, instance.rating, 1)
+    instance._rating_before = (instance.room_id, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def remove_rating(sender, instance, **kwargs):
+    adjust(instance.room_id, -instance.rating, -1)
+
+
+# ---------- MAINTENANCE ----------
+
+@transaction.atomic
+def reconcile(batch_size=500):
+    """
+    Recompute every room's aggregates from its reviews: one grouped query,
+    bulk updates of the totals that drifted, then one UPDATE of the
+    ratings of reviewed rooms (never-reviewed rooms keep theirs). Returns
+    the number of rooms whose totals were wrong.
+    """
+    totals = {
+        row["room"]: (row["total"], row["count"])
+        for row in Review.objects.order_by().values("room").annotate(total=Sum("rating"), count=Count("id"))
+    }
+    changed = []
+    for room in Room.objects.select_for_update().only("id", "rating", "rating_sum", "reviews_count"):
+        rating_sum, reviews_count = totals.get(room.id, (0, 0))
+        if (room.rating_sum, room.reviews_count) != (rating_sum, reviews_count):
+            room.rating_sum, room.reviews_count = rating_sum, reviews_count
+            if not reviews_count:
+                # Its reviews are gone, as after deleting the last one
+                room.rating = 0
+            changed.append(room)
+    Room.objects.bulk_update(changed, ["rating", "rating_sum", "reviews_count"], batch_size=batch_size)
+    Room.objects.filter(reviews_count__gt=0).update(rating=rating_expression(F("rating_sum"), F("reviews_count")))
+    for hotel_id in Hotel.objects.values_list("id", flat=True):
+        invalidate_hotel_cache(hotel_id)
+    return len(changed)
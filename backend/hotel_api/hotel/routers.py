@@ -0,0 +1,130 @@
+"""
+Read-replica routing.
+
+Reads go to one of settings.DATABASE_REPLICAS only while serving a safe
+(GET/HEAD/OPTIONS) request; everything else (writes, reads inside a
+transaction, management commands, background work) uses the primary.
+
+A client that just wrote must see its own write even though replicas lag,
+so `ReplicaRoutingMiddleware` pins requests to the primary:
+- for the rest of the request once anything has been written, and
+- for REPLICA_STICKY_SECONDS afterwards. Signed-in clients are remembered
+  by user id in a short-lived cache entry, so it works for the SPA, which
+  calls the API cross-origin with a JWT and never sees our cookies; the
+  middleware runs before DRF authenticates, so it reads the user id from
+  the bearer token itself. Other clients get a short-lived cookie.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+STICKY_COOKIE = "use_primary"
+STICKY_KEY = "replica-sticky:{}"
+
+# True: read from the primary. The middleware (or replica_reads) turns it off.
+_use_primary = ContextVar("use_primary", default=True)
+_wrote = ContextVar("wrote", default=False)
+
+
+def get_replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def get_sticky_seconds():
+    return getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+
+def get_sticky_cache():
+    # Shared between worker processes in production, like the throttle cache
+    return caches[getattr(settings, "REPLICA_STICKY_CACHE", "default")]
+
+
+def token_user_id(request):
+    """
+    The user id claim of a valid JWT bearer token, or None. Checks the
+    signature and expiry only, without loading the user.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    try:
+        raw_token = authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except AuthenticationFailed:
+        # The view answers a bad token with 401; here it is just anonymous
+        return None
+
+
+@contextmanager
+def replica_reads():
+    """Allow reads from replicas outside a request (benchmarks, scripts)."""
+    token = _use_primary.set(False)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas or _use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for the rest of the request
+        _use_primary.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe requests read from replicas unless the client wrote within
+    the last REPLICA_STICKY_SECONDS.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        primary_token = _use_primary.set(self.use_primary(request))
+        wrote_token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get() and get_replicas():
+                self.stick(request, response)
+            return response
+        finally:
+            _use_primary.reset(primary_token)
+            _wrote.reset(wrote_token)
+
+    def use_primary(self, request):
+        if not get_replicas() or request.method not in self.safe_methods or STICKY_COOKIE in request.COOKIES:
+            return True
+        user_id = token_user_id(request)
+        return user_id is not None and bool(get_sticky_cache().get(STICKY_KEY.format(user_id)))
+
+    def stick(self, request, response):
+        seconds = get_sticky_seconds()
+        # DRF sets request.user on the Django request once it authenticates
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            get_sticky_cache().set(STICKY_KEY.format(user.pk), True, seconds)
+        # Still covers anonymous and same-origin (admin session) clients
+        response.set_cookie(STICKY_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
@@ -0,0 +1,177 @@
+"""
+Full-text search over rooms, gallery titles and contact messages.
+
+Searchable rows are mirrored into SearchDocument by the signal handlers
+below. On SQLite an FTS5 table kept in sync by triggers indexes those
+documents, on PostgreSQL a GIN index over to_tsvector does the same (both
+created in migration 0011). Other databases fall back to icontains.
+"""
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ContactMessage, GalleryImage, Room, SearchDocument
+
+FTS_TABLE = "hotel_searchdocument_fts"
+PG_VECTOR = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(body, ''))"
+
+re_terms = re.compile(r"\w+", re.UNICODE)
+
+_fts_tables = {}
+
+
+# ---------- DOCUMENTS ----------
+
+def room_document(room):
+    room_types = dict(Room.ROOM_TYPES)
+    title = f"Room {room.number} {room_types.get(room.room_type, room.room_type)}"
+    body = " ".join(
+        [room.description or "", room.view or "", room.bed_preference or ""]
+        + [str(item) for item in room.amenities or []]
+        + [str(item) for item in room.special_features or []]
+    )
+    return title, body
+
+
+def gallery_document(image):
+    return image.title or "", ""
+
+
+def message_document(message):
+    return message.subject, message.message
+
+
+# Model -> (kind, document builder). Migration 0011 keeps frozen copies of
+# the builders for its backfill; changing these doesn't touch it.
+SEARCHABLE = {
+    Room: ("room", room_document),
+    GalleryImage: ("gallery", gallery_document),
+    ContactMessage: ("message", message_document),
+}
+
+
+def index_instance(instance):
+    kind, builder = SEARCHABLE[type(instance)]
+    title, body = builder(instance)
+    SearchDocument.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={"title": title[:255], "body": body},
+    )
+
+
+def index_many(instances):
+    """
+    Index freshly bulk_create()d rows, which don't send post_save.
+    """
+    documents = []
+    for instance in instances:
+        kind, builder = SEARCHABLE[type(instance)]
+        title, body = builder(instance)
+        documents.append(SearchDocument(kind=kind, object_id=instance.pk, title=title[:255], body=body))
+    SearchDocument.objects.bulk_create(documents)
+
+
+def unindex_instance(instance):
+    kind, _ = SEARCHABLE[type(instance)]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def rebuild_index(kinds=None, batch_size=1000):
+    """
+    Re-create SearchDocument rows from scratch (after bulk imports or
+    queryset.update() calls, which bypass the signal handlers).
+    """
+    total = 0
+    for model, (kind, builder) in SEARCHABLE.items():
+        if kinds and kind not in kinds:
+            continue
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch = []
+        for obj in model.objects.iterator(chunk_size=batch_size):
+            title, body = builder(obj)
+            batch.append(SearchDocument(kind=kind, object_id=obj.pk, title=title[:255], body=body))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=GalleryImage)
+@receiver(post_save, sender=ContactMessage)
+def update_search_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance)
+
+
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=GalleryImage)
+@receiver(post_delete, sender=ContactMessage)
+def delete_search_document(sender, instance, **kwargs):
+    unindex_instance(instance)
+
+
+# ---------- QUERYING ----------
+
+def _has_fts_table(connection):
+    if connection.alias not in _fts_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_tables[connection.alias] = cursor.fetchone() is not None
+    return _fts_tables[connection.alias]
+
+
+def _fts_query(terms):
+    # Quote every term so user input can't inject FTS5 syntax; the last term
+    # is a prefix match so results show up while the user is still typing.
+    quoted = ['"%s"' % term.replace('"', '""') for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search(query, kinds, limit=20):
+    """
+    Return up to `limit` ranked hits for `query` restricted to `kinds`,
+    as dicts with kind, id, title and rank (lower rank is better).
+    """
+    terms = re_terms.findall(query or "")
+    if not terms or not kinds:
+        return []
+
+    connection = connections[router.db_for_read(SearchDocument)]
+    placeholders = ", ".join(["%s"] * len(kinds))
+
+    if connection.vendor == "sqlite" and _has_fts_table(connection):
+        sql = (
+            f"SELECT d.kind, d.object_id, d.title, bm25({FTS_TABLE}, 2.0, 1.0) AS rank "
+            f"FROM {FTS_TABLE} JOIN hotel_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND d.kind IN ({placeholders}) "
+            f"ORDER BY rank LIMIT %s"
+        )
+        params = [_fts_query(terms), *kinds, limit]
+    elif connection.vendor == "postgresql":
+        sql = (
+            f"SELECT kind, object_id, title, -ts_rank({PG_VECTOR}, q) AS rank "
+            f"FROM hotel_searchdocument, websearch_to_tsquery('english', %s) q "
+            f"WHERE {PG_VECTOR} @@ q AND kind IN ({placeholders}) "
+            f"ORDER BY rank LIMIT %s"
+        )
+        params = [" ".join(terms), *kinds, limit]
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(body__icontains=term)
+        rows = SearchDocument.objects.filter(condition, kind__in=kinds).values_list("kind", "object_id", "title")[:limit]
+        return [{"kind": kind, "id": object_id, "title": title, "rank": 0.0} for kind, object_id, title in rows]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [{"kind": kind, "id": object_id, "title": title, "rank": rank} for kind, object_id, title, rank in rows]
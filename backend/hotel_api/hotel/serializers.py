@@ -1,16 +1,41 @@
 from rest_framework import serializers
 import json
 from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import Room, Booking, TeamMember, GalleryImage, RoomImage, Profile, ContactMessage
-
-
-class UserSerializer(serializers.ModelSerializer):
+from .allocation import best_room
+from .batch import API_PREFIX, METHODS, get_batch_setting
+from .bookings import InvalidTransition, book_room, change_booking, transition
+from .fieldsets import SparseFieldsetMixin
+from .hotels import CurrentHotelDefault
+from .reviews import can_review
+from .waitlist import get_waitlist_setting
+from .models import (
+    ArchivedBooking,
+    ArchivedContactMessage,
+    Booking,
+    ContactMessage,
+    GalleryImage,
+    Hotel,
+    Profile,
+    Review,
+    Room,
+    RoomImage,
+    TeamMember,
+    WaitlistEntry,
+)
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = ["id", "username", "email", "is_staff", "is_superuser", "avatar"]
+        # What the method fields read (hotel.fieldsets)
+        field_sources = {"avatar": ()}
+        field_relations = {"avatar": ("profile",)}
 
     def get_avatar(self, obj):
         request = self.context.get("request")
@@ -86,6 +111,18 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+def issue_tokens(user):
+    """A fresh token pair and the user payload, as login returns them."""
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token), "user": UserSerializer(user).data}
+
+
+class HotelSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Hotel
+        fields = ["id", "name", "slug", "address"]
+
+
 class RoomImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
 
@@ -100,7 +137,12 @@ class RoomImageSerializer(serializers.ModelSerializer):
         return obj.image.url
 
 
-class RoomSerializer(serializers.ModelSerializer):
+def hotel_field():
+    return serializers.PrimaryKeyRelatedField(queryset=Hotel.objects.all(), default=CurrentHotelDefault())
+
+
+class RoomSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    hotel = hotel_field()
     image = serializers.SerializerMethodField()
     gallery = serializers.SerializerMethodField()
     amenities = serializers.ListField(child=serializers.CharField(), required=False)
@@ -110,6 +152,7 @@ class RoomSerializer(serializers.ModelSerializer):
         model = Room
         fields = [
             "id",
+            "hotel",
             "number",
             "room_type",
             "price_per_night",
@@ -136,6 +179,10 @@ class RoomSerializer(serializers.ModelSerializer):
             "image",
             "gallery",
         ]
+        read_only_fields = ["rating", "reviews_count"]
+        # What the method fields read (hotel.fieldsets)
+        field_sources = {"image": ("cover_image",), "gallery": ("cover_image",)}
+        field_prefetches = {"image": ("images",), "gallery": ("images",)}
 
     def _resolve_list(self, value):
         """
@@ -178,7 +225,15 @@ class RoomSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        # Leave the rating aggregates to hotel.reviews: writing back the
+        # values loaded with the instance could undo a concurrent review
+        instance.save(
+            update_fields=[
+                field.name
+                for field in Room._meta.concrete_fields
+                if not field.primary_key and field.name not in Room.RATING_FIELDS
+            ]
+        )
 
         for file in gallery_files:
             RoomImage.objects.create(room=instance, image=file)
@@ -191,8 +246,8 @@ class RoomSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.cover_image.url)
             return obj.cover_image.url
-        # Fallback to first gallery image
-        first_image = obj.images.first()
+        # Fallback to first gallery image (from the prefetch when there is one)
+        first_image = next(iter(obj.images.all()), None)
         if first_image:
             if request:
                 return request.build_absolute_uri(first_image.image.url)
@@ -210,7 +265,20 @@ class RoomSerializer(serializers.ModelSerializer):
         return gallery_urls
 
 
-class BookingSerializer(serializers.ModelSerializer):
+def validate_stay(attrs, instance=None):
+    check_in = attrs.get('check_in', getattr(instance, 'check_in', None))
+    check_out = attrs.get('check_out', getattr(instance, 'check_out', None))
+    if check_in and check_out and check_out <= check_in:
+        raise serializers.ValidationError({'check_out': ['Check-out must be after check-in.']})
+
+
+class BookingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Book either a specific `room`, or just a `room_type` and let the
+    allocator pick (and later re-optimize) the physical room. Saving
+    raises RoomsUnavailable when the room is taken (hotel.bookings).
+    """
+    hotel = hotel_field()
     user = UserSerializer(read_only=True)
     room_detail = RoomSerializer(source='room', read_only=True)
 
@@ -218,19 +286,95 @@ class BookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = [
             'id',
+            'hotel',
             'user',
             'room',
             'room_detail',
+            'room_type',
+            'room_locked',
             'check_in',
             'check_out',
             'guests',
+            'price_per_night',
             'status',
             'created_at',
         ]
-        read_only_fields = ['status', 'created_at', 'user']
+        read_only_fields = ['price_per_night', 'status', 'created_at', 'user', 'room_locked']
+        extra_kwargs = {'room': {'required': False}}
+
+    def validate(self, attrs):
+        validate_stay(attrs, self.instance)
+        room = attrs.get('room')
+        if room:
+            attrs['room_type'] = room.room_type
+            attrs['room_locked'] = True
+        elif self.instance is None:
+            room_type = attrs.get('room_type')
+            if not room_type:
+                raise serializers.ValidationError({'room': ['Choose a room or a room type.']})
+            room = best_room(attrs['hotel'], room_type, attrs['check_in'], attrs['check_out'], attrs['guests'])
+            if room is None:
+                raise serializers.ValidationError({'room_type': ['No room of this type is free for these dates.']})
+            attrs['room'] = room
+            attrs['room_locked'] = False
+        return attrs
+
+    def create(self, validated_data):
+        # best_room's pick is checked again under the lock
+        room = validated_data.pop('room')
+        return book_room(room, **validated_data)
+
+    def update(self, instance, validated_data):
+        return change_booking(instance, validated_data)
+
+
+class GroupBookingSerializer(serializers.Serializer):
+    """
+    Input for reserving several rooms for the same stay in one request.
+    """
 
+    hotel = serializers.PrimaryKeyRelatedField(queryset=Hotel.objects.filter(is_active=True), required=False)
+    rooms = serializers.IntegerField(min_value=1, max_value=100)
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1, help_text="Guests per room")
+    room_type = serializers.ChoiceField(choices=Room.ROOM_TYPES, required=False)
+    min_capacity = serializers.IntegerField(min_value=1, default=1)
+    adjacent = serializers.BooleanField(default=True, help_text="Keep rooms on as few floors as possible")
 
-class AdminBookingSerializer(serializers.ModelSerializer):
+    def validate(self, attrs):
+        if attrs["check_out"] <= attrs["check_in"]:
+            raise serializers.ValidationError({"check_out": ["Check-out must be after check-in."]})
+        return attrs
+
+
+class BatchCallSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=METHODS, default="GET")
+    path = serializers.CharField(help_text="e.g. /api/rooms/?hotel=main")
+    body = serializers.JSONField(required=False, allow_null=True)
+    headers = serializers.DictField(child=serializers.CharField(), default=dict)
+
+    def validate_path(self, value):
+        if not value.startswith(API_PREFIX):
+            raise serializers.ValidationError(f"Must start with {API_PREFIX}.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Input for running several API calls in one request (hotel.batch).
+    """
+
+    requests = BatchCallSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        limit = get_batch_setting("MAX_REQUESTS")
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} requests per batch.")
+        return value
+
+
+class AdminBookingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     room_detail = RoomSerializer(source='room', read_only=True)
 
@@ -238,30 +382,92 @@ class AdminBookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = [
             'id',
+            'hotel',
             'user',
             'room',
             'room_detail',
+            'room_type',
+            'room_locked',
             'check_in',
             'check_out',
             'guests',
+            'price_per_night',
             'status',
+            'checked_in_at',
             'created_at',
         ]
-        read_only_fields = ['created_at', 'user']
+        read_only_fields = ['price_per_night', 'created_at', 'user', 'hotel', 'checked_in_at']
+
+    def validate(self, attrs):
+        validate_stay(attrs, self.instance)
+        room = attrs.get('room')
+        if room:
+            attrs['room_type'] = room.room_type
+        return attrs
+
+    def validate_status(self, value):
+        if self.instance and not self.instance.can_transition_to(value):
+            raise serializers.ValidationError(
+                f"Cannot change booking from {self.instance.status} to {value}."
+            )
+        return value
+
+    def update(self, instance, validated_data):
+        status = validated_data.pop('status', instance.status)
+        # Status first, so a rejected change leaves the other edits unsaved
+        # (an expired hold found on the way stays expired)
+        with transaction.atomic():
+            try:
+                transition(instance, status)
+            except InvalidTransition as exc:
+                error = exc
+            else:
+                return change_booking(instance, validated_data)
+        raise serializers.ValidationError({'status': [str(error)]})
+
+
+class FrontDeskBookingSerializer(serializers.ModelSerializer):
+    """Compact row for the front desk lists."""
+
+    guest = serializers.CharField(source='user.username', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+    room_number = serializers.CharField(source='room.number', read_only=True)
+    room_type = serializers.CharField(source='room.room_type', read_only=True)
+
+    class Meta:
+        model = Booking
+        fields = [
+            'id',
+            'guest',
+            'email',
+            'room',
+            'room_number',
+            'room_type',
+            'check_in',
+            'check_out',
+            'guests',
+            'status',
+            'checked_in_at',
+        ]
+        read_only_fields = fields
+
 
+class TeamMemberSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    hotel = hotel_field()
 
-class TeamMemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamMember
-        fields = ["id", "name", "role", "image_url", "order"]
+        fields = ["id", "hotel", "name", "role", "image_url", "order"]
 
 
-class GalleryImageSerializer(serializers.ModelSerializer):
+class GalleryImageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    hotel = hotel_field()
     image = serializers.SerializerMethodField()
 
     class Meta:
         model = GalleryImage
-        fields = ["id", "title", "image", "is_featured", "created_at"]
+        fields = ["id", "hotel", "title", "image", "is_featured", "created_at"]
+        field_sources = {"image": ("image",)}
 
     def get_image(self, obj):
         request = self.context.get("request")
@@ -270,8 +476,107 @@ class GalleryImageSerializer(serializers.ModelSerializer):
         return obj.image.url
 
 
-class ContactMessageSerializer(serializers.ModelSerializer):
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    """
+    Ask to be offered a room type for dates that are sold out; nights freed
+    by cancellations are held for entries first come, first served.
+    """
+    hotel = hotel_field()
+
+    class Meta:
+        model = WaitlistEntry
+        fields = [
+            'id',
+            'hotel',
+            'room_type',
+            'check_in',
+            'check_out',
+            'guests',
+            'status',
+            'booking',
+            'created_at',
+            'offered_at',
+        ]
+        read_only_fields = ['status', 'booking', 'created_at', 'offered_at']
+
+    def validate(self, attrs):
+        check_in, check_out = attrs['check_in'], attrs['check_out']
+        if check_out <= check_in:
+            raise serializers.ValidationError({'check_out': ['Check-out must be after check-in.']})
+        max_nights = get_waitlist_setting('MAX_NIGHTS')
+        if (check_out - check_in).days > max_nights:
+            raise serializers.ValidationError({'check_out': [f'At most {max_nights} nights can be waitlisted.']})
+        if best_room(attrs['hotel'], attrs['room_type'], check_in, check_out, attrs['guests']) is not None:
+            raise serializers.ValidationError({'room_type': ['A room of this type is free for these dates, book it directly.']})
+        return attrs
+
+
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    A guest's review of a completed stay. The room and user come from the
+    booking; once written the review stays attached to it.
+    """
+
+    username = serializers.CharField(source="user.username", read_only=True)
+    booking = serializers.PrimaryKeyRelatedField(
+        queryset=Booking.objects.all(),
+        validators=[UniqueValidator(Review.objects.all(), message="This stay has already been reviewed.")],
+    )
+
+    class Meta:
+        model = Review
+        fields = ["id", "room", "booking", "username", "rating", "comment", "created_at"]
+        read_only_fields = ["room", "created_at"]
+
+    def validate_booking(self, booking):
+        if self.instance is not None:
+            if booking != self.instance.booking:
+                raise serializers.ValidationError("A review can't be moved to another booking.")
+            return booking
+        request = self.context.get("request")
+        if request is None or booking.user_id != request.user.id:
+            raise serializers.ValidationError("You can only review your own stays.")
+        if not can_review(booking):
+            raise serializers.ValidationError("You can review a stay once you have checked out.")
+        return booking
+
+    def create(self, validated_data):
+        booking = validated_data["booking"]
+        return Review.objects.create(room_id=booking.room_id, user_id=booking.user_id, **validated_data)
+
+
+class ContactMessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ContactMessage
         fields = ["id", "name", "email", "subject", "message", "is_read", "created_at"]
         read_only_fields = ["is_read", "created_at"]
+
+
+class ArchivedBookingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedBooking
+        fields = [
+            "id",
+            "hotel",
+            "user",
+            "username",
+            "room_id",
+            "room_number",
+            "room_type",
+            "price_per_night",
+            "check_in",
+            "check_out",
+            "guests",
+            "status",
+            "checked_in_at",
+            "created_at",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
+class ArchivedContactMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedContactMessage
+        fields = ["id", "name", "email", "subject", "message", "created_at", "archived_at"]
+        read_only_fields = fields
@@ -0,0 +1,169 @@
+"""
+Media file serving with HTTP caching, range requests and server offload.
+
+Content-addressed blobs (hotel.storage) never change under a given name, so
+they are sent with a year-long `immutable` Cache-Control and their hash as
+the ETag; anything else gets settings.MEDIA_MAX_AGE. Conditional requests
+(If-None-Match / If-Modified-Since) are answered with 304, and a single
+`Range: bytes=...` is answered with 206 so browsers can resume downloads.
+
+With settings.MEDIA_SENDFILE set, the response carries only headers plus
+`X-Sendfile` (Apache/lighttpd) or `X-Accel-Redirect` (nginx) and the web
+server sends the bytes itself, ranges included. Otherwise the file is
+returned as a FileResponse, which WSGI servers with `wsgi.file_wrapper`
+(gunicorn, uWSGI) hand to sendfile(2).
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+from .storage import is_blob
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+
+re_range = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def get_media_max_age():
+    return getattr(settings, "MEDIA_MAX_AGE", 60 * 60)
+
+
+def cache_control(name):
+    if is_blob(name):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={get_media_max_age()}"
+
+
+def file_etag(name, stat):
+    if is_blob(name):
+        # blobs/ab/cd/<sha256>.<ext>: the name already is the content hash
+        return quote_etag(posixpath.splitext(posixpath.basename(name))[0])
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single `bytes=` range, None when the header
+    should be ignored (absent, malformed or multi-range: send the whole
+    file), or False when it can't be satisfied.
+    """
+    match = re_range.fullmatch(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def range_applies(request, etag, last_modified):
+    """If-Range: only honour Range when the client's copy is still current."""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        # Range requests need a strong validator
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def offload(path, response):
+    mode = getattr(settings, "MEDIA_SENDFILE", None)
+    if mode == "x-sendfile":
+        response["X-Sendfile"] = str(path)
+    elif mode == "x-accel-redirect":
+        relative = Path(path).relative_to(settings.MEDIA_ROOT).as_posix()
+        prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + relative
+    else:
+        return False
+    return True
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    GET /media/<path>
+    Send a file from MEDIA_ROOT with cache validators, Range support and,
+    when configured, X-Sendfile / X-Accel-Redirect offload.
+    """
+    name = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, name)
+        stat = os.stat(fullpath)
+    except (OSError, ValueError):
+        raise Http404("No such media file.")
+    if not os.path.isfile(fullpath):
+        raise Http404("No such media file.")
+
+    etag = file_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    headers = {
+        "Cache-Control": cache_control(name),
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Accept-Ranges": "bytes",
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        if isinstance(not_modified, HttpResponseNotModified):
+            for header, value in headers.items():
+                not_modified[header] = value
+        return not_modified
+
+    content_type = mimetypes.guess_type(fullpath)[0] or "application/octet-stream"
+
+    sendfile = HttpResponse(content_type=content_type, headers=headers)
+    if offload(fullpath, sendfile):
+        # The web server handles Range and sets Content-Length itself
+        return sendfile
+
+    size = stat.st_size
+    byte_range = None
+    if range_applies(request, etag, last_modified):
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+    if byte_range is False:
+        headers["Content-Range"] = f"bytes */{size}"
+        return HttpResponse(status=416, headers=headers)
+
+    if byte_range is None:
+        return FileResponse(open(fullpath, "rb"), content_type=content_type, headers=headers)
+
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        read_range(fullpath, start, end - start + 1), content_type=content_type, status=206, headers=headers
+    )
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = end - start + 1
+    return response
+
@@ -0,0 +1,16 @@
+from django.dispatch import Signal
+
+# Sent after bookings change status, e.g. a confirmation or a batch of
+# expired holds. Arguments: `bookings` (list of Booking with the new status
+# set), `from_status` and `to_status`. Receivers use it to update caches and
+# inventory incrementally instead of recomputing them. Sent robustly after
+# commit: receiver errors are logged.
+booking_status_changed = Signal()
+
+# Sent by hotel.feed.record inside the transaction that changed the rows,
+# for every write including the bulk ones that skip post_save. Arguments:
+# `instances` (the changed Booking, Room or ContactMessage rows, as
+# written, so fields may still hold what the caller passed, e.g. a date
+# string) and `action` ("upsert", "delete" or "archive"). Sent robustly:
+# receiver errors are logged, not raised into the write.
+changes_recorded = Signal()
@@ -0,0 +1,310 @@
+"""
+Similar rooms: precomputed nearest neighbours within each hotel.
+
+Every room becomes a feature vector: room type, view, amenities and
+special features one-hot/multi-hot encoded, capacity, floor and log price
+scaled to [0, 1] across the hotel, each group weighted by FEATURE_WEIGHTS.
+A hotel's rooms are compared all at once, squared distances from one
+matrix product, and each room's SIMILAR_ROOMS["K"] closest rooms are
+stored in RoomNeighbour, so a request reads them from the (room, rank)
+index without computing anything.
+
+Saving or deleting a room refreshes its hotel after the transaction
+commits, incrementally: distances between the other rooms don't depend on
+it (a new amenity or view adds a column that is zero for both), unless it
+moves the hotel's numeric ranges, which rescales everything and rebuilds
+the hotel. Otherwise only the room's own list is recomputed, along with
+the lists it enters or leaves: those that held it, those it is now closer
+to than their current last neighbour, and those left short by a delete.
+Only rows whose neighbours changed are rewritten, and a failing refresh is
+logged rather than failing the save. Changes that don't touch the
+features (availability, ratings) skip it. `build_room_neighbours`
+rebuilds every hotel. NumPy is optional: without it the same distances
+are computed in pure Python, which is fine for hotel-sized inputs.
+"""
+import heapq
+import math
+from functools import partial
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Room, RoomNeighbour
+from .snapshots import stored
+
+DEFAULTS = {
+    "K": 6,
+}
+
+FEATURE_FIELDS = (
+    "room_type",
+    "capacity",
+    "price_per_night",
+    "floor",
+    "view",
+    "amenities",
+    "special_features",
+)
+
+# Relative importance of each feature group in the distance
+FEATURE_WEIGHTS = {
+    "room_type": 2.0,
+    "capacity": 1.5,
+    "price_per_night": 1.5,
+    "floor": 0.5,
+    "view": 1.0,
+    "amenities": 1.0,
+    "special_features": 0.5,
+}
+
+
+def get_similarity_setting(name):
+    return getattr(settings, "SIMILAR_ROOMS", {}).get(name, DEFAULTS[name])
+
+
+def _terms(values):
+    if not isinstance(values, list):
+        return set()
+    return {str(value).strip().lower() for value in values if str(value).strip()}
+
+
+def _scaled(values):
+    low, high = min(values), max(values)
+    span = high - low
+    return [(value - low) / span if span else 0.0 for value in values]
+
+
+def _numeric_features(room):
+    return (room.capacity, math.log1p(float(room.price_per_night)), room.floor or 0)
+
+
+def numeric_ranges(rooms):
+    """(low, high) of each numeric feature across `rooms`; they set the scaling."""
+    columns = list(zip(*(_numeric_features(room) for room in rooms)))
+    return [(min(column), max(column)) for column in columns]
+
+
+def feature_vectors(rooms):
+    """One list of floats per room, comparable only within `rooms`."""
+    columns = []
+
+    def one_hot(labels, weight):
+        vocabulary = sorted(set(labels))
+        for term in vocabulary:
+            columns.append([weight if label == term else 0.0 for label in labels])
+
+    def multi_hot(term_sets, weight):
+        vocabulary = sorted(set().union(*term_sets))
+        for term in vocabulary:
+            # Spread the group's weight over its terms, so a room with many
+            # amenities isn't far from everything
+            columns.append(
+                [weight / math.sqrt(len(terms)) if term in terms else 0.0 for terms in term_sets]
+            )
+
+    def numeric(values, weight):
+        columns.append([weight * value for value in _scaled(values)])
+
+    one_hot([room.room_type for room in rooms], FEATURE_WEIGHTS["room_type"])
+    one_hot([room.view.strip().lower() for room in rooms], FEATURE_WEIGHTS["view"])
+    multi_hot([_terms(room.amenities) for room in rooms], FEATURE_WEIGHTS["amenities"])
+    multi_hot([_terms(room.special_features) for room in rooms], FEATURE_WEIGHTS["special_features"])
+    capacity, price, floor = zip(*(_numeric_features(room) for room in rooms))
+    numeric(capacity, FEATURE_WEIGHTS["capacity"])
+    numeric(price, FEATURE_WEIGHTS["price_per_night"])
+    numeric(floor, FEATURE_WEIGHTS["floor"])
+    return [list(row) for row in zip(*columns)] if columns else [[] for _ in rooms]
+
+
+def distances_from(vectors, i):
+    """Squared distances from vector `i` to every vector (itself: inf)."""
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float64).reshape(len(vectors), -1)
+        distances = np.einsum("ij,ij->i", matrix - matrix[i], matrix - matrix[i])
+        distances[i] = np.inf
+        return distances.tolist()
+    a = vectors[i]
+    return [math.inf if j == i else sum((x - y) ** 2 for x, y in zip(a, b)) for j, b in enumerate(vectors)]
+
+
+def nearest(vectors, k, rows=None):
+    """
+    For each vector (or each index in `rows`), [(index, squared distance),
+    ...] of its k nearest other vectors, closest first.
+    """
+    count = len(vectors)
+    rows = range(count) if rows is None else list(rows)
+    k = min(k, count - 1)
+    if k <= 0:
+        return [[] for _ in rows]
+
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float64).reshape(count, -1)
+        norms = np.einsum("ij,ij->i", matrix, matrix)
+        picked = np.asarray(rows, dtype=np.intp)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b for every pair at once
+        distances = np.maximum(norms[picked, None] + norms[None, :] - 2 * matrix[picked] @ matrix.T, 0)
+        lines = np.arange(len(picked))
+        distances[lines, picked] = np.inf
+        candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        lines = lines[:, None]
+        # Sort the k candidates; ties go to the lower index so runs are stable
+        order = np.lexsort((candidates, distances[lines, candidates]), axis=1)
+        best = candidates[lines, order]
+        return [
+            [(int(j), float(distances[n, j])) for j in best[n]]
+            for n in range(len(picked))
+        ]
+
+    result = []
+    for i in rows:
+        a = vectors[i]
+        scored = (
+            (sum((x - y) ** 2 for x, y in zip(a, b)), j)
+            for j, b in enumerate(vectors)
+            if j != i
+        )
+        result.append([(j, distance) for distance, j in heapq.nsmallest(k, scored)])
+    return result
+
+
+def score(distance):
+    """Squared distance to a similarity in (0, 1]."""
+    return round(1 / (1 + distance), 6)
+
+
+def _hotel_rooms(hotel_id):
+    return list(Room.objects.filter(hotel_id=hotel_id).only("id", *FEATURE_FIELDS).order_by("id"))
+
+
+def _stored_neighbours(hotel_id):
+    stored = {}
+    rows = RoomNeighbour.objects.filter(room__hotel_id=hotel_id).order_by("room_id", "rank")
+    for room_id, neighbour_id, similarity in rows.values_list("room_id", "neighbour_id", "score"):
+        stored.setdefault(room_id, []).append((neighbour_id, similarity))
+    return stored
+
+
+def _rewrite(wanted, stored):
+    """Store the `wanted` lists that differ from `stored`; returns how many."""
+    changed = [room_id for room_id in wanted if wanted[room_id] != stored.get(room_id, [])]
+    with transaction.atomic():
+        RoomNeighbour.objects.filter(room_id__in=changed).delete()
+        RoomNeighbour.objects.bulk_create(
+            RoomNeighbour(room_id=room_id, neighbour_id=neighbour_id, rank=rank, score=similarity)
+            for room_id in changed
+            for rank, (neighbour_id, similarity) in enumerate(wanted[room_id], start=1)
+        )
+    return len(changed)
+
+
+def rebuild_hotel(hotel_id, k=None):
+    """
+    Recompute the neighbours of every room in a hotel, rewriting only the
+    rooms whose list changed. Returns the number of rooms rewritten.
+    """
+    k = k or get_similarity_setting("K")
+    rooms = _hotel_rooms(hotel_id)
+    neighbours = nearest(feature_vectors(rooms), k) if rooms else []
+    wanted = {
+        room.id: [(rooms[j].id, score(distance)) for j, distance in found]
+        for room, found in zip(rooms, neighbours)
+    }
+    return _rewrite(wanted, _stored_neighbours(hotel_id))
+
+
+def refresh_room(hotel_id, room_id, before=None, k=None):
+    """
+    Update a hotel's neighbours after room `room_id` was added to it,
+    changed or removed from it; `before` holds the room's previous
+    FEATURE_FIELDS values when it was in the hotel. Returns the number of
+    rooms rewritten.
+    """
+    k = k or get_similarity_setting("K")
+    rooms = _hotel_rooms(hotel_id)
+    others = [room for room in rooms if room.id != room_id]
+    previous = others + [Room(**before)] if before is not None else others
+    if not others or numeric_ranges(previous) != numeric_ranges(rooms):
+        return rebuild_hotel(hotel_id, k)
+
+    stored = _stored_neighbours(hotel_id)
+    full = min(k, len(rooms) - 1)
+    # Lists that held the room, or were left short when it was deleted
+    affected = {room.id for room in others if len(stored.get(room.id, [])) < full}
+    affected.update(room.id for room in others if any(n == room_id for n, _ in stored.get(room.id, [])))
+
+    vectors = feature_vectors(rooms)
+    index = {room.id: i for i, room in enumerate(rooms)}
+    if room_id in index:
+        affected.add(room_id)
+        # Lists whose last neighbour is further away than the room now is
+        distances = distances_from(vectors, index[room_id])
+        for room in others:
+            held = stored.get(room.id, [])
+            if held and score(distances[index[room.id]]) >= held[-1][1]:
+                affected.add(room.id)
+
+    rows = sorted(index[affected_id] for affected_id in affected)
+    wanted = {
+        rooms[i].id: [(rooms[j].id, score(distance)) for j, distance in found]
+        for i, found in zip(rows, nearest(vectors, k, rows))
+    }
+    return _rewrite(wanted, stored)
+
+
+def rebuild_all(k=None):
+    hotel_ids = Room.objects.order_by().values_list("hotel_id", flat=True).distinct()
+    return sum(rebuild_hotel(hotel_id, k) for hotel_id in hotel_ids)
+
+
+# ---------- SIGNALS ----------
+
+def _features(values):
+    return tuple(str(values[field]) for field in FEATURE_FIELDS) + (values["hotel_id"],)
+
+
+def _refresh_after_commit(hotel_id, room_id, before=None):
+    # Neighbours can always be rebuilt (`build_room_neighbours`): a failed
+    # refresh is logged, not raised to the caller whose change committed
+    transaction.on_commit(partial(refresh_room, hotel_id, room_id, before), robust=True)
+
+
+def _feature_values(values):
+    return {field: values[field] for field in FEATURE_FIELDS}
+
+
+@receiver(pre_save, sender=Room)
+def remember_features(sender, instance, raw=False, **kwargs):
+    row = None if raw else stored(instance)
+    instance._features_before = row and {field: row[field] for field in (*FEATURE_FIELDS, "hotel_id")}
+
+
+@receiver(post_save, sender=Room)
+def refresh_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_features_before", None)
+    after = {field: getattr(instance, field) for field in (*FEATURE_FIELDS, "hotel_id")}
+    if before is not None and _features(before) == _features(after):
+        return
+    if before is None:
+        _refresh_after_commit(instance.hotel_id, instance.id)
+    elif before["hotel_id"] == instance.hotel_id:
+        _refresh_after_commit(instance.hotel_id, instance.id, _feature_values(before))
+    else:
+        # Moved between hotels: the old one lost a room, the new one gained it
+        _refresh_after_commit(before["hotel_id"], instance.id, _feature_values(before))
+        _refresh_after_commit(instance.hotel_id, instance.id)
+
+
+@receiver(post_delete, sender=Room)
+def refresh_on_delete(sender, instance, **kwargs):
+    values = {field: getattr(instance, field) for field in FEATURE_FIELDS}
+    _refresh_after_commit(instance.hotel_id, instance.id, values)
@@ -0,0 +1,35 @@
+"""
+The stored row a save is about to overwrite, read once per save.
+
+Media reference counts, the ARI feed and room neighbours all compare a
+saved row with what it replaced. Each of their pre_save listeners asks
+`stored` for the old values: the first one reads the row (every concrete
+field, so one query serves them all) and the others share it. It is
+dropped after the save or delete, so the next save reads the row again.
+"""
+from django.db.models.signals import post_delete, post_save
+
+# Instance attribute holding the snapshot; kept out of the field namespace
+ATTRIBUTE = "_stored_row"
+
+
+def stored(instance):
+    """
+    The stored values of `instance` by field attname, or None when it has
+    no row yet. Call it from pre_save.
+    """
+    if instance.pk is None:
+        return None
+    state = instance.__dict__
+    if ATTRIBUTE not in state:
+        fields = [field.attname for field in instance._meta.concrete_fields]
+        state[ATTRIBUTE] = type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    return state[ATTRIBUTE]
+
+
+def forget(sender, instance, **kwargs):
+    instance.__dict__.pop(ATTRIBUTE, None)
+
+
+post_save.connect(forget, dispatch_uid="snapshots-forget-saved")
+post_delete.connect(forget, dispatch_uid="snapshots-forget-deleted")
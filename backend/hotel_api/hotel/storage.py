@@ -0,0 +1,79 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored under the SHA-256 of their bytes
+(blobs/ab/cd/abcd...ef.jpg), so the same photo uploaded for several rooms,
+the gallery or an avatar is written once and every row points at the same
+name. hotel.media reference-counts those names and removes blobs nothing
+points at any more; a save holds the blob's row (hotel.media.hold) while
+it checks for the file, so cleanup can't remove it in between.
+
+`ContentAddressedMixin` works on top of any Django storage backend; the
+filesystem and (with django-storages installed) S3-compatible variants,
+e.g. MinIO, are provided. Select one with STORAGES["default"].
+"""
+import hashlib
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+
+try:
+    from storages.backends.s3 import S3Storage
+except ImportError:  # django-storages / boto3 are optional
+    S3Storage = None
+
+from .media import hold
+
+BLOB_PREFIX = "blobs"
+
+
+def content_hash(content, chunk_size=64 * 1024):
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks(chunk_size):
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def blob_name(digest, original_name):
+    ext = posixpath.splitext(original_name or "")[1].lower()
+    return posixpath.join(BLOB_PREFIX, digest[:2], digest[2:4], digest + ext)
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX + "/")
+
+
+class ContentAddressedMixin:
+    """
+    Name every saved file after its content hash and skip the write when a
+    blob with that name already exists. The upload_to directory is ignored
+    so identical files dedupe across fields.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = blob_name(content_hash(content), name)
+        with transaction.atomic():
+            hold(name)
+            if self.exists(name):
+                return name
+            return super().save(name, content, max_length=max_length)
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    pass
+
+
+if S3Storage is not None:
+
+    class ContentAddressedS3Storage(ContentAddressedMixin, S3Storage):
+        pass
@@ -0,0 +1,56 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+
+from .renderers import dumps
+
+
+def stream_json_list(queryset, serializer_class, context=None, chunk_size=500, serializer_kwargs=None):
+    """
+    Serialize a queryset as a JSON array, `chunk_size` rows at a time.
+
+    Rows are fetched with a server-side iterator so memory stays bounded and
+    the first chunk reaches the client before the rest is serialized.
+    """
+
+    def generate():
+        rows = queryset.iterator(chunk_size=chunk_size)
+        yield b"["
+        first = True
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            data = serializer_class(chunk, many=True, context=context or {}, **(serializer_kwargs or {})).data
+            body = dumps(data)[1:-1]
+            if not first:
+                yield b","
+            yield body
+            first = False
+        yield b"]"
+
+    return StreamingHttpResponse(generate(), content_type="application/json")
+
+
+class StreamingExportMixin:
+    """
+    Adds a `GET <prefix>/export/` action that streams the full list as JSON
+    instead of building the whole response in memory.
+    """
+
+    export_chunk_size = 500
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        return stream_json_list(
+            self.get_export_queryset(),
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+            self.export_chunk_size,
+            # Sparse fieldsets (hotel.fieldsets) apply to exports too
+            getattr(self, "get_fieldset_kwargs", dict)(),
+        )
@@ -0,0 +1,109 @@
+"""
+Per-user booking summary for the profile page, computed with a couple of
+aggregate queries and cached until one of the user's bookings changes.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking
+from .signals import booking_status_changed
+
+SUMMARY_TIMEOUT = 60 * 60
+UPCOMING_LIMIT = 5
+
+
+def summary_cache_key(user_id):
+    # Dated so "upcoming" and "last stay" roll over at midnight
+    return f"booking-summary:{user_id}:{timezone.localdate().isoformat()}"
+
+
+def invalidate_booking_summaries(user_ids):
+    cache.delete_many([summary_cache_key(user_id) for user_id in set(user_ids)])
+
+
+def _compact(booking):
+    return {
+        "id": booking.id,
+        "room": booking.room_id,
+        "room_number": booking.room.number,
+        "room_type": booking.room.room_type,
+        "check_in": booking.check_in,
+        "check_out": booking.check_out,
+        "guests": booking.guests,
+        "status": booking.status,
+    }
+
+
+def _archived_compact(booking):
+    return {
+        "id": booking.id,
+        "room": booking.room_id,
+        "room_number": booking.room_number,
+        "room_type": booking.room_type,
+        "check_in": booking.check_in,
+        "check_out": booking.check_out,
+        "guests": booking.guests,
+        "status": booking.status,
+    }
+
+
+def build_booking_summary(user):
+    today = timezone.localdate()
+    active = Booking.objects.filter(user=user, status__in=Booking.ACTIVE_STATUSES)
+    archived = ArchivedBooking.objects.filter(user=user, status__in=Booking.ACTIVE_STATUSES)
+
+    # One row per distinct nightly rate (as booked), so spend is a sum of a
+    # few products
+    total_nights = 0
+    total_spend = Decimal("0.00")
+    rows = [
+        *active.values_list("price_per_night").annotate(stay=Sum(F("check_out") - F("check_in"))),
+        *archived.values_list("price_per_night").annotate(stay=Sum(F("check_out") - F("check_in"))),
+    ]
+    for price, stay in rows:
+        nights = stay.days if stay else 0
+        total_nights += nights
+        total_spend += nights * price
+
+    upcoming = active.filter(check_in__gte=today).select_related("room").order_by("check_in")
+    last_stay = active.filter(check_out__lte=today).select_related("room").order_by("-check_out").first()
+    if last_stay:
+        last_stay = _compact(last_stay)
+    else:
+        # Guests whose past stays have all been archived
+        last_stay = archived.order_by("-check_out").first()
+        last_stay = _archived_compact(last_stay) if last_stay else None
+
+    return {
+        "total_bookings": active.count() + archived.count(),
+        "total_nights": total_nights,
+        "total_spend": f"{total_spend:.2f}",
+        "upcoming_count": upcoming.count(),
+        "upcoming": [_compact(booking) for booking in upcoming[:UPCOMING_LIMIT]],
+        "last_stay": last_stay,
+    }
+
+
+def get_booking_summary(user):
+    key = summary_cache_key(user.id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_booking_summary(user)
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_on_booking_change(sender, instance, **kwargs):
+    invalidate_booking_summaries([instance.user_id])
+
+
+@receiver(booking_status_changed)
+def invalidate_on_status_change(sender, bookings, **kwargs):
+    invalidate_booking_summaries(booking.user_id for booking in bookings)
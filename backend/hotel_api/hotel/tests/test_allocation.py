@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from hotel.allocation import Stay, assign, orphan_nights, reoptimize
+from hotel.models import Booking, Hotel
+
+from .utils import in_days, make_booking, make_room
+
+
+class AssignTests(SimpleTestCase):
+    def test_best_fit_fills_the_tightest_gap(self):
+        stays = [
+            Stay(1, 101, 0, 2, 1, True),
+            Stay(2, 101, 5, 7, 1, True),
+            Stay(3, 102, 0, 3, 1, True),
+            Stay(4, 101, 3, 5, 1, False),
+        ]
+        assignment = assign({101: 2, 102: 2}, stays)
+
+        self.assertEqual(assignment, {1: 101, 2: 101, 3: 102, 4: 102})
+        self.assertEqual(orphan_nights({stay.id: stay.room for stay in stays}, stays), 1)
+        self.assertEqual(orphan_nights(assignment, stays), 0)
+
+    def test_capacity_and_locked_stays_are_respected(self):
+        stays = [Stay(1, 101, 0, 4, 1, True), Stay(2, 102, 1, 3, 3, False)]
+        self.assertEqual(assign({101: 4, 102: 2}, stays), None)
+        self.assertEqual(assign({101: 4, 102: 4}, stays), {1: 101, 2: 102})
+
+
+class ReoptimizeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room_a = make_room(cls.hotel, number="101")
+        cls.room_b = make_room(cls.hotel, number="102")
+        cls.guest = User.objects.create_user("guest")
+        cls.start = in_days(10)
+
+    def setUp(self):
+        # The layout of AssignTests: moving the last stay to 102 leaves a
+        # sellable 3-night gap in 101 instead of an orphan night
+        self.book(self.room_a, 0, 2)
+        self.book(self.room_a, 5, 2)
+        self.book(self.room_b, 0, 3)
+        self.movable = self.book(self.room_a, 3, 2, room_type="double", room_locked=False)
+
+    def book(self, room, offset, nights, **fields):
+        return make_booking(self.guest, room, self.start + timedelta(days=offset), nights=nights, **fields)
+
+    def reoptimize(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return reoptimize(["double", "single"], hotels=[self.hotel], **kwargs)
+
+    def test_moves_unlocked_bookings_for_fewer_orphans(self):
+        stats = self.reoptimize(dry_run=True)
+        self.assertEqual(stats["harbour", "double"], {"moved": 1, "orphans_before": 1, "orphans_after": 0, "error": None})
+        self.movable.refresh_from_db()
+        self.assertEqual(self.movable.room, self.room_a)
+
+        self.reoptimize()
+        self.movable.refresh_from_db()
+        self.assertEqual(self.movable.room, self.room_b)
+        self.assertEqual(self.reoptimize()["harbour", "double"]["moved"], 0)
+
+    def test_older_clashes_between_unmoved_bookings_dont_block(self):
+        room_c = make_room(self.hotel, number="103")
+        self.book(room_c, 0, 3)
+        self.book(room_c, 1, 3)
+
+        self.assertEqual(self.reoptimize()["harbour", "double"]["error"], None)
+        self.movable.refresh_from_db()
+        self.assertEqual(self.movable.room, self.room_b)
+
+    def test_a_clash_rolls_back_only_that_type(self):
+        update = Booking.objects.bulk_update
+
+        def race(*args, **kwargs):
+            # A concurrent request books B for the moved stay's nights
+            self.book(self.room_b, 3, 1)
+            return update(*args, **kwargs)
+
+        with mock.patch.object(Booking.objects, "bulk_update", side_effect=race):
+            stats = self.reoptimize()
+
+        self.assertEqual(stats["harbour", "double"]["moved"], 0)
+        self.assertIn("try again", stats["harbour", "double"]["error"])
+        self.assertEqual(stats["harbour", "single"]["error"], None)
+        self.movable.refresh_from_db()
+        self.assertEqual(self.movable.room, self.room_a)
+        self.assertEqual(Booking.objects.filter(room=self.room_b).count(), 1)
+
+    def test_command_reports_each_type(self):
+        out, err = StringIO(), StringIO()
+        call_command("optimize_room_assignments", hotels=["harbour"], room_types=["double"], stdout=out, stderr=err)
+        self.assertIn("harbour/double", out.getvalue())
+        self.assertIn("1 -> 0", out.getvalue())
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hotel.archive import archive_bookings, archive_messages, months_before
+from hotel.models import (
+    ArchivedBooking,
+    ArchivedContactMessage,
+    Booking,
+    ChangeEvent,
+    ContactMessage,
+    Hotel,
+    Room,
+    SearchDocument,
+)
+
+from .utils import in_days, make_booking, make_room
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel, price="90.00")
+        cls.guest = User.objects.create_user("guest")
+
+    def test_months_before_clamps_to_shorter_months(self):
+        self.assertEqual(months_before(date(2026, 3, 31), 1), date(2026, 2, 28))
+        self.assertEqual(months_before(date(2026, 1, 15), 13), date(2024, 12, 15))
+
+    def test_old_bookings_move_in_batches(self):
+        old = [make_booking(self.guest, self.room, in_days(-500 + 10 * i), status="confirmed") for i in range(5)]
+        recent = make_booking(self.guest, self.room, in_days(-30), status="confirmed")
+        Room.objects.filter(pk=self.room.pk).update(price_per_night=200)
+
+        self.assertEqual(archive_bookings(dry_run=True)["harbour"], 5)
+        self.assertEqual(Booking.objects.filter(hotel=self.hotel).count(), 6)
+
+        self.assertEqual(archive_bookings(batch_size=2)["harbour"], 5)
+        self.assertEqual(list(Booking.objects.filter(hotel=self.hotel)), [recent])
+        archived = ArchivedBooking.objects.get(pk=old[0].pk)
+        self.assertEqual((archived.room_number, archived.room_type, archived.username), ("101", "double", "guest"))
+        self.assertEqual(archived.price_per_night, old[0].price_per_night)
+        self.assertEqual(archive_bookings()["harbour"], 0)
+
+    def test_feed_records_archive_not_delete(self):
+        old = make_booking(self.guest, self.room, in_days(-500), status="confirmed")
+        gone = make_booking(self.guest, self.room, in_days(20))
+        gone_id = gone.id
+        ChangeEvent.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            gone.delete()
+            archive_bookings()
+
+        actions = dict(ChangeEvent.objects.filter(topic="booking").values_list("object_id", "action"))
+        self.assertEqual(actions, {gone_id: "delete", old.id: "archive"})
+        # Deletes outside archival are recorded as deletes again
+        make_booking(self.guest, self.room, in_days(40)).delete()
+        self.assertEqual(ChangeEvent.objects.order_by("id").last().action, "delete")
+
+    def test_read_old_messages_only(self):
+        def message(subject, is_read, age):
+            created = ContactMessage.objects.create(
+                name="Guest", email="guest@example.com", subject=subject, message="Hello", is_read=is_read
+            )
+            ContactMessage.objects.filter(pk=created.pk).update(created_at=timezone.now() - age)
+            return created
+
+        old_read = message("old read", True, timedelta(days=100))
+        message("old unread", False, timedelta(days=100))
+        message("new read", True, timedelta(days=10))
+
+        self.assertEqual(archive_messages(), 1)
+        self.assertEqual(ArchivedContactMessage.objects.get().subject, "old read")
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertFalse(SearchDocument.objects.filter(kind="message", object_id=old_read.id).exists())
+
+    def test_guests_see_their_archived_bookings(self):
+        old = make_booking(self.guest, self.room, in_days(-500), status="confirmed")
+        archive_bookings()
+
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        response = client.get("/api/bookings/archived/")
+        self.assertEqual([row["id"] for row in response.data["results"]], [old.id])
+        self.assertEqual(client.get("/api/bookings/").data["results"], [])
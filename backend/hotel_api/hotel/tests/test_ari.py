@@ -0,0 +1,96 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from hotel import ari
+from hotel.models import AriChange, AriNight, AriSequence, Hotel
+
+from .utils import in_days, make_booking, make_room
+
+
+@override_settings(ARI={"HORIZON_DAYS": 30})
+class AriFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel)
+        cls.guest = User.objects.create_user("guest")
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ari.sync_hotel(self.hotel.id)
+        self.start = in_days(5)
+
+    def book(self, start=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return make_booking(self.guest, self.room, start or self.start)
+
+    def test_deltas_follow_the_cursor(self):
+        page = ari.read_deltas(self.hotel, None)
+        self.assertEqual(page["changes"], [])
+        cursor = page["cursor"]
+
+        self.book()
+        page = ari.read_deltas(self.hotel, cursor)
+        self.assertEqual(page["cursor"], cursor + 2)
+        self.assertFalse(page["reset"])
+        self.assertEqual(
+            page["changes"],
+            [["double", self.start + timedelta(days=offset), 0, 1, "100.00"] for offset in range(2)],
+        )
+        self.assertEqual(ari.read_deltas(self.hotel, page["cursor"])["changes"], [])
+
+    def test_late_commit_is_placed_after_delivered_changes(self):
+        cursor = ari.latest_cursor()
+        # Refreshed and committed, but its sequencing callback hasn't run
+        booking = make_booking(self.guest, self.room, self.start)
+        ari.refresh(self.hotel.id, "double", booking.check_in, booking.check_out)
+        late = list(AriChange.objects.filter(position__isnull=True).values_list("id", flat=True))
+        self.assertEqual(len(late), 2)
+        self.assertEqual(ari.read_deltas(self.hotel, cursor)["changes"], [])
+
+        # A refresh that started later committed and was sequenced (and read) first
+        early = AriChange.objects.create(
+            hotel=self.hotel, room_type="suite", date=self.start, available=1, inventory=1, position=cursor + 1
+        )
+        AriSequence.objects.filter(pk=1).update(position=cursor + 1)
+        delivered = ari.read_deltas(self.hotel, cursor)
+        self.assertEqual(delivered["cursor"], cursor + 1)
+        self.assertEqual(delivered["changes"], [["suite", self.start, 1, 1, None]])
+
+        self.assertEqual(ari.sequence(), 2)
+        page = ari.read_deltas(self.hotel, delivered["cursor"])
+        self.assertLess(max(late), early.id)
+        self.assertEqual(page["cursor"], cursor + 3)
+        self.assertEqual(
+            page["changes"],
+            [["double", self.start + timedelta(days=offset), 0, 1, "100.00"] for offset in range(2)],
+        )
+
+    def test_pruned_cursor_is_reset(self):
+        self.book()
+        ari.prune(retention=timedelta(0))
+        self.book(self.start + timedelta(days=10))
+        page = ari.read_deltas(self.hotel, 1)
+        self.assertTrue(page["reset"])
+        self.assertEqual(page["cursor"], ari.latest_cursor())
+
+    def test_snapshot_carries_nights_and_cursor(self):
+        self.book()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with override_settings(ARI={"HORIZON_DAYS": 30, "SNAPSHOT_DIR": directory}):
+            path = ari.write_snapshot(self.hotel)
+        with gzip.open(path) as file:
+            snapshot = json.loads(file.read())
+
+        self.assertEqual(snapshot["cursor"], ari.latest_cursor())
+        self.assertEqual(len(snapshot["nights"]), AriNight.objects.filter(hotel=self.hotel).count())
+        nights = {(room_type, date): available for room_type, date, available, _, _ in snapshot["nights"]}
+        self.assertEqual(nights["double", self.start.isoformat()], 0)
+        self.assertEqual(nights["double", (self.start - timedelta(days=1)).isoformat()], 1)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from hotel.models import Booking, Hotel
+
+from .utils import in_days, make_room
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("guest")
+        cls.room = make_room(Hotel.objects.get(slug="main"), number="B1")
+
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def batch(self, *calls, **headers):
+        return self.client.post("/api/batch/", {"requests": list(calls)}, format="json", headers=headers)
+
+    def booking(self, days):
+        start = in_days(days)
+        return {
+            "method": "POST",
+            "path": "/api/bookings/",
+            "body": {"room": self.room.id, "check_in": start, "check_out": start + timedelta(days=2), "guests": 1},
+        }
+
+    def test_each_call_gets_its_own_status(self):
+        self.client.force_authenticate(self.user)
+        response = self.batch(
+            {"method": "GET", "path": "/api/auth/me/"},
+            self.booking(10),
+            # Same nights: taken by the call before it
+            self.booking(10),
+            {"method": "GET", "path": "/api/rooms/?sort=bogus"},
+            {"method": "GET", "path": "/api/nowhere/"},
+            {"method": "POST", "path": "/api/batch/", "body": {"requests": []}},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data["responses"]
+        self.assertEqual([result["status"] for result in results], [200, 201, 409, 400, 404, 400])
+        self.assertEqual(results[0]["body"]["username"], "guest")
+        self.assertEqual(results[0]["headers"]["Content-Type"], "application/json")
+        self.assertEqual(results[3]["body"], {"sort": "Choose from rating."})
+        self.assertEqual(results[5]["body"], {"detail": "Batches can't be nested."})
+        # Nothing is rolled back for the failed calls
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+
+    def test_calls_keep_their_own_permissions(self):
+        results = self.batch(
+            {"method": "GET", "path": "/api/auth/me/"},
+            {"method": "GET", "path": "/api/rooms/?fields=id,number"},
+        ).data["responses"]
+
+        self.assertEqual([result["status"] for result in results], [401, 200])
+
+    def test_reads_after_a_write_see_it(self):
+        self.client.force_authenticate(self.user)
+        results = self.batch(
+            {"method": "GET", "path": "/api/bookings/?fields=id"},
+            self.booking(20),
+            {"method": "GET", "path": "/api/bookings/?fields=id"},
+        ).data["responses"]
+
+        self.assertEqual(results[0]["body"]["count"], 0)
+        self.assertEqual(results[2]["body"]["results"], [{"id": results[1]["body"]["id"]}])
+
+    def test_outer_idempotency_key_is_not_shared(self):
+        self.client.force_authenticate(self.user)
+        results = self.batch(self.booking(30), self.booking(40), **{"Idempotency-Key": "outer"}).data["responses"]
+
+        self.assertEqual([result["status"] for result in results], [201, 201])
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 2)
+
+    @override_settings(BATCH={"MAX_REQUESTS": 2})
+    def test_invalid_batches_are_400(self):
+        too_many = self.batch(*[{"method": "GET", "path": "/api/rooms/"}] * 3)
+        outside_api = self.batch({"method": "GET", "path": "/admin/"})
+
+        self.assertEqual(too_many.status_code, 400)
+        self.assertEqual(too_many.data["requests"], ["At most 2 requests per batch."])
+        self.assertEqual(outside_api.status_code, 400)
+        self.assertEqual(self.batch().status_code, 400)
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.bookings import InvalidTransition, RoomsUnavailable, expire_stale_holds, reserve_group, transition
+from hotel.models import Booking, Hotel
+
+from .utils import age, in_days, make_booking, make_room
+
+
+class BookingTransitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel)
+        cls.other_room = make_room(cls.hotel, number="102")
+        cls.guest = User.objects.create_user("guest", password="secret-1")
+        cls.start = in_days(10)
+
+    def test_guest_confirms_own_hold(self):
+        booking = make_booking(self.guest, self.room, self.start)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("stranger"))
+        self.assertEqual(client.post(f"/api/bookings/{booking.id}/confirm/").status_code, 404)
+
+        client.force_authenticate(self.guest)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(f"/api/bookings/{booking.id}/confirm/")
+        self.assertEqual(response.status_code, 200)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, "confirmed")
+
+    def test_illegal_transition_is_refused(self):
+        booking = make_booking(self.guest, self.room, self.start, status="cancelled")
+        with self.assertRaises(InvalidTransition):
+            transition(booking, "confirmed")
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, "cancelled")
+
+    def test_confirming_an_expired_hold_expires_only_that_booking(self):
+        booking = make_booking(self.guest, self.room, self.start)
+        other = make_booking(self.guest, self.other_room, self.start)
+        age(booking, timedelta(hours=2))
+        age(other, timedelta(hours=2))
+
+        with self.assertRaises(InvalidTransition):
+            transition(booking, "confirmed")
+        booking.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(booking.status, "expired")
+        self.assertEqual(other.status, "pending")
+
+    def test_sweep_expires_stale_holds(self):
+        stale = make_booking(self.guest, self.room, self.start)
+        fresh = make_booking(self.guest, self.other_room, self.start)
+        confirmed = make_booking(self.guest, self.room, self.start + timedelta(days=5), status="confirmed")
+        age(stale, timedelta(hours=2))
+        age(confirmed, timedelta(hours=2))
+
+        self.assertEqual(expire_stale_holds(), 1)
+        statuses = dict(Booking.objects.values_list("id", "status"))
+        self.assertEqual(statuses[stale.id], "expired")
+        self.assertEqual(statuses[fresh.id], "pending")
+        self.assertEqual(statuses[confirmed.id], "confirmed")
+
+
+class BookingAvailabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel)
+        cls.other_room = make_room(cls.hotel, number="102")
+        cls.guest = User.objects.create_user("guest")
+        cls.rival = User.objects.create_user("rival")
+        cls.start = in_days(10)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.guest)
+
+    def book(self, nights=2, start=None, **fields):
+        start = start or self.start
+        payload = {"hotel": self.hotel.id, "check_in": start, "check_out": start + timedelta(days=nights), "guests": 1}
+        return self.client.post("/api/bookings/", {**payload, **fields}, format="json")
+
+    def test_overlapping_stay_is_409(self):
+        make_booking(self.rival, self.room, self.start + timedelta(days=1))
+
+        response = self.book(room=self.room.id)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Booking.objects.filter(user=self.guest).exists())
+
+        # Back to back is fine, and so is a cancelled booking
+        self.assertEqual(self.book(nights=1, room=self.room.id).status_code, 201)
+        Booking.objects.filter(user=self.rival).update(status="cancelled")
+        self.assertEqual(self.book(start=self.start + timedelta(days=1), room=self.room.id).status_code, 201)
+
+    def test_check_out_must_follow_check_in(self):
+        for nights in (0, -2):
+            response = self.book(nights=nights, room=self.room.id)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("check_out", response.data)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_room_type_bookings_get_a_free_room(self):
+        make_booking(self.rival, self.room, self.start)
+
+        response = self.book(room_type="double")
+        self.assertEqual(response.status_code, 201)
+        booking = Booking.objects.get(pk=response.data["id"])
+        self.assertEqual((booking.room, booking.room_type, booking.room_locked), (self.other_room, "double", False))
+
+        self.assertEqual(self.book(room_type="double").status_code, 400)
+
+    def test_room_type_pick_is_checked_under_the_lock(self):
+        # Another request books the allocator's pick before we insert
+        make_booking(self.rival, self.room, self.start)
+        with mock.patch("hotel.serializers.best_room", return_value=self.room):
+            response = self.book(room_type="double")
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Booking.objects.filter(user=self.guest).exists())
+
+    def test_moving_a_booking_is_checked_too(self):
+        make_booking(self.rival, self.room, self.start + timedelta(days=5))
+        booking = make_booking(self.guest, self.room, self.start)
+
+        def move(**changes):
+            return self.client.patch(f"/api/bookings/{booking.id}/", changes, format="json")
+
+        self.assertEqual(move(check_out=self.start + timedelta(days=6)).status_code, 409)
+        self.assertEqual(move(check_out=self.start).status_code, 400)
+        self.assertEqual(move(check_out=self.start + timedelta(days=5)).status_code, 200)
+        booking.refresh_from_db()
+        self.assertEqual(booking.check_out, self.start + timedelta(days=5))
+
+    def test_group_sets_room_types(self):
+        bookings = reserve_group(self.guest, self.hotel, 2, self.start, self.start + timedelta(days=2), 1)
+        self.assertEqual([booking.room_type for booking in bookings], ["double", "double"])
+
+    def test_group_rolls_back_on_a_conflict(self):
+        create = Booking.objects.bulk_create
+
+        def race(bookings, *args, **kwargs):
+            # A concurrent request takes one of the rooms first
+            make_booking(self.rival, self.other_room, self.start)
+            return create(bookings, *args, **kwargs)
+
+        with mock.patch.object(Booking.objects, "bulk_create", side_effect=race):
+            with self.assertRaises(RoomsUnavailable):
+                reserve_group(self.guest, self.hotel, 2, self.start, self.start + timedelta(days=2), 1)
+        self.assertFalse(Booking.objects.filter(user=self.guest).exists())
+
+        response = self.client.post(
+            "/api/bookings/group/",
+            {"hotel": self.hotel.id, "rooms": 3, "check_in": self.start, "check_out": self.start, "guests": 1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,95 @@
+import gzip
+import json
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from hotel import middleware
+from hotel.middleware import negotiate_encoding
+from hotel.models import Booking, Hotel, Room
+from hotel.views import BookingAdminViewSet
+
+from .utils import in_days, make_booking, make_room
+
+
+class NegotiateEncodingTests(SimpleTestCase):
+    def test_prefers_brotli_when_installed(self):
+        with mock.patch.object(middleware, "brotli", object()):
+            self.assertEqual(negotiate_encoding("gzip, deflate, br"), "br")
+            self.assertEqual(negotiate_encoding("br;q=0.5, gzip"), "gzip")
+            self.assertEqual(negotiate_encoding("*"), "br")
+
+    def test_gzip_only_without_brotli(self):
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(negotiate_encoding("br, gzip;q=0.1"), "gzip")
+            self.assertIsNone(negotiate_encoding("br"))
+
+    def test_refused_or_missing_encodings(self):
+        self.assertIsNone(negotiate_encoding(""))
+        self.assertIsNone(negotiate_encoding("identity"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0, br;q=0"))
+        self.assertIsNone(negotiate_encoding("*;q=0"))
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        hotel = Hotel.objects.get(slug="main")
+        for number in range(20):
+            make_room(hotel, number=f"C{number}", description="Sea view, balcony and breakfast. " * 10)
+
+    def test_large_json_is_gzipped(self):
+        plain = self.client.get("/api/rooms/")
+        response = self.client.get("/api/rooms/", headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), json.loads(plain.content))
+
+    @skipIf(middleware.brotli is None, "brotli is not installed")
+    def test_large_json_is_brotli_compressed(self):
+        plain = self.client.get("/api/rooms/")
+        response = self.client.get("/api/rooms/", headers={"Accept-Encoding": "gzip, br"})
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(middleware.brotli.decompress(response.content), plain.content)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10**7)
+    def test_responses_under_the_threshold_are_left_alone(self):
+        response = self.client.get("/api/rooms/", headers={"Accept-Encoding": "gzip, br"})
+        self.assertNotIn("Content-Encoding", response)
+
+
+class StreamingExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("boss", is_staff=True))
+        guest = User.objects.create_user("guest")
+        room = make_room(Hotel.objects.get(slug="main"), number="E1")
+        for offset in range(0, 50, 5):
+            make_booking(guest, room, in_days(10 + offset))
+
+    def test_export_streams_every_row_in_chunks(self):
+        with mock.patch.object(BookingAdminViewSet, "export_chunk_size", 3):
+            response = self.client.get("/api/admin/bookings/export/")
+            chunks = list(response.streaming_content)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(chunks[0], b"[")
+        # One body per chunk of three rows, plus the brackets and separators
+        self.assertGreater(len(chunks), 4)
+        rows = json.loads(b"".join(chunks))
+        self.assertEqual(sorted(row["id"] for row in rows), sorted(Booking.objects.values_list("id", flat=True)))
+
+    def test_export_is_compressed_while_streaming(self):
+        response = self.client.get("/api/admin/rooms/export/", headers={"Accept-Encoding": "gzip"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response)
+        rows = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(len(rows), Room.objects.count())
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hotel import feed
+from hotel.models import ChangeEvent, ChangeSequence, ContactMessage, Hotel
+
+from .utils import in_days, make_booking, make_room
+
+
+class ChangeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.guest = User.objects.create_user("guest")
+
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room = make_room(self.hotel, number="101")
+        self.start = feed.latest_cursor()
+
+    def test_events_are_readable_once_sequenced(self):
+        # Without the on-commit callback nothing is sequenced yet
+        make_room(self.hotel, number="102")
+        self.assertEqual(feed.read_changes(self.start, ["room"])["events"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_room(self.hotel, number="103")
+        page = feed.read_changes(self.start, ["room"])
+
+        self.assertEqual([event["data"]["number"] for event in page["events"]], ["102", "103"])
+        self.assertEqual([event["id"] for event in page["events"]], [self.start + 1, self.start + 2])
+        self.assertEqual(page["cursor"], self.start + 2)
+        self.assertEqual(ChangeSequence.objects.get(pk=1).position, self.start + 2)
+
+    def test_late_commit_is_placed_after_delivered_events(self):
+        late = ChangeEvent.objects.create(topic="room", action="upsert", object_id=self.room.id, hotel=self.hotel)
+        early = ChangeEvent.objects.create(topic="room", action="upsert", object_id=self.room.id, hotel=self.hotel)
+        # `early` committed and was sequenced (and read) while `late` was still open
+        ChangeEvent.objects.filter(pk=early.pk).update(position=self.start + 1)
+        ChangeSequence.objects.filter(pk=1).update(position=self.start + 1)
+        delivered = feed.read_changes(self.start, ["room"])["cursor"]
+
+        self.assertEqual(feed.sequence(), 1)
+        late.refresh_from_db()
+        self.assertEqual(late.position, self.start + 2)
+        self.assertLess(late.id, early.id)
+        self.assertEqual([event["id"] for event in feed.read_changes(delivered, ["room"])["events"]], [late.position])
+
+    def test_no_cursor_starts_from_now(self):
+        page = feed.read_changes(None, ["room"])
+        self.assertEqual(page, {"cursor": self.start, "reset": False, "events": []})
+
+    def test_pruned_cursor_is_reset(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_room(self.hotel, number="102")
+            make_room(self.hotel, number="103")
+        ChangeEvent.objects.filter(position__lte=self.start + 1).update(created_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(feed.prune(timedelta(days=7)), self.start + 1)
+
+        self.assertFalse(feed.cursor_expired(self.start + 1))
+        self.assertTrue(feed.cursor_expired(self.start))
+        page = feed.read_changes(self.start, ["room"])
+        self.assertEqual(page, {"cursor": self.start + 2, "reset": True, "events": []})
+
+    def test_anonymous_clients_see_availability_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_booking(self.guest, self.room, in_days(10))
+            ContactMessage.objects.create(name="Ann", email="ann@example.com", subject="Hi", message="Hello")
+
+        public = self.client.get("/api/changes/", {"after": self.start}).data
+        self.assertEqual([event["topic"] for event in public["events"]], ["booking"])
+        self.assertEqual(set(public["events"][0]["data"]), set(feed.PUBLIC_BOOKING_FIELDS))
+        self.assertEqual(self.client.get("/api/changes/", {"topics": "message"}).status_code, 400)
+
+        self.client.force_authenticate(User.objects.create_user("desk", is_staff=True))
+        staff = self.client.get("/api/changes/", {"after": self.start}).data
+        self.assertEqual([event["topic"] for event in staff["events"]], ["booking", "message"])
+        self.assertEqual(staff["events"][0]["data"]["user"], self.guest.id)
+
+    def test_hotel_filter(self):
+        other = Hotel.objects.get(slug="main")
+        with self.captureOnCommitCallbacks(execute=True):
+            make_room(self.hotel, number="102")
+            make_room(other, number="T2")
+
+        events = feed.read_changes(self.start, ["room"], hotel=self.hotel)["events"]
+        self.assertEqual([event["data"]["number"] for event in events], ["102"])
@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from hotel.fieldsets import parse_fieldset, project_queryset
+from hotel.models import Booking, Hotel, Room
+from hotel.serializers import BookingSerializer, RoomSerializer
+
+from .utils import in_days, make_booking, make_room
+
+
+def only_columns(queryset):
+    columns, defer = queryset.query.deferred_loading
+    assert not defer, "expected .only()"
+    return set(columns)
+
+
+class ParseFieldsetTests(SimpleTestCase):
+    def test_dotted_names_nest(self):
+        self.assertEqual(
+            parse_fieldset("id, room_detail.number,room_detail.image,,"),
+            {"id": {}, "room_detail": {"number": {}, "image": {}}},
+        )
+        self.assertEqual(parse_fieldset(None), {})
+
+
+class ProjectQuerysetTests(TestCase):
+    def test_plain_columns_drop_unused_prefetch(self):
+        serializer = RoomSerializer(fields=parse_fieldset("id,number,price_per_night"))
+        queryset = project_queryset(Room.objects.prefetch_related("images"), serializer)
+
+        self.assertEqual(only_columns(queryset), {"id", "number", "price_per_night"})
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+    def test_method_fields_use_declared_sources(self):
+        serializer = RoomSerializer(fields=parse_fieldset("id,image"))
+        queryset = project_queryset(Room.objects.prefetch_related("images"), serializer)
+
+        self.assertEqual(only_columns(queryset), {"id", "cover_image"})
+        self.assertEqual(queryset._prefetch_related_lookups, ("images",))
+
+    def test_nested_fields_keep_only_used_joins(self):
+        serializer = BookingSerializer(fields=parse_fieldset("id,status,room_detail.number"))
+        queryset = project_queryset(
+            Booking.objects.select_related("user__profile", "room").prefetch_related("room__images"), serializer
+        )
+
+        self.assertEqual(queryset.query.select_related, {"room": {}})
+        self.assertEqual(only_columns(queryset), {"id", "status", "room", "room__id", "room__number"})
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+    def test_omit_keeps_everything_else(self):
+        serializer = RoomSerializer(omit=parse_fieldset("description,gallery"))
+        self.assertNotIn("description", serializer.fields)
+        self.assertNotIn("gallery", serializer.fields)
+        # `image` still reads the prefetched images
+        queryset = project_queryset(Room.objects.prefetch_related("images"), serializer)
+        self.assertNotIn("description", only_columns(queryset))
+        self.assertEqual(queryset._prefetch_related_lookups, ("images",))
+
+
+class SparseFieldsetViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("guest")
+        room = make_room(Hotel.objects.get(slug="main"), number="F1", description="Sea view")
+        make_booking(cls.user, room, in_days(10))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_reads_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/bookings/", {"fields": "id,room_detail.number"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data["results"][0]), ["id", "room_detail"])
+        self.assertEqual(response.data["results"][0]["room_detail"], {"number": "F1"})
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("hotel_roomimage", sql)
+        self.assertNotIn('JOIN "auth_user"', sql)
+
+    def test_unknown_field_is_400(self):
+        response = self.client.get("/api/bookings/", {"fields": "id,bogus"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["fields"], ["Unknown field: bogus"])
@@ -0,0 +1,70 @@
+from datetime import datetime, time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from hotel import forecast
+from hotel.models import Booking, Hotel
+
+from .utils import in_days, make_booking, make_room
+
+
+@override_settings(FORECAST={"HORIZON_DAYS": 7, "HISTORY_DAYS": 14})
+class ForecastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.doubles = [make_room(cls.hotel, number=str(n)) for n in (101, 102)]
+        cls.suite = make_room(cls.hotel, number="201", room_type="suite", price="300.00")
+        cls.guest = User.objects.create_user("guest")
+
+    def night(self, result, days):
+        return result["nights"][days]
+
+    def test_bookings_count_under_their_room_type(self):
+        # Booked for a specific room, so no requested type; and a stale one
+        make_booking(self.guest, self.doubles[0], in_days(1), status="confirmed")
+        make_booking(self.guest, self.suite, in_days(2), nights=1, status="confirmed", room_type="double")
+        make_booking(self.guest, self.doubles[1], in_days(1), status="cancelled")
+
+        result = forecast.build_forecast(self.hotel)
+
+        self.assertEqual(result["rooms"], {"double": 2, "suite": 1})
+        tomorrow, after = self.night(result, 1), self.night(result, 2)
+        self.assertEqual(tomorrow["room_types"]["double"]["on_the_books"], 1)
+        self.assertEqual(tomorrow["room_types"]["suite"]["on_the_books"], 0)
+        self.assertEqual(after["room_types"]["double"]["on_the_books"], 1)
+        self.assertEqual(after["room_types"]["suite"]["on_the_books"], 1)
+        self.assertEqual(after["on_the_books"], 2)
+        self.assertEqual(after["occupancy"], round(2 / 3, 4))
+
+    def test_pickup_projects_late_bookings(self):
+        # Every past night sold one double on the day itself
+        for days in range(1, 15):
+            booking = make_booking(self.guest, self.doubles[0], in_days(-days), nights=1, status="confirmed")
+            made = timezone.make_aware(datetime.combine(booking.check_in, time(9)))
+            Booking.objects.filter(pk=booking.pk).update(created_at=made)
+
+        result = forecast.build_forecast(self.hotel)
+
+        today, later = self.night(result, 0), self.night(result, 3)
+        # Nothing is picked up on the night itself
+        self.assertEqual(today["room_types"]["double"]["projected"], 0)
+        self.assertEqual(later["room_types"]["double"]["on_the_books"], 0)
+        self.assertEqual(later["room_types"]["double"]["projected"], 1.0)
+        self.assertEqual(later["room_types"]["double"]["occupancy"], 0.5)
+        self.assertEqual(later["room_types"]["suite"]["projected"], 0)
+
+    def test_histogram_matches_without_numpy(self):
+        # codes, booked, check_in, check_out, weights, types, days, horizon
+        args = ([0, 1, 0], [0, 2, 5], [3, 4, 9], [5, 6, 12], [1, 2, 1], 2, 10, 4)
+        expected = forecast.night_histogram(*args)
+        with mock.patch.object(forecast, "np", None):
+            self.assertEqual(forecast.night_histogram(*args), expected)
+
+        self.assertEqual(expected[0][3], [0, 0, 0, 1, 0])
+        self.assertEqual(expected[1][4], [0, 0, 2, 0, 0])
+        # Past the last night is cut off, past the horizon counts as the horizon
+        self.assertEqual(expected[0][9], [0, 0, 0, 0, 1])
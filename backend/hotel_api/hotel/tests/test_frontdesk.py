@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hotel.frontdesk import AUDIT_HEADER, CheckInError, mark_checked_in, movement_queryset
+from hotel.models import Hotel
+
+from .utils import in_days, make_booking, make_room
+
+
+class FrontDeskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.other_hotel = Hotel.objects.create(name="Hillside", slug="hillside")
+        cls.guest = User.objects.create_user("guest", email="guest@example.com")
+        cls.rooms = [make_room(cls.hotel, number=str(number)) for number in (103, 101, 102, 104)]
+        room_103, room_101, room_102, room_104 = cls.rooms
+        cls.arriving = make_booking(cls.guest, room_102, in_days(0), status="confirmed")
+        cls.staying = make_booking(
+            cls.guest, room_101, in_days(-1), nights=3, status="confirmed", checked_in_at=timezone.now()
+        )
+        cls.leaving = make_booking(cls.guest, room_103, in_days(-2), status="confirmed")
+        cls.cancelled = make_booking(cls.guest, room_104, in_days(0), status="cancelled")
+        # Due yesterday for one night, never arrived
+        cls.missed = make_booking(cls.guest, room_104, in_days(-1), nights=1, status="confirmed")
+        make_booking(cls.guest, make_room(cls.other_hotel), in_days(0), status="confirmed")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("desk", is_staff=True))
+
+    def ids(self, movement, day=None):
+        return [booking.id for booking in movement_queryset(movement, day or in_days(0), self.hotel)]
+
+    def test_movements_of_the_day(self):
+        self.assertEqual(self.ids("arrivals"), [self.arriving.id])
+        self.assertEqual(self.ids("departures"), [self.leaving.id, self.missed.id])
+        # Ordered by room number
+        self.assertEqual(self.ids("in-house"), [self.staying.id, self.arriving.id])
+        self.assertEqual(self.ids("no-shows"), [])
+        self.assertEqual(self.ids("no-shows", in_days(-1)), [self.missed.id])
+
+    def test_lists_use_the_date_indexes(self):
+        plan = movement_queryset("arrivals", in_days(0), self.hotel).explain()
+        self.assertIn("booking_hotel_check_in_idx", plan)
+        plan = movement_queryset("departures", in_days(0), self.hotel).explain()
+        self.assertIn("booking_hotel_check_out_idx", plan)
+
+    def test_list_endpoint(self):
+        response = self.client.get("/api/admin/frontdesk/arrivals/", {"hotel": "harbour"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.arriving.id])
+        self.assertEqual(response.data["results"][0]["room_number"], "102")
+
+        day = in_days(-1).isoformat()
+        response = self.client.get("/api/admin/frontdesk/no-shows/", {"hotel": "harbour", "date": day})
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.missed.id])
+        self.assertEqual(self.client.get("/api/admin/frontdesk/lobby/").status_code, 404)
+        self.assertEqual(self.client.get("/api/admin/frontdesk/arrivals/", {"date": "tomorrow"}).status_code, 400)
+
+    def test_check_in_during_the_stay_only(self):
+        mark_checked_in(self.arriving)
+        self.assertIsNotNone(self.arriving.checked_in_at)
+        with self.assertRaises(CheckInError):
+            mark_checked_in(self.arriving)
+        with self.assertRaises(CheckInError):
+            mark_checked_in(self.cancelled)
+
+        later = make_booking(self.guest, self.rooms[0], in_days(10), status="confirmed")
+        response = self.client.post(f"/api/admin/bookings/{later.id}/check-in/")
+        self.assertEqual(response.status_code, 409)
+        with self.assertRaises(CheckInError):
+            mark_checked_in(later, now=timezone.now() + timedelta(days=12))
+
+    def test_night_audit_streams_csv(self):
+        response = self.client.get("/api/admin/frontdesk/night-audit/", {"hotel": "harbour"})
+        self.assertTrue(response.streaming)
+        self.assertIn("night-audit-harbour-", response["Content-Disposition"])
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(","), AUDIT_HEADER)
+        self.assertEqual(
+            [tuple(line.split(",")[:2]) for line in lines[1:]],
+            [("arrival", "102"), ("stayover", "101"), ("departure", "103"), ("departure", "104")],
+        )
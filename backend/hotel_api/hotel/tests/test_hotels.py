@@ -0,0 +1,85 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.hotels import cached_for_hotel, hotel_cache_key, invalidate_hotel_cache
+from hotel.models import Hotel, Room, TeamMember
+
+from .utils import in_days, make_booking, make_room
+
+
+class HotelScopingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.main = Hotel.objects.get(slug="main")
+        cls.harbour = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.closed = Hotel.objects.create(name="Closed", slug="closed", is_active=False)
+        cls.room = make_room(cls.harbour, number="101")
+        cls.guest = User.objects.create_user("guest")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def numbers(self, response):
+        self.assertEqual(response.status_code, 200)
+        return {row["number"] for row in response.data}
+
+    def test_room_numbers_are_unique_per_hotel(self):
+        make_room(self.main, number="S-1")
+        make_room(self.harbour, number="S-1")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            make_room(self.harbour, number="S-1")
+
+    def test_lists_are_scoped_by_slug_or_header(self):
+        self.assertEqual(self.numbers(self.client.get("/api/rooms/", {"hotel": "harbour"})), {"101"})
+        self.assertEqual(self.numbers(self.client.get("/api/rooms/", headers={"X-Hotel": "harbour"})), {"101"})
+        # The default hotel when none is named
+        main_numbers = set(Room.objects.filter(hotel=self.main).values_list("number", flat=True))
+        self.assertEqual(self.numbers(self.client.get("/api/rooms/")), main_numbers)
+
+        self.assertEqual(self.client.get("/api/rooms/", {"hotel": "closed"}).status_code, 404)
+        self.assertEqual(self.client.get("/api/rooms/", {"hotel": "nowhere"}).status_code, 404)
+        self.assertEqual({hotel["slug"] for hotel in self.client.get("/api/hotels/").data}, {"main", "harbour"})
+
+    def test_bookings_take_their_hotel_from_the_room(self):
+        booking = make_booking(self.guest, self.room, in_days(5))
+        self.assertEqual(booking.hotel, self.harbour)
+
+        self.client.force_authenticate(self.guest)
+        self.assertEqual(len(self.client.get("/api/bookings/", {"hotel": "harbour"}).data["results"]), 1)
+        self.assertEqual(len(self.client.get("/api/bookings/", {"hotel": "main"}).data["results"]), 0)
+        # Guests see all their bookings unless they name a hotel
+        self.assertEqual(len(self.client.get("/api/bookings/").data["results"]), 1)
+
+    def test_cache_namespaces_are_per_hotel(self):
+        calls = []
+
+        def build(value):
+            calls.append(value)
+            return value
+
+        cached_for_hotel(self.main.id, "rooms", lambda: build("main"))
+        cached_for_hotel(self.harbour.id, "rooms", lambda: build("harbour"))
+        key = hotel_cache_key(self.main.id, "rooms")
+
+        invalidate_hotel_cache(self.harbour.id)
+        self.assertEqual(hotel_cache_key(self.main.id, "rooms"), key)
+        self.assertEqual(cached_for_hotel(self.main.id, "rooms", lambda: build("again")), "main")
+        self.assertEqual(cached_for_hotel(self.harbour.id, "rooms", lambda: build("rebuilt")), "rebuilt")
+        self.assertEqual(calls, ["main", "harbour", "rebuilt"])
+
+    def test_saves_invalidate_only_their_hotel(self):
+        self.numbers(self.client.get("/api/rooms/", {"hotel": "harbour"}))
+        self.numbers(self.client.get("/api/rooms/"))
+
+        make_room(self.harbour, number="102")
+        # Only the hotel lookup: the default hotel's list is still cached
+        with self.assertNumQueries(1):
+            self.client.get("/api/rooms/")
+        self.assertEqual(self.numbers(self.client.get("/api/rooms/", {"hotel": "harbour"})), {"101", "102"})
+
+        TeamMember.objects.create(hotel=self.main, name="Ana", role="Manager")
+        self.assertEqual(len(self.client.get("/api/team/").data), TeamMember.objects.filter(hotel=self.main).count())
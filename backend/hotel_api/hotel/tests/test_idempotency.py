@@ -0,0 +1,95 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hotel.idempotency import HEADER, REPLAYED_HEADER
+from hotel.models import Booking, Hotel, IdempotencyKey
+
+from .utils import in_days, make_room
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def register(self, key, password="secret-1"):
+        return self.client.post(
+            "/api/auth/register/",
+            {"username": "guest", "email": "guest@example.com", "password": password},
+            format="json",
+            headers={HEADER: key},
+        )
+
+    def test_replayed_sign_up_gets_fresh_tokens(self):
+        first = self.register("sign-up")
+        again = self.register("sign-up")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(again.status_code, 201)
+        self.assertEqual(again[REPLAYED_HEADER], "true")
+        self.assertEqual(again.data["user"]["id"], first.data["user"]["id"])
+        self.assertIn("access", again.data)
+        self.assertEqual(User.objects.filter(username="guest").count(), 1)
+        # Neither tokens nor the password are kept
+        record = IdempotencyKey.objects.get()
+        self.assertEqual(record.response, {"user": first.data["user"]["id"]})
+        self.assertNotIn("secret-1", json.dumps(record.response) + record.fingerprint)
+
+    def test_key_reused_for_another_request_is_422(self):
+        self.register("sign-up")
+        response = self.register("sign-up", password="secret-2")
+        self.assertEqual(response.status_code, 422)
+
+    def test_pending_key_is_409_until_it_times_out(self):
+        user = User.objects.create_user("booker", password="secret-1")
+        room = make_room(Hotel.objects.get(slug="main"), number="T1")
+        self.client.force_authenticate(user)
+        start = in_days(30)
+        payload = {"room": room.id, "check_in": start, "check_out": start + timedelta(days=2), "guests": 1}
+
+        def book():
+            return self.client.post("/api/bookings/", payload, format="json", headers={HEADER: "stay"})
+
+        self.assertEqual(book().status_code, 201)
+        # The first request died after claiming the key
+        Booking.objects.filter(user=user).delete()
+        IdempotencyKey.objects.update(status_code=None, response=None)
+        self.assertEqual(book().status_code, 409)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        response = book()
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(REPLAYED_HEADER, response)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
+        self.assertEqual(Booking.objects.filter(user=user).count(), 1)
+
+    def test_group_booking_is_replayed(self):
+        hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        for number in ("101", "102", "103"):
+            make_room(hotel, number=number)
+        user = User.objects.create_user("planner")
+        self.client.force_authenticate(user)
+        start = in_days(40)
+        payload = {
+            "hotel": hotel.id,
+            "rooms": 2,
+            "check_in": start,
+            "check_out": start + timedelta(days=2),
+            "guests": 1,
+        }
+
+        first = self.client.post("/api/bookings/group/", payload, format="json", headers={HEADER: "group"})
+        again = self.client.post("/api/bookings/group/", payload, format="json", headers={HEADER: "group"})
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(again.status_code, 201)
+        self.assertEqual(again[REPLAYED_HEADER], "true")
+        self.assertEqual([booking["id"] for booking in again.data], [booking["id"] for booking in first.data])
+        self.assertEqual(Booking.objects.filter(user=user).count(), 2)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
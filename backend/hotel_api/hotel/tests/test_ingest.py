@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from hotel.ingest import ContactMessageBuffer, _lock_path, _try_lock
+from hotel.models import ChangeEvent, ContactMessage, SearchDocument
+
+
+def record(subject):
+    return {"name": "Guest", "email": "guest@example.com", "subject": subject, "message": "Hello"}
+
+
+class ContactIngestTests(TestCase):
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.log_dir)
+
+    def buffer(self, **kwargs):
+        # Never start()ed: no background thread, the tests flush by hand
+        buffer = ContactMessageBuffer(log_dir=self.log_dir, **kwargs)
+        buffer.log_file = open(buffer._log_path("active"), "a", encoding="utf-8")
+        self.addCleanup(buffer.log_file.close)
+        return buffer
+
+    def leave_segment(self, pid, *subjects):
+        path = self.log_dir / f"contact-{pid}.flushing-1.ndjson"
+        path.write_text("".join(json.dumps(record(subject)) + "\n" for subject in subjects))
+        return path
+
+    def test_flush_writes_the_batch_at_once(self):
+        buffer = self.buffer(batch_size=3)
+        buffer.submit(record("one"))
+        buffer.submit(record("two"))
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(buffer.wakeup.is_set())
+
+        buffer.submit(record("three"))
+        self.assertTrue(buffer.wakeup.is_set())
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(5):
+            # One INSERT each for messages, search documents and feed events
+            self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(set(ContactMessage.objects.values_list("subject", flat=True)), {"one", "two", "three"})
+        self.assertEqual(SearchDocument.objects.filter(kind="message").count(), 3)
+        self.assertEqual(ChangeEvent.objects.filter(topic="message").count(), 3)
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_submissions_are_logged_until_flushed(self):
+        buffer = self.buffer()
+        buffer.submit(record("one"))
+        active = buffer._log_path("active")
+        self.assertEqual([json.loads(line)["subject"] for line in active.read_text().splitlines()], ["one"])
+
+        buffer.flush()
+        self.assertEqual(active.read_text(), "")
+        self.assertEqual(list(self.log_dir.glob("*.flushing-*")), [])
+
+    def test_failed_flush_keeps_the_batch_and_its_segment(self):
+        buffer = self.buffer()
+        buffer.submit(record("one"))
+
+        with mock.patch.object(ContactMessage.objects, "bulk_create", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                buffer.flush()
+        self.assertEqual(len(buffer.pending), 1)
+        self.assertEqual(len(list(self.log_dir.glob("*.flushing-*"))), 1)
+
+        buffer.submit(record("two"))
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(list(self.log_dir.glob("*.flushing-*")), [])
+
+    def test_replay_writes_segments_of_dead_processes(self):
+        dead = os.getpid() + 100000
+        segment = self.leave_segment(dead, "lost", "also lost")
+        _lock_path(self.log_dir, dead).touch()
+
+        self.assertEqual(ContactMessageBuffer(log_dir=self.log_dir).replay(), 2)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertFalse(segment.exists())
+        self.assertFalse(_lock_path(self.log_dir, dead).exists())
+
+    def test_replay_skips_processes_still_logging(self):
+        alive = os.getpid() + 100000
+        segment = self.leave_segment(alive, "in flight")
+        lock = _try_lock(_lock_path(self.log_dir, alive))
+        self.addCleanup(lock.close)
+
+        self.assertEqual(ContactMessageBuffer(log_dir=self.log_dir).replay(), 0)
+        self.assertTrue(segment.exists())
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_replay_command(self):
+        self.leave_segment(os.getpid() + 100000, "lost")
+        with override_settings(CONTACT_INGEST={"LOG_DIR": self.log_dir}):
+            call_command("replay_contact_log", stdout=open(os.devnull, "w"))
+        self.assertEqual(ContactMessage.objects.get().subject, "lost")
+
+
+class ContactEndpointTests(TestCase):
+    payload = record("Late arrival")
+
+    def setUp(self):
+        self.client = APIClient()
+        caches["throttle"].clear()
+
+    def post(self):
+        return self.client.post("/api/contact/", self.payload, format="json")
+
+    def test_buffered_submissions_are_accepted(self):
+        buffer = ContactMessageBuffer()
+        with mock.patch("hotel.views.get_buffer", return_value=buffer):
+            response = self.post()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(buffer.pending, [self.payload])
+        self.assertFalse(ContactMessage.objects.exists())
+
+    @override_settings(CONTACT_INGEST={"ENABLED": False})
+    def test_without_ingest_messages_are_written_directly(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ContactMessage.objects.get().subject, "Late arrival")
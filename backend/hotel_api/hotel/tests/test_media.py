@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.utils import timezone
+
+from hotel import media
+from hotel.models import Hotel, MediaBlob
+from hotel.storage import ContentAddressedFileSystemStorage
+
+from .utils import make_room
+
+
+class MediaRefcountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.storage = ContentAddressedFileSystemStorage(location=location)
+
+    def refcount(self, name):
+        return MediaBlob.objects.get(name=name).refcount
+
+    def test_rows_acquire_and_release_names(self):
+        first = make_room(self.hotel, number="101")
+        second = make_room(self.hotel, number="102")
+        for room in (first, second):
+            room.cover_image = "blobs/ab/cd/shared.jpg"
+            room.save()
+        self.assertEqual(self.refcount("blobs/ab/cd/shared.jpg"), 2)
+
+        first.cover_image = "blobs/ab/cd/other.jpg"
+        first.save()
+        self.assertEqual(self.refcount("blobs/ab/cd/shared.jpg"), 1)
+        self.assertEqual(self.refcount("blobs/ab/cd/other.jpg"), 1)
+
+        second.delete()
+        blob = MediaBlob.objects.get(name="blobs/ab/cd/shared.jpg")
+        self.assertEqual(blob.refcount, 0)
+        self.assertIsNotNone(blob.orphaned_at)
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save("a.jpg", ContentFile(b"photo"))
+        second = self.storage.save("b.jpg", ContentFile(b"photo"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(self.storage.save("c.jpg", ContentFile(b"other photo")), first)
+
+    def test_collect_orphans_keeps_referenced_and_recent_blobs(self):
+        orphan = self.storage.save("a.jpg", ContentFile(b"orphan"))
+        kept = self.storage.save("b.jpg", ContentFile(b"kept"))
+        recent = self.storage.save("c.jpg", ContentFile(b"recent"))
+        media.acquire([kept])
+        MediaBlob.objects.exclude(name=recent).update(orphaned_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(media.collect_orphans(storage=self.storage), [orphan])
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(kept))
+        self.assertTrue(self.storage.exists(recent))
+        self.assertFalse(MediaBlob.objects.filter(name=orphan).exists())
+
+        # Uploading the same content again writes the file back
+        self.assertEqual(self.storage.save("d.jpg", ContentFile(b"orphan")), orphan)
+        self.assertTrue(self.storage.exists(orphan))
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.models import ContactMessage, Hotel
+from hotel.overview import MOVEMENT_LIMIT, RECENT_LIMIT, build_admin_overview
+
+from .utils import in_days, make_booking, make_room
+
+
+class AdminOverviewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.other_hotel = Hotel.objects.create(name="Hillside", slug="hillside")
+        cls.guest = User.objects.create_user("guest")
+        cls.today = in_days(0)
+
+    def fill(self, hotel, rooms, first=100):
+        for number in range(rooms):
+            room = make_room(hotel, number=str(first + number), is_available=number % 4 != 0)
+            make_booking(self.guest, room, in_days(0), status="confirmed")
+            make_booking(self.guest, room, in_days(-2), status="confirmed")
+            make_booking(self.guest, room, in_days(5), status="cancelled")
+
+    def test_counts_and_lists_cover_the_hotel_only(self):
+        self.fill(self.hotel, 4)
+        self.fill(self.other_hotel, 2)
+        ContactMessage.objects.create(name="A", email="a@example.com", subject="Hi", message="Hello")
+
+        overview = build_admin_overview(self.hotel)
+        counts = overview["counts"]
+        self.assertEqual((counts["rooms"], counts["available_rooms"]), (4, 3))
+        self.assertEqual(counts["bookings"], 12)
+        self.assertEqual(counts["bookings_by_status"], {"pending": 0, "confirmed": 8, "cancelled": 4, "expired": 0})
+        self.assertEqual((counts["messages"], counts["unread_messages"]), (1, 1))
+        self.assertEqual(counts["in_house"], 4)
+        self.assertEqual(overview["arrivals"]["count"], 4)
+        self.assertEqual(overview["departures"]["count"], 4)
+        self.assertEqual([row["room_number"] for row in overview["arrivals"]["results"]], ["100", "101", "102", "103"])
+        self.assertEqual(len(overview["recent_bookings"]), RECENT_LIMIT)
+
+    def test_size_and_queries_dont_grow_with_the_tables(self):
+        self.fill(self.hotel, 2)
+        with self.assertNumQueries(13):
+            build_admin_overview(self.hotel)
+
+        self.fill(self.other_hotel, 5)
+        self.fill(self.hotel, MOVEMENT_LIMIT + 5, first=200)
+        with self.assertNumQueries(13):
+            overview = build_admin_overview(self.hotel)
+        self.assertEqual(overview["arrivals"]["count"], MOVEMENT_LIMIT + 7)
+        self.assertEqual(len(overview["arrivals"]["results"]), MOVEMENT_LIMIT)
+
+    def test_endpoint_is_admin_only_and_scoped_by_slug(self):
+        self.fill(self.other_hotel, 1)
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        self.assertEqual(client.get("/api/admin/overview/").status_code, 403)
+
+        client.force_authenticate(User.objects.create_user("boss", is_staff=True))
+        response = client.get("/api/admin/overview/", {"hotel": "hillside"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["hotel"], "hillside")
+        self.assertEqual(response.data["counts"]["rooms"], 1)
+        self.assertEqual(client.get("/api/admin/overview/", {"hotel": "nowhere"}).status_code, 404)
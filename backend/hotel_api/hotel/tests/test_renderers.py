@@ -0,0 +1,65 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from hotel import renderers
+from hotel.models import Hotel, Room
+from hotel.parsers import FastJSONParser
+from hotel.renderers import FastJSONRenderer
+from hotel.serializers import RoomSerializer
+
+from .utils import make_room
+
+RAW = {
+    "price": Decimal("120.50"),
+    "day": datetime.date(2026, 1, 2),
+    "at": datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+    "text": "caf\u00e9 \u2028 \u2029",
+    1: "non-str key",
+    "none": None,
+    "nested": [1, 2.5, {"ok": True}],
+}
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class RendererParityTests(TestCase):
+    def test_api_payload_is_byte_identical(self):
+        make_room(Hotel.objects.get(slug="main"), number="P1", description="Vue sur la mer\u2028")
+        data = RoomSerializer(Room.objects.all(), many=True).data
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = "application/json; indent=2"
+        self.assertEqual(FastJSONRenderer().render(data, indented), JSONRenderer().render(data, indented))
+
+    def test_python_types_render_like_the_stock_encoder(self):
+        self.assertEqual(FastJSONRenderer().render(RAW), JSONRenderer().render(RAW))
+
+    def test_fallback_without_orjson_is_the_stock_renderer(self):
+        fast = FastJSONRenderer().render(RAW)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(RAW), fast)
+            self.assertEqual(renderers.loads(renderers.dumps(RAW)), renderers.loads(fast))
+
+    def test_parser_matches_the_stock_parser(self):
+        body = JSONRenderer().render(RAW)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_benchmark_checks_parity(self):
+        out = io.StringIO()
+        call_command("bench_json", rows=50, repeat=1, stdout=out)
+        self.assertIn("FastJSONRenderer", out.getvalue())
+
+
+class EventStreamRendererTests(SimpleTestCase):
+    def test_errors_render_as_one_event(self):
+        body = renderers.EventStreamRenderer().render({"detail": "nope"})
+        self.assertEqual(body, b'event: error\ndata: {"detail":"nope"}\n\n')
@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from hotel.models import Hotel, Review, Room
+from hotel.reviews import reconcile
+
+from .utils import make_room
+
+
+class ReviewAggregateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel)
+        cls.other_room = make_room(cls.hotel, number="102")
+        cls.guests = [User.objects.create_user(f"guest{i}") for i in range(3)]
+
+    def assertAggregates(self, room, rating_sum, reviews_count, rating):
+        room.refresh_from_db()
+        self.assertEqual((room.rating_sum, room.reviews_count), (rating_sum, reviews_count))
+        self.assertEqual(room.rating, Decimal(rating))
+
+    def test_saves_and_deletes_adjust_the_totals(self):
+        first = Review.objects.create(room=self.room, user=self.guests[0], rating=4)
+        second = Review.objects.create(room=self.room, user=self.guests[1], rating=5)
+        self.assertAggregates(self.room, 9, 2, "4.5")
+
+        second.rating = 2
+        second.save()
+        self.assertAggregates(self.room, 6, 2, "3.0")
+
+        first.room = self.other_room
+        first.save()
+        self.assertAggregates(self.room, 2, 1, "2.0")
+        self.assertAggregates(self.other_room, 4, 1, "4.0")
+
+        second.delete()
+        self.assertAggregates(self.room, 0, 0, "0")
+
+    def test_reconcile_repairs_drifted_totals(self):
+        Review.objects.create(room=self.room, user=self.guests[0], rating=3)
+        Review.objects.create(room=self.room, user=self.guests[1], rating=4)
+        # A write that bypassed the signals
+        Room.objects.filter(pk=self.room.pk).update(rating_sum=0, reviews_count=0, rating=0)
+
+        self.assertGreaterEqual(reconcile(), 1)
+        self.assertAggregates(self.room, 7, 2, "3.5")
+        self.assertAggregates(self.other_room, 0, 0, "0")
+
+    def test_seeded_rating_is_kept_until_the_first_review(self):
+        seeded = make_room(self.hotel, number="103", rating=Decimal("4.5"))
+        # Totals left behind by a review removed without the signals
+        Room.objects.filter(pk=self.room.pk).update(rating_sum=3, reviews_count=1, rating=3)
+
+        self.assertEqual(reconcile(), 1)
+        self.assertAggregates(seeded, 0, 0, "4.5")
+        self.assertAggregates(self.room, 0, 0, "0")
+
+        Review.objects.create(room=seeded, user=self.guests[1], rating=2)
+        self.assertAggregates(seeded, 2, 1, "2.0")
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hotel import routers
+from hotel.models import Hotel
+
+from .utils import in_days, make_room
+
+
+# The test database stands in for a replica: routing is observed, not the data
+@override_settings(DATABASE_REPLICAS=["default"], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("guest")
+        cls.other = User.objects.create_user("other")
+
+    def setUp(self):
+        routers.get_sticky_cache().clear()
+        self.factory = RequestFactory()
+
+    def handle(self, request, write=False, user=None):
+        """Run `request` through the middleware; returns (response, read from primary)."""
+        seen = {}
+
+        def view(request):
+            seen["primary"] = routers._use_primary.get()
+            if write:
+                routers.PrimaryReplicaRouter().db_for_write(User)
+            request.user = user or AnonymousUser()
+            return HttpResponse()
+
+        response = routers.ReplicaRoutingMiddleware(view)(request)
+        return response, seen["primary"]
+
+    def bearer(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_safe_requests_read_from_replicas(self):
+        self.assertFalse(self.handle(self.factory.get("/api/rooms/"))[1])
+        self.assertTrue(self.handle(self.factory.post("/api/bookings/"))[1])
+
+    def test_writer_is_pinned_by_user_id(self):
+        self.handle(self.factory.post("/api/bookings/", **self.bearer(self.user)), write=True, user=self.user)
+
+        # No cookie: the SPA calls the API cross-origin
+        self.assertTrue(self.handle(self.factory.get("/api/bookings/", **self.bearer(self.user)))[1])
+        self.assertFalse(self.handle(self.factory.get("/api/bookings/", **self.bearer(self.other)))[1])
+        self.assertFalse(self.handle(self.factory.get("/api/bookings/"))[1])
+
+        routers.get_sticky_cache().delete(routers.STICKY_KEY.format(self.user.pk))
+        self.assertFalse(self.handle(self.factory.get("/api/bookings/", **self.bearer(self.user)))[1])
+
+    def test_anonymous_writer_is_pinned_by_cookie(self):
+        response, _ = self.handle(self.factory.post("/api/contact/"), write=True)
+        self.assertEqual(response.cookies[routers.STICKY_COOKIE]["max-age"], 5)
+
+        request = self.factory.get("/api/rooms/")
+        request.COOKIES[routers.STICKY_COOKIE] = "1"
+        self.assertTrue(self.handle(request)[1])
+
+    def test_bad_token_is_anonymous(self):
+        expired = AccessToken.for_user(self.user)
+        expired.set_exp(lifetime=-timedelta(minutes=1))
+        for header in ("Bearer not-a-token", f"Bearer {expired}", "Bearer two parts"):
+            self.assertIsNone(routers.token_user_id(self.factory.get("/", HTTP_AUTHORIZATION=header)), header)
+        self.assertEqual(routers.token_user_id(self.factory.get("/", **self.bearer(self.user))), str(self.user.pk))
+
+    def test_api_write_pins_the_user(self):
+        room = make_room(Hotel.objects.get(slug="main"), number="R1")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        start = in_days(20)
+        payload = {"room": room.id, "check_in": start, "check_out": start + timedelta(days=2), "guests": 1}
+
+        self.assertEqual(client.post("/api/bookings/", payload, format="json").status_code, 201)
+        self.assertTrue(routers.get_sticky_cache().get(routers.STICKY_KEY.format(self.user.pk)))
@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.models import ContactMessage, Hotel, Room, SearchDocument
+from hotel.search import search
+
+from .utils import make_room
+
+
+def message(subject, body):
+    return ContactMessage.objects.create(name="Guest", email="guest@example.com", subject=subject, message=body)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.hotel = Hotel.objects.get(slug="main")
+
+    def get(self, **params):
+        response = self.client.get("/api/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [(hit["kind"], hit["id"]) for hit in response.data["results"]]
+
+    def test_migration_indexed_the_seeded_rooms(self):
+        self.assertTrue(Room.objects.exists())
+        self.assertEqual(
+            set(SearchDocument.objects.filter(kind="room").values_list("object_id", flat=True)),
+            set(Room.objects.values_list("id", flat=True)),
+        )
+
+    def test_title_matches_rank_above_body_matches(self):
+        in_body = message("Question", "Is the lagoon heated in winter?")
+        in_title = message("Lagoon", "Hello there")
+
+        hits = search("lagoon", ["message"])
+
+        self.assertEqual([hit["id"] for hit in hits], [in_title.id, in_body.id])
+        self.assertLess(hits[0]["rank"], hits[1]["rank"])
+
+    def test_last_term_is_a_prefix_and_every_term_must_match(self):
+        room = make_room(self.hotel, number="S1", description="Quiet lagoon suite")
+        make_room(self.hotel, number="S2", description="Lagoon side, noisy")
+
+        self.assertEqual(self.get(q="quiet lago"), [("room", room.id)])
+
+    def test_fts_syntax_in_the_query_is_treated_as_text(self):
+        room = make_room(self.hotel, number="S1", description="Lagoon view")
+        self.assertEqual(self.get(q='lagoon" OR NEAR(x'), [])
+        self.assertEqual(self.get(q="lagoon*"), [("room", room.id)])
+
+    def test_messages_are_only_searchable_by_staff(self):
+        found = message("Lagoon", "Hello")
+        room = make_room(self.hotel, number="S1", description="Lagoon view")
+
+        self.assertEqual(self.get(q="lagoon"), [("room", room.id)])
+        self.assertEqual(self.get(q="lagoon", type="message"), [])
+
+        self.client.force_authenticate(User.objects.create_user("boss", is_staff=True))
+        self.assertEqual(set(self.get(q="lagoon")), {("room", room.id), ("message", found.id)})
+        self.assertEqual(self.get(q="lagoon", type="message"), [("message", found.id)])
+
+    def test_index_follows_saves_and_deletes(self):
+        room = make_room(self.hotel, number="S1", description="Garden view")
+        self.assertEqual(self.get(q="lagoon"), [])
+
+        room.description = "Lagoon view"
+        room.save()
+        self.assertEqual(self.get(q="lagoon"), [("room", room.id)])
+        self.assertEqual(self.get(q="garden"), [])
+
+        room.delete()
+        self.assertEqual(self.get(q="lagoon"), [])
@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from hotel.serving import IMMUTABLE_MAX_AGE, parse_range
+
+CONTENT = bytes(range(256)) * 4
+HASH = "0123456789abcdef"
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1024), (0, 99))
+        self.assertEqual(parse_range("bytes=1000-", 1024), (1000, 1023))
+        self.assertEqual(parse_range("bytes=1000-5000", 1024), (1000, 1023))
+        self.assertEqual(parse_range("bytes=-24", 1024), (1000, 1023))
+        self.assertEqual(parse_range("bytes=-5000", 1024), (0, 1023))
+
+    def test_ignored_and_unsatisfiable(self):
+        for header in (None, "", "bytes=-", "items=0-9", "bytes=0-9,20-29"):
+            self.assertIsNone(parse_range(header, 1024), header)
+        for header in ("bytes=1024-", "bytes=10-5", "bytes=-0"):
+            self.assertIs(parse_range(header, 1024), False, header)
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        (root / "blobs" / "01" / "23").mkdir(parents=True)
+        (root / "blobs" / "01" / "23" / f"{HASH}.bin").write_bytes(CONTENT)
+        (root / "rooms").mkdir()
+        (root / "rooms" / "plan.bin").write_bytes(CONTENT)
+        settings = override_settings(MEDIA_ROOT=root, MEDIA_SENDFILE=None, MEDIA_MAX_AGE=600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get(self, name, **headers):
+        return self.client.get(f"/media/{name}", headers=headers)
+
+    def test_blob_is_immutable_with_hash_etag(self):
+        response = self.get(f"blobs/01/23/{HASH}.bin")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["ETag"], f'"{HASH}"')
+        self.assertEqual(response["Cache-Control"], f"public, max-age={IMMUTABLE_MAX_AGE}, immutable")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_other_files_use_media_max_age(self):
+        response = self.get("rooms/plan.bin")
+        self.assertEqual(response["Cache-Control"], "public, max-age=600")
+
+    def test_conditional_requests_get_304(self):
+        first = self.get("rooms/plan.bin")
+        by_etag = self.get("rooms/plan.bin", if_none_match=first["ETag"])
+        by_date = self.get("rooms/plan.bin", if_modified_since=first["Last-Modified"])
+        stale = self.get("rooms/plan.bin", if_none_match='"something-else"')
+
+        self.assertEqual(by_etag.status_code, 304)
+        self.assertEqual(by_etag["ETag"], first["ETag"])
+        self.assertEqual(by_etag["Cache-Control"], "public, max-age=600")
+        self.assertEqual(by_etag.content, b"")
+        self.assertEqual(by_date.status_code, 304)
+        self.assertEqual(stale.status_code, 200)
+
+    def test_range_gets_206(self):
+        response = self.get("rooms/plan.bin", range="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[100:200])
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "100")
+
+        suffix = self.get("rooms/plan.bin", range="bytes=-10")
+        self.assertEqual(b"".join(suffix.streaming_content), CONTENT[-10:])
+
+    def test_unsatisfiable_range_gets_416(self):
+        response = self.get("rooms/plan.bin", range=f"bytes={len(CONTENT)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_stale_if_range_sends_whole_file(self):
+        etag = self.get("rooms/plan.bin")["ETag"]
+        current = self.get("rooms/plan.bin", range="bytes=0-9", if_range=etag)
+        stale = self.get("rooms/plan.bin", range="bytes=0-9", if_range='"old"')
+
+        self.assertEqual(current.status_code, 206)
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(b"".join(stale.streaming_content), CONTENT)
+
+    def test_offload_sends_headers_only(self):
+        with self.settings(MEDIA_SENDFILE="x-accel-redirect", MEDIA_ACCEL_PREFIX="/protected-media/"):
+            response = self.get("rooms/plan.bin", range="bytes=0-9")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/rooms/plan.bin")
+        self.assertEqual(response.content, b"")
+
+    def test_missing_files_are_404(self):
+        self.assertEqual(self.get("rooms/missing.bin").status_code, 404)
+        self.assertEqual(self.client.post("/media/rooms/plan.bin").status_code, 405)
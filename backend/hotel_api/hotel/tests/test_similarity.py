@@ -0,0 +1,130 @@
+import importlib
+from unittest import mock
+
+from django.apps import apps
+from django.test import TestCase
+
+from hotel import similarity
+from hotel.models import Hotel, Room, RoomNeighbour
+
+from .utils import make_room
+
+ROOM_TYPES = ("single", "double", "suite")
+VIEWS = ("City View", "Sea View", "Garden View")
+AMENITIES = (["WiFi"], ["WiFi", "TV"], ["WiFi", "Minibar", "Bathtub"], [])
+
+
+def neighbour_lists(hotel):
+    lists = {}
+    for room_id, neighbour_id in RoomNeighbour.objects.filter(room__hotel=hotel).values_list("room", "neighbour"):
+        lists.setdefault(room_id, []).append(neighbour_id)
+    return lists
+
+
+class SimilarRoomsTests(TestCase):
+    def setUp(self):
+        self.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rooms = [
+                make_room(
+                    self.hotel,
+                    number=str(100 + n),
+                    room_type=ROOM_TYPES[n % 3],
+                    price=str(80 + 20 * n),
+                    capacity=1 + n % 4,
+                    floor=1 + n % 5,
+                    view=VIEWS[n % 3],
+                    amenities=AMENITIES[n % 4],
+                )
+                for n in range(12)
+            ]
+
+    def assertUpToDate(self):
+        """The stored lists are what a full rebuild computes."""
+        self.assertEqual(similarity.rebuild_hotel(self.hotel.id), 0)
+
+    def test_rooms_get_k_neighbours_in_their_hotel(self):
+        lists = neighbour_lists(self.hotel)
+        self.assertEqual(set(lists), {room.id for room in self.rooms})
+        self.assertTrue(all(len(found) == 6 for found in lists.values()))
+        self.assertUpToDate()
+
+    def test_change_inside_the_ranges_is_incremental(self):
+        room = self.rooms[5]
+        room.amenities = ["Minibar", "Bathtub"]
+        room.view = "Mountain View"
+        with mock.patch.object(similarity, "rebuild_hotel", wraps=similarity.rebuild_hotel) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                room.save()
+        rebuild.assert_not_called()
+        self.assertUpToDate()
+
+    def test_change_of_the_ranges_rebuilds_the_hotel(self):
+        room = self.rooms[0]
+        room.price_per_night = 999
+        with mock.patch.object(similarity, "rebuild_hotel", wraps=similarity.rebuild_hotel) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                room.save()
+        rebuild.assert_called_once_with(self.hotel.id, 6)
+        self.assertUpToDate()
+
+    def test_only_affected_lists_are_recomputed(self):
+        room = self.rooms[4]
+        before = {field: getattr(room, field) for field in similarity.FEATURE_FIELDS}
+        Room.objects.filter(pk=room.pk).update(amenities=["WiFi", "TV", "Minibar"])
+        holders = set(RoomNeighbour.objects.filter(neighbour=room).values_list("room", flat=True))
+
+        with mock.patch.object(similarity, "nearest", wraps=similarity.nearest) as nearest:
+            similarity.refresh_room(self.hotel.id, room.id, before)
+        recomputed = {self.rooms[i].id for i in nearest.call_args.args[2]}
+        self.assertIn(room.id, recomputed)
+        self.assertLessEqual(holders, recomputed)
+        self.assertLess(len(recomputed), len(self.rooms))
+        self.assertUpToDate()
+
+    def test_pure_python_matches_numpy(self):
+        vectors = similarity.feature_vectors(self.rooms)
+        expected = similarity.nearest(vectors, 6, [0, 5, 11]), similarity.distances_from(vectors, 5)
+        with mock.patch.object(similarity, "np", None):
+            found = similarity.nearest(vectors, 6, [0, 5, 11]), similarity.distances_from(vectors, 5)
+
+        for ours, theirs in zip(expected[0], found[0]):
+            self.assertEqual([j for j, _ in ours], [j for j, _ in theirs])
+            self.assertEqual([round(d, 9) for _, d in ours], [round(d, 9) for _, d in theirs])
+        self.assertEqual([round(d, 9) for d in expected[1]], [round(d, 9) for d in found[1]])
+
+    def test_delete_and_move(self):
+        other = Hotel.objects.create(name="Lakeside", slug="lakeside")
+        make_room(other, number="1")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rooms[3].delete()
+            moved = self.rooms[7]
+            moved.hotel = other
+            moved.save()
+
+        lists = neighbour_lists(self.hotel)
+        self.assertEqual(len(lists), 10)
+        self.assertTrue(all(len(found) == 6 for found in lists.values()))
+        self.assertNotIn(moved.id, {n for found in lists.values() for n in found})
+        self.assertUpToDate()
+        self.assertEqual(similarity.rebuild_hotel(other.id), 0)
+        self.assertEqual(len(neighbour_lists(other)[moved.id]), 1)
+
+    def test_unavailable_rooms_are_not_suggested(self):
+        room = self.rooms[0]
+        closest = RoomNeighbour.objects.get(room=room, rank=1).neighbour
+        Room.objects.filter(pk=closest.pk).update(is_available=False)
+
+        response = self.client.get(f"/api/rooms/{room.id}/similar/", {"fields": "id"})
+        self.assertEqual(response.status_code, 200)
+        ids = [row["id"] for row in response.json()]
+        self.assertEqual(len(ids), 5)
+        self.assertNotIn(closest.id, ids)
+
+    def test_migration_backfill_matches_the_live_code(self):
+        migration = importlib.import_module("hotel.migrations.0030_backfill_room_neighbours")
+        RoomNeighbour.objects.all().delete()
+
+        migration.backfill_room_neighbours(apps, None)
+        self.assertTrue(all(len(found) == 6 for found in neighbour_lists(self.hotel).values()))
+        self.assertUpToDate()
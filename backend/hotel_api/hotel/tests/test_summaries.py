@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.bookings import reserve_group, transition
+from hotel.models import Hotel, Room
+from hotel.summaries import get_booking_summary
+
+from .utils import in_days, make_booking, make_room
+
+
+class BookingSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel, price="100.00")
+        cls.other_room = make_room(cls.hotel, number="102", price="80.00")
+        cls.guest = User.objects.create_user("guest")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_totals_use_the_booked_rates(self):
+        make_booking(self.guest, self.room, in_days(-10), nights=3, status="confirmed")
+        make_booking(self.guest, self.other_room, in_days(5), nights=2)
+        make_booking(self.guest, self.room, in_days(20), status="cancelled")
+        Room.objects.filter(pk=self.room.pk).update(price_per_night=500)
+
+        summary = get_booking_summary(self.guest)
+        self.assertEqual(summary["total_bookings"], 2)
+        self.assertEqual(summary["total_nights"], 5)
+        self.assertEqual(summary["total_spend"], "460.00")
+        self.assertEqual(summary["upcoming_count"], 1)
+        self.assertEqual(summary["last_stay"]["room"], self.room.id)
+
+    def test_summary_is_cached_until_a_booking_changes(self):
+        get_booking_summary(self.guest)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_booking_summary(self.guest)["total_bookings"], 0)
+
+        booking = make_booking(self.guest, self.room, in_days(5))
+        self.assertEqual(get_booking_summary(self.guest)["total_bookings"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(booking, "cancelled")
+        self.assertEqual(get_booking_summary(self.guest)["total_bookings"], 0)
+
+        reserve_group(self.guest, self.hotel, 2, in_days(30), in_days(32), 1)
+        self.assertEqual(get_booking_summary(self.guest)["total_bookings"], 2)
+
+        self.guest.bookings.filter(status="pending").first().delete()
+        self.assertEqual(get_booking_summary(self.guest)["total_bookings"], 1)
+
+    def test_other_users_keep_their_cached_summary(self):
+        other = User.objects.create_user("other")
+        get_booking_summary(other)
+        make_booking(self.guest, self.room, in_days(5))
+        with self.assertNumQueries(0):
+            get_booking_summary(other)
+
+    def test_endpoint(self):
+        make_booking(self.guest, self.room, in_days(5), nights=1)
+        client = APIClient()
+        self.assertEqual(client.get("/api/auth/me/summary/").status_code, 401)
+
+        client.force_authenticate(self.guest)
+        response = client.get("/api/auth/me/summary/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_spend"], "100.00")
+        self.assertEqual(response.data["upcoming"][0]["check_in"], in_days(5))
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from hotel import throttling
+from hotel.throttling import IPTokenBucketThrottle, TokenBucketThrottle, parse_rate
+
+RATES = {"DEFAULT_THROTTLE_RATES": {"probe": "2/min", "broken": "2/fortnight"}}
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def login(self, username, ip):
+        # Unknown accounts fail validation (400) once past the throttles
+        return self.client.post(
+            "/api/auth/login/", {"username": username, "password": "wrong"}, format="json", REMOTE_ADDR=ip
+        )
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("20/min"), (20, 20 / 60))
+        self.assertEqual(parse_rate("10/ hour"), (10, 10 / 3600))
+
+    def test_account_bucket_rejects_across_ips(self):
+        # login_account is 5/min
+        for attempt in range(5):
+            self.assertEqual(self.login("victim", f"10.0.0.{attempt}").status_code, 400)
+
+        response = self.login("VICTIM ", "10.0.0.99")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertEqual(self.login("someone-else", "10.0.0.99").status_code, 400)
+
+    def test_ip_bucket_rejects_across_accounts(self):
+        # login is 20/min per IP
+        for attempt in range(20):
+            self.assertEqual(self.login(f"user{attempt}", "10.0.0.1").status_code, 400)
+        self.assertEqual(self.login("fresh", "10.0.0.1").status_code, 429)
+        self.assertEqual(self.login("fresh", "10.0.0.2").status_code, 400)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch.object(throttling.time, "time", return_value=1000.0) as clock:
+            for attempt in range(5):
+                self.login("victim", "10.0.0.1")
+            self.assertEqual(self.login("victim", "10.0.0.1").status_code, 429)
+
+            # 5/min refills a token every 12 seconds
+            clock.return_value = 1013.0
+            self.assertEqual(self.login("victim", "10.0.0.1").status_code, 400)
+            self.assertEqual(self.login("victim", "10.0.0.1").status_code, 429)
+
+
+@override_settings(REST_FRAMEWORK=RATES)
+class BaseThrottleTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+
+    def request(self, user=None, ip="10.0.0.1"):
+        request = APIRequestFactory().get("/", REMOTE_ADDR=ip)
+        request.user = user or AnonymousUser()
+        return request
+
+    def allowed(self, throttle, request, scope="probe"):
+        return throttle.allow_request(request, SimpleNamespace(throttle_scope=scope))
+
+    def test_default_key_is_the_user_or_the_ip(self):
+        throttle = TokenBucketThrottle()
+        user = User.objects.create_user("guest")
+
+        self.assertEqual(throttle.get_cache_key(self.request(user), None, "probe"), f"throttle:probe:user:{user.pk}")
+        self.assertEqual(throttle.get_cache_key(self.request(), None, "probe"), "throttle:probe:ip:10.0.0.1")
+
+        # A signed-in user keeps their bucket when their IP changes
+        self.assertTrue(self.allowed(throttle, self.request(user, "10.0.0.1")))
+        self.assertTrue(self.allowed(throttle, self.request(user, "10.0.0.2")))
+        self.assertFalse(self.allowed(throttle, self.request(user, "10.0.0.3")))
+        self.assertTrue(self.allowed(throttle, self.request(ip="10.0.0.3")))
+
+    def test_ip_throttle_ignores_the_user(self):
+        throttle = IPTokenBucketThrottle()
+        self.assertEqual(
+            throttle.get_cache_key(self.request(User.objects.create_user("guest")), None, "probe"),
+            "throttle:probe:ip:10.0.0.1",
+        )
+
+    def test_unscoped_views_are_not_throttled(self):
+        throttle = TokenBucketThrottle()
+        for _ in range(5):
+            self.assertTrue(self.allowed(throttle, self.request(), scope=None))
+            self.assertTrue(self.allowed(throttle, self.request(), scope="unknown"))
+
+    def test_invalid_rate_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.allowed(TokenBucketThrottle(), self.request(), scope="broken")
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from hotel.bookings import InvalidTransition, expire_stale_holds, transition
+from hotel.models import Hotel, WaitlistEntry
+from hotel.waitlist import accept_offer
+
+from .utils import age, in_days, make_booking, make_room
+
+
+class WaitlistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(name="Harbour", slug="harbour")
+        cls.room = make_room(cls.hotel)
+        cls.owner, cls.first, cls.second = (User.objects.create_user(name) for name in ("owner", "first", "second"))
+        cls.start = in_days(20)
+
+    def setUp(self):
+        self.booking = make_booking(self.owner, self.room, self.start, status="confirmed")
+        self.entries = [
+            WaitlistEntry.objects.create(
+                hotel=self.hotel,
+                user=user,
+                room_type="double",
+                check_in=self.start,
+                check_out=self.start + timedelta(days=2),
+                guests=1,
+            )
+            for user in (self.first, self.second)
+        ]
+
+    def test_cancellation_offers_the_nights_to_the_first_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(self.booking, "cancelled")
+
+        first, second = (WaitlistEntry.objects.get(pk=entry.pk) for entry in self.entries)
+        self.assertEqual(first.status, "offered")
+        self.assertEqual(second.status, "waiting")
+        offer = first.booking
+        self.assertEqual((offer.user, offer.room, offer.status), (self.first, self.room, "pending"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            accept_offer(first)
+        first.refresh_from_db()
+        self.assertEqual(first.status, "booked")
+        self.assertEqual(first.booking.status, "confirmed")
+
+    def test_lapsed_offer_goes_to_the_next_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            transition(self.booking, "cancelled")
+        offered = WaitlistEntry.objects.get(pk=self.entries[0].pk).booking
+        age(offered, timedelta(hours=2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expire_stale_holds()
+
+        first, second = (WaitlistEntry.objects.get(pk=entry.pk) for entry in self.entries)
+        self.assertEqual(first.status, "lapsed")
+        self.assertEqual(second.status, "offered")
+        self.assertEqual(second.booking.user, self.second)
+        with self.assertRaises(InvalidTransition):
+            accept_offer(first)
+
+    def test_accept_endpoint_needs_an_offer(self):
+        client = APIClient()
+        client.force_authenticate(self.first)
+        response = client.post(f"/api/waitlist/{self.entries[0].pk}/accept/")
+        self.assertEqual(response.status_code, 409)
+
+
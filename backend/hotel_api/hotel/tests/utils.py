@@ -0,0 +1,34 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from hotel.models import Booking, Room
+
+
+def make_room(hotel, number="101", room_type="double", price="100.00", capacity=2, **fields):
+    return Room.objects.create(
+        hotel=hotel, number=number, room_type=room_type, price_per_night=Decimal(price), capacity=capacity, **fields
+    )
+
+
+def make_booking(user, room, start, nights=2, status="pending", **fields):
+    return Booking.objects.create(
+        user=user,
+        room=room,
+        check_in=start,
+        check_out=start + timedelta(days=nights),
+        guests=1,
+        status=status,
+        **fields,
+    )
+
+
+def age(booking, delta):
+    """Pretend `booking` was made `delta` ago."""
+    Booking.objects.filter(pk=booking.pk).update(created_at=timezone.now() - delta)
+    booking.refresh_from_db()
+
+
+def in_days(days):
+    return timezone.localdate() + timedelta(days=days)
@@ -0,0 +1,112 @@
+"""
+Token-bucket throttles for the public write endpoints (contact form,
+registration, login).
+
+Buckets live in the "throttle" cache so every worker sharing that cache
+shares the limits. Throttles run before the view handler, so a rejected
+request never reaches the serializer: no DB query, no password hashing.
+"""
+import hashlib
+import math
+import time
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+def parse_rate(rate):
+    """
+    "20/min" -> (capacity 20, refill 20/60 tokens per second).
+    """
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period.strip().lower()]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Allows bursts up to the bucket capacity, then one request per
+    refill interval. The rate is looked up in DEFAULT_THROTTLE_RATES as
+    `<view.throttle_scope><rate_suffix>`; views without a scope or rate
+    are not throttled. Like DRF's ScopedRateThrottle, there is one bucket
+    per signed-in user, or per client IP for anonymous requests; subclasses
+    override get_cache_key to pick another identity.
+    """
+
+    cache_alias = "throttle"
+    rate_suffix = ""
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_cache_key(self, request, view, scope):
+        """
+        The bucket's cache key, or None to let the request through.
+        """
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"throttle:{scope}:user:{user.pk}"
+        return f"throttle:{scope}:ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}{self.rate_suffix}") if scope else None
+        if not rate:
+            return True
+        try:
+            capacity, refill = parse_rate(rate)
+        except (KeyError, ValueError):
+            raise ImproperlyConfigured(f"Invalid throttle rate {rate!r} for scope {scope!r}")
+
+        key = self.get_cache_key(request, view, scope)
+        if key is None:
+            return True
+
+        cache = caches[self.cache_alias]
+        now = time.time()
+        tokens, stamp = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * refill)
+
+        if tokens < 1:
+            # Rejections don't write, so a flood only costs a cache read.
+            self.wait_seconds = (1 - tokens) / refill
+            return False
+
+        # get/set isn't atomic, so concurrent bursts may slip a token or
+        # two past the limit; good enough for abuse throttling.
+        cache.set(key, (tokens - 1, now), math.ceil(capacity / refill))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per client IP (see NUM_PROXIES for X-Forwarded-For handling).
+    """
+
+    def get_cache_key(self, request, view, scope):
+        return f"throttle:{scope}:ip:{self.get_ident(request)}"
+
+
+class AccountTokenBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per submitted account (username or email), so credential
+    stuffing against a single account is limited across all IPs.
+    """
+
+    rate_suffix = "_account"
+    account_fields = ("username", "email")
+
+    def get_cache_key(self, request, view, scope):
+        for field in self.account_fields:
+            value = request.data.get(field) if hasattr(request.data, "get") else None
+            if isinstance(value, str) and value.strip():
+                account = hashlib.sha1(value.strip().lower().encode()).hexdigest()
+                return f"throttle:{scope}:account:{account}"
+        return None
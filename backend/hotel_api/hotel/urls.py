@@ -3,20 +3,43 @@ from .views import (
     RegisterView,
     CustomTokenObtainPairView,
     MeView,
+    MeSummaryView,
     CustomTokenRefreshView,
+    HotelListView,
     RoomListCreateView,
     RoomDetailView,
     BookingListCreateView,
     BookingDetailView,
+    BookingConfirmView,
+    GroupBookingView,
+    ArchivedBookingListView,
     TeamMemberListView,
     GalleryImageListView,
     GalleryImageAdminViewSet,
     RoomAdminViewSet,
     BookingAdminViewSet,
+    AdminOverviewView,
+    AriDeltaView,
+    AriSnapshotView,
+    ForecastView,
+    FrontDeskListView,
+    NightAuditView,
     UserAdminViewSet,
     TeamMemberAdminViewSet,
     ContactMessageCreateView,
     ContactMessageAdminViewSet,
+    SearchView,
+    ArchivedBookingAdminViewSet,
+    ArchivedContactMessageAdminViewSet,
+    ChangeFeedView,
+    BatchView,
+    RoomReviewListView,
+    SimilarRoomsView,
+    ReviewListCreateView,
+    ReviewDetailView,
+    WaitlistListCreateView,
+    WaitlistDetailView,
+    WaitlistAcceptView,
 )
 from rest_framework.routers import DefaultRouter
 
@@ -27,6 +50,8 @@ router.register(r"admin/bookings", BookingAdminViewSet, basename="admin-bookings
 router.register(r"admin/users", UserAdminViewSet, basename="admin-users")
 router.register(r"admin/team", TeamMemberAdminViewSet, basename="admin-team")
 router.register(r"admin/messages", ContactMessageAdminViewSet, basename="admin-messages")
+router.register(r"admin/archive/bookings", ArchivedBookingAdminViewSet, basename="admin-archived-bookings")
+router.register(r"admin/archive/messages", ArchivedContactMessageAdminViewSet, basename="admin-archived-messages")
 
 urlpatterns = [
     # Auth
@@ -34,14 +59,30 @@ urlpatterns = [
     path('auth/login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('auth/me/', MeView.as_view(), name='me'),
+    path('auth/me/summary/', MeSummaryView.as_view(), name='me-summary'),
+
+    # Hotels
+    path('hotels/', HotelListView.as_view(), name='hotels'),
 
     # Rooms
     path('rooms/', RoomListCreateView.as_view(), name='rooms'),
     path('rooms/<int:pk>/', RoomDetailView.as_view(), name='room-detail'),
+    path('rooms/<int:pk>/reviews/', RoomReviewListView.as_view(), name='room-reviews'),
+    path('rooms/<int:pk>/similar/', SimilarRoomsView.as_view(), name='room-similar'),
 
     # Bookings / Reservations
     path('bookings/', BookingListCreateView.as_view(), name='bookings'),
+    path('bookings/group/', GroupBookingView.as_view(), name='booking-group'),
+    path('bookings/archived/', ArchivedBookingListView.as_view(), name='booking-archived'),
     path('bookings/<int:pk>/', BookingDetailView.as_view(), name='booking-detail'),
+    path('bookings/<int:pk>/confirm/', BookingConfirmView.as_view(), name='booking-confirm'),
+
+    # Reviews
+    path('reviews/', ReviewListCreateView.as_view(), name='reviews'),
+    path('reviews/<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
+    path('waitlist/', WaitlistListCreateView.as_view(), name='waitlist'),
+    path('waitlist/<int:pk>/', WaitlistDetailView.as_view(), name='waitlist-detail'),
+    path('waitlist/<int:pk>/accept/', WaitlistAcceptView.as_view(), name='waitlist-accept'),
 
     # About / Team
     path('team/', TeamMemberListView.as_view(), name='team'),
@@ -51,6 +92,25 @@ urlpatterns = [
 
     # Contact
     path('contact/', ContactMessageCreateView.as_view(), name='contact'),
+
+    # Search
+    path('search/', SearchView.as_view(), name='search'),
+
+    # Change feed (JSON or Server-Sent Events)
+    path('changes/', ChangeFeedView.as_view(), name='changes'),
+
+    # Several calls in one round trip
+    path('batch/', BatchView.as_view(), name='batch'),
+
+    # Admin dashboard
+    path('admin/overview/', AdminOverviewView.as_view(), name='admin-overview'),
+    path('admin/forecast/', ForecastView.as_view(), name='admin-forecast'),
+    path('admin/ari/changes/', AriDeltaView.as_view(), name='ari-changes'),
+    path('admin/ari/snapshot/', AriSnapshotView.as_view(), name='ari-snapshot'),
+
+    # Front desk
+    path('admin/frontdesk/night-audit/', NightAuditView.as_view(), name='night-audit'),
+    path('admin/frontdesk/<slug:movement>/', FrontDeskListView.as_view(), name='frontdesk'),
 ]
 
 urlpatterns += router.urls
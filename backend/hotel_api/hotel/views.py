@@ -1,6 +1,13 @@
+import os
+from datetime import date
+
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.http import http_date
 from rest_framework import generics, permissions, status, parsers, mixins, viewsets
-from rest_framework.parsers import JSONParser
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
@@ -16,33 +23,98 @@ from .serializers import (
     GalleryImageSerializer,
     AdminBookingSerializer,
     ContactMessageSerializer,
+    GroupBookingSerializer,
+    FrontDeskBookingSerializer,
+    HotelSerializer,
+    ArchivedBookingSerializer,
+    ArchivedContactMessageSerializer,
+    BatchSerializer,
+    ReviewSerializer,
+    WaitlistEntrySerializer,
+    issue_tokens,
+)
+from .models import (
+    ArchivedBooking,
+    ArchivedContactMessage,
+    Booking,
+    ContactMessage,
+    GalleryImage,
+    Hotel,
+    Review,
+    Room,
+    SearchDocument,
+    TeamMember,
+    WaitlistEntry,
 )
-from .models import Room, Booking, TeamMember, GalleryImage, ContactMessage
+from .ari import read_deltas, snapshot_path
+from .batch import run_batch
+from .bookings import InvalidTransition, RoomsUnavailable, overlapping, reserve_group, transition
+from .fieldsets import FIELDS_PARAM, OMIT_PARAM, SparseFieldsetViewMixin
+from .feed import PUBLIC_TOPICS, STAFF_TOPICS, event_stream, read_changes
+from .forecast import get_forecast
+from .frontdesk import (
+    MOVEMENTS,
+    CheckInError,
+    mark_checked_in,
+    movement_queryset,
+    night_audit_response,
+    parse_day,
+)
+from .hotels import HotelScopedMixin, cached_for_hotel, resolve_hotel
+from .idempotency import IdempotentMixin, idempotent
+from .ingest import get_buffer
+from .overview import build_admin_overview
+from .pagination import ArchivePagination, BookingHistoryPagination, FrontDeskPagination, ReviewPagination
+from .parsers import FastJSONParser
+from .renderers import EventStreamRenderer, FastJSONRenderer
+from .search import search
+from .streaming import StreamingExportMixin
+from .summaries import get_booking_summary
+from .throttling import AccountTokenBucketThrottle, IPTokenBucketThrottle
+from .waitlist import accept_offer
+
+
+def filter_check_in(queryset, params):
+    """Apply ?check_in_after= / ?check_in_before= (YYYY-MM-DD) bounds."""
+    try:
+        if params.get("check_in_after"):
+            queryset = queryset.filter(check_in__gte=date.fromisoformat(params["check_in_after"]))
+        if params.get("check_in_before"):
+            queryset = queryset.filter(check_in__lt=date.fromisoformat(params["check_in_before"]))
+    except ValueError:
+        raise ValidationError("Dates must be in YYYY-MM-DD format.")
+    return queryset
 
 
 # ---------- AUTH VIEWS ----------
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(IdempotentMixin, generics.CreateAPIView):
     """
     POST /api/auth/register/
+    Honours Idempotency-Key: a retried sign-up gets fresh tokens for the
+    account the first request created (tokens themselves aren't stored).
     """
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, AccountTokenBucketThrottle]
+    throttle_scope = "register"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
+        # Tokens for immediate login after signup
+        return Response(issue_tokens(user), status=status.HTTP_201_CREATED)
 
-        # Generate tokens for immediate login after signup
-        token_serializer = CustomTokenObtainPairSerializer(
-            data={"username": user.username, "password": request.data.get("password")}
-        )
-        token_serializer.is_valid(raise_exception=True)
-        token_data = token_serializer.validated_data
+    def idempotent_response(self, data):
+        return {"user": data["user"]["id"]}
 
-        return Response(token_data, status=status.HTTP_201_CREATED)
+    def idempotent_replay(self, data):
+        user = User.objects.filter(pk=data["user"], is_active=True).first()
+        if user is None:
+            raise NotFound("The account created by this request no longer exists.")
+        return issue_tokens(user)
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -52,6 +124,8 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     """
     permission_classes = [permissions.AllowAny]
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [IPTokenBucketThrottle, AccountTokenBucketThrottle]
+    throttle_scope = "login"
 
 
 class MeView(APIView):
@@ -61,7 +135,7 @@ class MeView(APIView):
     Get current logged-in user profile
     """
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
 
     def get(self, request):
         serializer = UserSerializer(request.user)
@@ -89,6 +163,18 @@ class MeView(APIView):
         return Response(UserSerializer(request.user, context={"request": request}).data)
 
 
+class MeSummaryView(APIView):
+    """
+    GET /api/auth/me/summary/
+    Upcoming stays, total nights/spend and last stay of the current user,
+    aggregated in SQL and cached until their bookings change.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_booking_summary(request.user))
+
+
 class CustomTokenRefreshView(TokenRefreshView):
     """
     POST /api/auth/token/refresh/
@@ -96,16 +182,65 @@ class CustomTokenRefreshView(TokenRefreshView):
     permission_classes = [permissions.AllowAny]
 
 
+# ---------- HOTELS ----------
+
+class HotelListView(generics.ListAPIView):
+    """
+    GET /api/hotels/
+    Active properties; pass a slug as ?hotel= to scope other endpoints.
+    """
+    queryset = Hotel.objects.filter(is_active=True)
+    serializer_class = HotelSerializer
+    permission_classes = [permissions.AllowAny]
+
+
 # ---------- ROOM VIEWS ----------
 
-class RoomListCreateView(generics.ListCreateAPIView):
+class CachedHotelListMixin(SparseFieldsetViewMixin, HotelScopedMixin):
+    """
+    Serves the (unfiltered, unpaginated) list of a hotel from that hotel's
+    cache namespace; saves to the hotel's rows invalidate it (hotel.hotels).
+    """
+
+    cache_name = None
+    # Query parameters that shape the list, and so are part of its key
+    cache_params = (FIELDS_PARAM, OMIT_PARAM)
+
+    def get_queryset(self):
+        return self.scope_queryset(super().get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        # Image URLs are absolute, so the host is part of the key
+        params = ":".join(request.query_params.get(param, "") for param in self.cache_params)
+        name = f"{self.cache_name}:{request.get_host()}:{params}"
+        data = cached_for_hotel(
+            self.get_hotel().id,
+            name,
+            lambda: self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data,
+        )
+        return Response(data)
+
+
+class RoomListCreateView(CachedHotelListMixin, generics.ListCreateAPIView):
     """
-    GET /api/rooms/        -> list all rooms
-    POST /api/rooms/       -> create a room (admin or for demo anyone)
+    GET /api/rooms/?hotel=<slug>   -> list the rooms of a hotel (default hotel if omitted)
+                                      (?sort=rating: best rated first, off the rating index)
+    POST /api/rooms/               -> create a room (admin or for demo anyone)
     """
-    queryset = Room.objects.all()
+    queryset = Room.objects.prefetch_related("images")
     serializer_class = RoomSerializer
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
+    cache_name = "rooms"
+    cache_params = CachedHotelListMixin.cache_params + ("sort",)
+    orderings = {"rating": ("-rating", "id")}
+
+    def filter_queryset(self, queryset):
+        sort = self.request.query_params.get("sort")
+        if sort:
+            if sort not in self.orderings:
+                raise ValidationError({"sort": f"Choose from {', '.join(self.orderings)}."})
+            queryset = queryset.order_by(*self.orderings[sort])
+        return super().filter_queryset(queryset)
 
     # For demo: allow read for anyone, write for authenticated
     def get_permissions(self):
@@ -114,14 +249,14 @@ class RoomListCreateView(generics.ListCreateAPIView):
         return [permissions.IsAuthenticated()]
 
 
-class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RoomDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET /api/rooms/<id>/
     PUT/PATCH/DELETE /api/rooms/<id>/
     """
-    queryset = Room.objects.all()
+    queryset = Room.objects.prefetch_related("images")
     serializer_class = RoomSerializer
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -131,27 +266,102 @@ class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ---------- BOOKING / RESERVATION VIEWS ----------
 
-class BookingListCreateView(generics.ListCreateAPIView):
+class BookingListCreateView(IdempotentMixin, SparseFieldsetViewMixin, HotelScopedMixin, generics.ListCreateAPIView):
     """
-    GET /api/bookings/         -> list bookings of current user
-    POST /api/bookings/        -> create new booking (reservation)
+    GET /api/bookings/         -> paginated bookings of current user, newest stay first
+                                  (?page=, ?page_size=, ?check_in_after=, ?check_in_before=, ?hotel=)
+    POST /api/bookings/        -> create new booking (reservation); 409 if the room is taken
     """
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BookingHistoryPagination
+    hotel_default = False
 
     def get_queryset(self):
-        # Only return bookings of logged-in user
-        return Booking.objects.filter(user=self.request.user)
+        # Only return bookings of logged-in user, served by the (user, check_in) index
+        queryset = self.scope_queryset(Booking.objects.filter(user=self.request.user))
+        queryset = filter_check_in(queryset, self.request.query_params)
+        return (
+            queryset.select_related("user__profile", "room")
+            .prefetch_related("room__images")
+            .order_by("-check_in", "-id")
+        )
+
+    def create(self, request, *args, **kwargs):
+        try:
+            return super().create(request, *args, **kwargs)
+        except RoomsUnavailable as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ArchivedBookingListView(HotelScopedMixin, generics.ListAPIView):
+    """
+    GET /api/bookings/archived/
+    The current user's archived (older) bookings, newest stay first; same
+    query parameters as /api/bookings/.
+    """
+    serializer_class = ArchivedBookingSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BookingHistoryPagination
+    hotel_default = False
+
+    def get_queryset(self):
+        queryset = self.scope_queryset(ArchivedBooking.objects.filter(user=self.request.user))
+        return filter_check_in(queryset, self.request.query_params)
+
+
+class GroupBookingView(APIView):
+    """
+    POST /api/bookings/group/
+    Reserve several matching rooms for the same dates atomically: either
+    every room is booked or none is (409 if they're not all free).
+    Honours Idempotency-Key.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        # The view defines post itself, so IdempotentMixin can't wrap it
+        return idempotent(request, lambda: self.reserve(request))
+
+    def reserve(self, request):
+        serializer = GroupBookingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        hotel = data.get("hotel") or resolve_hotel(request)
+        try:
+            bookings = reserve_group(
+                request.user,
+                hotel,
+                count=data["rooms"],
+                check_in=data["check_in"],
+                check_out=data["check_out"],
+                guests=data["guests"],
+                room_type=data.get("room_type"),
+                min_capacity=data["min_capacity"],
+                adjacent=data["adjacent"],
+            )
+        except RoomsUnavailable as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+
+        bookings = (
+            Booking.objects.filter(id__in=[booking.id for booking in bookings])
+            .select_related("user", "room")
+            .prefetch_related("room__images")
+        )
+        return Response(
+            BookingSerializer(bookings, many=True, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class BookingDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET /api/bookings/<id>/
     PUT/PATCH/DELETE /api/bookings/<id>/
-    Only owner can access
+    Only owner can access; 409 when moving to a room or dates that are taken
     """
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -159,33 +369,203 @@ class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Booking.objects.filter(user=self.request.user)
 
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except RoomsUnavailable as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+
+
+class BookingConfirmView(generics.GenericAPIView):
+    """
+    POST /api/bookings/<id>/confirm/
+    Confirm own pending booking before its hold (BOOKING_HOLD_TTL) runs out;
+    409 once it expired or changed status.
+    """
+    serializer_class = BookingSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Booking.objects.filter(user=self.request.user).select_related("user__profile", "room")
+
+    def post(self, request, pk):
+        booking = self.get_object()
+        try:
+            transition(booking, "confirmed")
+        except InvalidTransition as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(booking).data)
+
+
+class SimilarRoomsView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    GET /api/rooms/<id>/similar/?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD
+    The most similar rooms in the same hotel that can be booked, closest
+    first (precomputed by hotel.similarity); with dates, only those free
+    for the stay.
+    """
+    serializer_class = RoomSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        rooms = (
+            Room.objects.filter(neighbour_of__room_id=self.kwargs["pk"], is_available=True)
+            .order_by("neighbour_of__rank")
+            .prefetch_related("images")
+        )
+        params = self.request.query_params
+        if params.get("check_in") or params.get("check_out"):
+            try:
+                check_in = date.fromisoformat(params.get("check_in", ""))
+                check_out = date.fromisoformat(params.get("check_out", ""))
+            except ValueError:
+                raise ValidationError("Dates must be in YYYY-MM-DD format.")
+            rooms = rooms.exclude(id__in=overlapping(check_in, check_out).values("room_id"))
+        return rooms
+
+
+# ---------- REVIEWS ----------
+
+class RoomReviewListView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    GET /api/rooms/<id>/reviews/   -> a room's reviews, newest first (paginated)
+    """
+    serializer_class = ReviewSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = ReviewPagination
+
+    def get_queryset(self):
+        return Review.objects.filter(room_id=self.kwargs["pk"]).select_related("user")
+
+
+class ReviewListCreateView(IdempotentMixin, generics.ListCreateAPIView):
+    """
+    GET /api/reviews/              -> reviews written by the current user
+    POST /api/reviews/             -> review a completed stay ({booking, rating, comment})
+    """
+    serializer_class = ReviewSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ReviewPagination
+
+    def get_queryset(self):
+        return Review.objects.filter(user=self.request.user).select_related("user")
+
+    def perform_create(self, serializer):
+        # The review and the room's rating totals change together
+        with transaction.atomic():
+            serializer.save()
+
+
+class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    GET/PUT/PATCH/DELETE /api/reviews/<id>/   -> own review (admins: any review)
+    """
+    serializer_class = ReviewSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Review.objects.select_related("user", "booking")
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
+
+class WaitlistListCreateView(IdempotentMixin, HotelScopedMixin, generics.ListCreateAPIView):
+    """
+    GET /api/waitlist/             -> waitlist entries of current user, oldest first (?hotel=)
+    POST /api/waitlist/            -> wait for a sold-out room type ({room_type, check_in, check_out, guests})
+    """
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BookingHistoryPagination
+    hotel_default = False
+
+    def get_queryset(self):
+        return self.scope_queryset(WaitlistEntry.objects.filter(user=self.request.user))
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class WaitlistDetailView(generics.RetrieveDestroyAPIView):
+    """
+    GET/DELETE /api/waitlist/<id>/   -> own entry; deleting leaves an offered hold to confirm or cancel
+    """
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(user=self.request.user)
+
+
+class WaitlistAcceptView(generics.GenericAPIView):
+    """
+    POST /api/waitlist/<id>/accept/   -> confirm the booking held for an offered entry
+    409 when there is no offer, or its hold has expired.
+    """
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return WaitlistEntry.objects.filter(user=self.request.user).select_related("booking")
+
+    def post(self, request, pk):
+        entry = self.get_object()
+        try:
+            accept_offer(entry)
+        except InvalidTransition as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(entry).data)
+
 
 # ---------- ABOUT / TEAM ----------
 
-class TeamMemberListView(generics.ListAPIView):
+class TeamMemberListView(CachedHotelListMixin, generics.ListAPIView):
     """
-    GET /api/team/
+    GET /api/team/?hotel=<slug>
     Public list of team members for About Us section.
     """
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
     permission_classes = [permissions.AllowAny]
+    cache_name = "team"
 
 
 # ---------- GALLERY ----------
 
-class GalleryImageListView(generics.ListAPIView):
+class GalleryImageListView(CachedHotelListMixin, generics.ListAPIView):
     """
-    GET /api/gallery/
+    GET /api/gallery/?hotel=<slug>
     Public list of gallery images uploaded via admin.
     """
 
     queryset = GalleryImage.objects.all()
     serializer_class = GalleryImageSerializer
     permission_classes = [permissions.AllowAny]
+    cache_name = "gallery"
+
+
+class HotelAdminMixin(HotelScopedMixin):
+    """
+    Admin viewsets see every hotel unless one is named with ?hotel=; new
+    rows go to the hotel in the body, else the named one, else the default.
+    """
+
+    hotel_default = False
+
+    def get_queryset(self):
+        return self.scope_queryset(super().get_queryset())
 
 
-class GalleryImageAdminViewSet(viewsets.ModelViewSet):
+class GalleryImageAdminViewSet(SparseFieldsetViewMixin, HotelAdminMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD for gallery images (upload/delete).
     """
@@ -193,31 +573,109 @@ class GalleryImageAdminViewSet(viewsets.ModelViewSet):
     queryset = GalleryImage.objects.all()
     serializer_class = GalleryImageSerializer
     permission_classes = [permissions.IsAdminUser]
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
 
 
-class RoomAdminViewSet(viewsets.ModelViewSet):
+class RoomAdminViewSet(SparseFieldsetViewMixin, HotelAdminMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD for rooms.
+    GET /api/admin/rooms/export/ streams the full list.
     """
 
-    queryset = Room.objects.all()
+    queryset = Room.objects.prefetch_related("images")
     serializer_class = RoomSerializer
     permission_classes = [permissions.IsAdminUser]
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
 
 
-class BookingAdminViewSet(viewsets.ModelViewSet):
+class BookingAdminViewSet(SparseFieldsetViewMixin, HotelAdminMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD/list for all bookings.
+    GET /api/admin/bookings/export/ streams the full list.
+    POST /api/admin/bookings/{id}/check-in/ records the guest's arrival.
     """
 
-    queryset = Booking.objects.select_related("user", "room").all()
+    queryset = Booking.objects.select_related("user__profile", "room").prefetch_related("room__images")
     serializer_class = AdminBookingSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except RoomsUnavailable as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=True, methods=["post"], url_path="check-in")
+    def check_in(self, request, pk=None):
+        booking = self.get_object()
+        try:
+            mark_checked_in(booking)
+        except CheckInError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(booking).data)
+
+
+class AdminOverviewView(APIView):
+    """
+    GET /api/admin/overview/?hotel=<slug>
+    Everything the dashboard shows on load: counts, recent bookings, unread
+    messages and today's arrivals/departures, in one bounded response.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(build_admin_overview(resolve_hotel(request)))
+
+
+class ForecastView(APIView):
+    """
+    GET /api/admin/forecast/?hotel=<slug>
+    Rooms on the books and projected occupancy per room type for each of
+    the next FORECAST["HORIZON_DAYS"] nights, from booking pace (computed
+    once a day).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_forecast(resolve_hotel(request)))
+
+
+class FrontDeskListView(generics.ListAPIView):
+    """
+    GET /api/admin/frontdesk/<arrivals|departures|in-house|no-shows>/?date=YYYY-MM-DD&hotel=<slug>
+    Compact booking rows for one day (default today), ordered by room.
+    """
+    serializer_class = FrontDeskBookingSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = FrontDeskPagination
+
+    def get_queryset(self):
+        if self.kwargs["movement"] not in MOVEMENTS:
+            raise NotFound("Unknown list.")
+        try:
+            day = parse_day(self.request.query_params.get("date"))
+        except ValueError:
+            raise ValidationError("Dates must be in YYYY-MM-DD format.")
+        return movement_queryset(self.kwargs["movement"], day, resolve_hotel(self.request))
+
 
-class UserAdminViewSet(viewsets.ModelViewSet):
+class NightAuditView(APIView):
+    """
+    GET /api/admin/frontdesk/night-audit/?date=YYYY-MM-DD&hotel=<slug>
+    Streams a printable CSV of the night's arrivals, stayovers, departures
+    and no-shows.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        try:
+            day = parse_day(request.query_params.get("date"))
+        except ValueError:
+            raise ValidationError("Dates must be in YYYY-MM-DD format.")
+        return night_audit_response(day, resolve_hotel(request))
+
+
+class UserAdminViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD for users.
     """
@@ -225,10 +683,10 @@ class UserAdminViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
-    parser_classes = [JSONParser, parsers.MultiPartParser, parsers.FormParser]
+    parser_classes = [FastJSONParser, parsers.MultiPartParser, parsers.FormParser]
 
 
-class TeamMemberAdminViewSet(viewsets.ModelViewSet):
+class TeamMemberAdminViewSet(SparseFieldsetViewMixin, HotelAdminMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD for team members.
     """
@@ -240,18 +698,32 @@ class TeamMemberAdminViewSet(viewsets.ModelViewSet):
 
 # ---------- CONTACT MESSAGES ----------
 
-class ContactMessageCreateView(generics.CreateAPIView):
+class ContactMessageCreateView(IdempotentMixin, generics.CreateAPIView):
     """
     POST /api/contact/
     Public endpoint for users to submit contact messages.
+    With CONTACT_INGEST enabled messages are queued and written in batches
+    (see hotel.ingest), and the response is 202 without an id.
     """
 
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = "contact"
 
+    def create(self, request, *args, **kwargs):
+        buffer = get_buffer()
+        if buffer is None:
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        buffer.submit(serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
-class ContactMessageAdminViewSet(viewsets.ModelViewSet):
+
+class ContactMessageAdminViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     Admin-only CRUD for contact messages.
     """
@@ -259,3 +731,173 @@ class ContactMessageAdminViewSet(viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
     permission_classes = [permissions.IsAdminUser]
+
+
+# ---------- ARCHIVE ----------
+
+class ArchivedBookingAdminViewSet(HotelAdminMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Admin-only, read-only access to archived bookings (hotel.archive).
+    Filters: ?hotel=, ?user=<id>, ?check_in_after=, ?check_in_before=
+    """
+
+    queryset = ArchivedBooking.objects.all()
+    serializer_class = ArchivedBookingSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = ArchivePagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.query_params.get("user", "").isdigit():
+            queryset = queryset.filter(user_id=self.request.query_params["user"])
+        return filter_check_in(queryset, self.request.query_params)
+
+
+class ArchivedContactMessageAdminViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Admin-only, read-only access to archived contact messages.
+    Filters: ?email=
+    """
+
+    queryset = ArchivedContactMessage.objects.all()
+    serializer_class = ArchivedContactMessageSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = ArchivePagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.query_params.get("email"):
+            queryset = queryset.filter(email__iexact=self.request.query_params["email"])
+        return queryset
+
+
+# ---------- SEARCH ----------
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=<terms>&type=room,gallery&limit=20
+    Ranked full-text search over rooms, gallery titles and (admins only)
+    contact messages.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    public_kinds = ["room", "gallery"]
+    max_limit = 100
+
+    def get(self, request):
+        if request.user.is_staff:
+            allowed = [kind for kind, _ in SearchDocument.KIND_CHOICES]
+        else:
+            allowed = self.public_kinds
+
+        requested = request.query_params.get("type")
+        kinds = [kind for kind in requested.split(",") if kind in allowed] if requested else allowed
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), self.max_limit)
+        except ValueError:
+            limit = 20
+
+        results = search(request.query_params.get("q", ""), kinds, limit)
+        return Response({"count": len(results), "results": results})
+
+
+# ---------- CHANGE FEED ----------
+
+class ChangeFeedView(APIView):
+    """
+    GET /api/changes/?after=<cursor>&topics=booking,room&hotel=<slug>
+    Booking, room and (admins only) contact message changes after a cursor.
+    With `Accept: text/event-stream` the response is a live Server-Sent
+    Events stream, resumable with the `Last-Event-ID` header. Anonymous
+    clients see booking availability only, not who booked.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+
+    def get(self, request):
+        staff = request.user.is_staff
+        allowed = STAFF_TOPICS if staff else PUBLIC_TOPICS
+        requested = request.query_params.get("topics")
+        topics = [topic for topic in requested.split(",") if topic in allowed] if requested else list(allowed)
+        if not topics:
+            raise ValidationError({"topics": f"Choose from {', '.join(allowed)}."})
+
+        cursor = request.headers.get("Last-Event-ID") or request.query_params.get("after")
+        if cursor is not None:
+            try:
+                cursor = max(int(cursor), 0)
+            except ValueError:
+                raise ValidationError({"after": "Must be an event id."})
+        hotel = resolve_hotel(request, default=False)
+
+        if request.accepted_renderer.format == "event-stream":
+            response = StreamingHttpResponse(
+                event_stream(cursor, topics, hotel, staff), content_type="text/event-stream"
+            )
+            response["Cache-Control"] = "no-cache"
+            # Stop nginx from buffering the stream
+            response["X-Accel-Buffering"] = "no"
+            return response
+        return Response(read_changes(cursor, topics, hotel, staff))
+
+
+class AriDeltaView(APIView):
+    """
+    GET /api/admin/ari/changes/?after=<cursor>&hotel=<slug>
+    Availability, rate and inventory of the room-type nights changed after
+    a cursor, one compact row per night with its latest values. Follow
+    `cursor` while `more` is true; `reset` means reload the snapshot.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        cursor = request.query_params.get("after")
+        if cursor is not None:
+            try:
+                cursor = max(int(cursor), 0)
+            except ValueError:
+                raise ValidationError({"after": "Must be a cursor."})
+        return Response(read_deltas(resolve_hotel(request), cursor))
+
+
+class AriSnapshotView(APIView):
+    """
+    GET /api/admin/ari/snapshot/?hotel=<slug>
+    The gzipped JSON snapshot of every room-type night written by
+    `export_ari`, with the cursor to follow the deltas from.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        path = snapshot_path(resolve_hotel(request))
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            raise NotFound("No snapshot yet, run `python manage.py export_ari`.")
+        return FileResponse(
+            file,
+            as_attachment=True,
+            filename=path.name,
+            content_type="application/gzip",
+            headers={"Last-Modified": http_date(os.fstat(file.fileno()).st_mtime)},
+        )
+
+
+# ---------- BATCH ----------
+
+class BatchView(APIView):
+    """
+    POST /api/batch/
+    Run several API calls in one round trip: {"requests": [{"method",
+    "path", "body", "headers"}, ...]}. Each call keeps its own permissions
+    and comes back as {"status", "headers", "body"}, in order.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"responses": run_batch(request, serializer.validated_data["requests"])})
@@ -0,0 +1,183 @@
+"""
+Waitlist: guests register for a room type and dates that are sold out, and
+nights freed by cancellations are offered to them.
+
+When a booking stops occupying its room (cancelled, hold expired, deleted)
+`match_freed` finds the free gaps of that room around the freed nights and
+looks for waiting entries of the same hotel and room type whose stay fits
+in a gap and uses at least one freed night. Entries live in the
+(hotel, room_type, status, check_in, check_out) index: a gap [start, end)
+only admits entries with start <= check_in < end, so candidates come from a
+range scan of that index, never from the whole waitlist.
+
+Candidates are offered first come, first served. Each one that fits and
+doesn't overlap an earlier offer in the same gap gets a pending booking:
+a hold that lapses after BOOKING_HOLD_TTL like any other. The guest
+accepts it (POST /api/waitlist/<id>/accept/, or by confirming the booking)
+and the entry is booked; a cancelled or expired offer lapses it, and the
+nights go to the next entry in line. Matching runs after the freeing
+change commits, and its errors are logged rather than failing that
+change.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bookings import InvalidTransition, RoomsUnavailable, book_room, overlapping, transition
+from .models import Booking, Room, WaitlistEntry
+from .signals import booking_status_changed
+
+DEFAULTS = {
+    # Longest stay that can be waitlisted; also how far either side of the
+    # freed nights a gap is looked for
+    "MAX_NIGHTS": 30,
+    # Candidates read per gap
+    "SCAN_LIMIT": 200,
+}
+
+
+def get_waitlist_setting(name):
+    return getattr(settings, "WAITLIST", {}).get(name, DEFAULTS[name])
+
+
+def free_gaps(room, check_in, check_out, today=None):
+    """
+    Free intervals [start, end) of `room` that contain at least one night
+    of [check_in, check_out), within MAX_NIGHTS either side.
+    """
+    horizon = timedelta(days=get_waitlist_setting("MAX_NIGHTS"))
+    window_start = max(check_in - horizon, today or timezone.localdate())
+    window_end = check_out + horizon
+    if window_start >= check_out:
+        return []
+
+    busy = (
+        overlapping(window_start, window_end)
+        .filter(room=room)
+        .order_by("check_in")
+        .values_list("check_in", "check_out")
+    )
+    gaps = []
+    start = window_start
+    for busy_in, busy_out in busy:
+        if busy_in > start:
+            gaps.append((start, busy_in))
+        start = max(start, busy_out)
+    if start < window_end:
+        gaps.append((start, window_end))
+    return [(start, end) for start, end in gaps if start < check_out and end > check_in]
+
+
+def candidates(room, gap_start, gap_end, freed_in, freed_out):
+    """
+    Waiting entries, in priority order, whose stay fits in the gap and uses
+    a night of [freed_in, freed_out): an index range scan on check_in.
+    """
+    return (
+        WaitlistEntry.objects.filter(
+            hotel_id=room.hotel_id,
+            room_type=room.room_type,
+            status="waiting",
+            check_in__gte=gap_start,
+            check_in__lt=min(gap_end, freed_out),
+            check_out__lte=gap_end,
+            check_out__gt=freed_in,
+            guests__lte=room.capacity,
+        )
+        .order_by("created_at", "id")[: get_waitlist_setting("SCAN_LIMIT")]
+    )
+
+
+def offer(entry, room):
+    """
+    Hold `room` for `entry` as a pending booking. Returns the booking, or
+    None when the entry or the nights were taken in the meantime.
+    """
+    try:
+        with transaction.atomic():
+            now = timezone.now()
+            claimed = WaitlistEntry.objects.filter(pk=entry.pk, status="waiting").update(
+                status="offered", offered_at=now
+            )
+            if not claimed:
+                return None
+            # Rolls the claim back too when the nights are taken
+            booking = book_room(
+                room,
+                entry.check_in,
+                entry.check_out,
+                entry.guests,
+                hotel_id=room.hotel_id,
+                user_id=entry.user_id,
+            )
+            WaitlistEntry.objects.filter(pk=entry.pk).update(booking=booking)
+    except RoomsUnavailable:
+        return None
+    return booking
+
+
+def accept_offer(entry):
+    """
+    Confirm the booking held for an offered entry and book the entry.
+    Raises InvalidTransition when there is no live offer.
+    """
+    if entry.status != "offered" or entry.booking is None:
+        raise InvalidTransition("There is no offer to accept.")
+    with transaction.atomic():
+        transition(entry.booking, "confirmed")
+        WaitlistEntry.objects.filter(pk=entry.pk, status="offered").update(status="booked")
+    entry.status = "booked"
+    return entry
+
+
+def match_freed(room_id, check_in, check_out):
+    """
+    Offer the freed nights [check_in, check_out) of a room to the waitlist.
+    Returns the offered bookings.
+    """
+    room = Room.objects.filter(pk=room_id, is_available=True).only("id", "hotel", "room_type", "capacity").first()
+    if room is None:
+        return []
+    offers = []
+    for gap_start, gap_end in free_gaps(room, check_in, check_out):
+        taken = []
+        for entry in candidates(room, gap_start, gap_end, check_in, check_out):
+            if any(entry.check_in < taken_out and entry.check_out > taken_in for taken_in, taken_out in taken):
+                continue
+            booking = offer(entry, room)
+            if booking is not None:
+                offers.append(booking)
+                taken.append((entry.check_in, entry.check_out))
+    return offers
+
+
+# ---------- SIGNALS ----------
+
+@receiver(booking_status_changed)
+def follow_offers(sender, bookings, to_status, **kwargs):
+    # Sent after commit, so the freed nights are visible to the matcher
+    ids = [booking.id for booking in bookings]
+    if to_status == "confirmed":
+        WaitlistEntry.objects.filter(booking_id__in=ids, status="offered").update(status="booked")
+    elif to_status in ("cancelled", "expired"):
+        WaitlistEntry.objects.filter(booking_id__in=ids, status="offered").update(status="lapsed")
+        for booking in bookings:
+            match_freed(booking.room_id, booking.check_in, booking.check_out)
+
+
+@receiver(pre_delete, sender=Booking)
+def lapse_deleted_offer(sender, instance, **kwargs):
+    WaitlistEntry.objects.filter(booking=instance, status="offered").update(status="lapsed")
+
+
+@receiver(post_delete, sender=Booking)
+def match_deleted(sender, instance, **kwargs):
+    # Past stays leave by archiving, which frees nothing
+    if instance.status in Booking.ACTIVE_STATUSES and instance.check_out > timezone.localdate():
+        transaction.on_commit(
+            lambda: match_freed(instance.room_id, instance.check_in, instance.check_out), robust=True
+        )
@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Serve the live change feed (GET /api/changes/ with Accept:
+text/event-stream) through this application, e.g.
+`uvicorn hotel_api.asgi:application`: each open stream is then a
+coroutine polling the outbox rather than a blocked worker thread.
 """
 
 import os
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -28,6 +29,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "hotel.routers.ReplicaRoutingMiddleware",
+    "hotel.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,6 +67,43 @@ DATABASES = {
     }
 }
 
+# Read replicas (hotel.routers): safe requests read from one of these
+# aliases; writes, transactions and clients that wrote within the last
+# REPLICA_STICKY_SECONDS use "default". To try it locally with SQLite,
+# HOTEL_DB_REPLICAS=2 adds db-replica-1/2.sqlite3 (filled with copies of
+# db.sqlite3 by `python manage.py bench_replicas --sync`). With PostgreSQL,
+# add the streaming replicas' connection settings here instead.
+DATABASES.update(
+    (
+        f"replica{index}",
+        {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / f"db-replica-{index}.sqlite3",
+            "TEST": {"MIRROR": "default"},
+        },
+    )
+    for index in range(1, int(os.environ.get("HOTEL_DB_REPLICAS", "0")) + 1)
+)
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["hotel.routers.PrimaryReplicaRouter"]
+REPLICA_STICKY_SECONDS = 5
+# Where signed-in users' stickiness is kept; must be shared by all workers
+REPLICA_STICKY_CACHE = "default"
+
+# Caches. "throttle" holds the token buckets of hotel.throttling; point it at
+# a shared backend (Redis, memcached, or DatabaseCache as a SQLite stand-in)
+# when running several worker processes.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -92,6 +132,116 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored once per content hash (hotel.storage). For MinIO or
+# another S3-compatible store, install django-storages[s3] and use
+# "hotel.storage.ContentAddressedS3Storage" with OPTIONS such as
+# {"bucket_name": "media", "endpoint_url": "http://localhost:9000",
+#  "access_key": ..., "secret_key": ...}.
+STORAGES = {
+    "default": {"BACKEND": "hotel.storage.ContentAddressedFileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Unreferenced media blobs are deleted by `cleanup_media` after this long
+MEDIA_ORPHAN_GRACE = timedelta(hours=1)
+
+# Media serving (hotel.serving). Content-addressed blobs are cached as
+# immutable; other files for MEDIA_MAX_AGE seconds. Set MEDIA_SENDFILE to
+# "x-sendfile" (Apache mod_xsendfile) or "x-accel-redirect" (nginx) to let
+# the web server send the file; for nginx map the prefix to MEDIA_ROOT:
+#   location /protected-media/ { internal; alias /path/to/media/; }
+MEDIA_MAX_AGE = 60 * 60
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
+
+# Pending bookings are holds; unconfirmed ones expire after this long
+# (`python manage.py expire_bookings`).
+BOOKING_HOLD_TTL = timedelta(minutes=30)
+
+# Buffered contact form ingestion (hotel.ingest). Messages are written with
+# bulk_create every BATCH_SIZE messages or FLUSH_INTERVAL seconds; LOG_DIR
+# holds the append-only log replayed after a crash by replay_contact_log
+# (None disables it).
+CONTACT_INGEST = {
+    "ENABLED": True,
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 1.0,
+    "LOG_DIR": BASE_DIR / "var" / "contact_ingest",
+    "FSYNC": False,
+}
+
+# Archival (hotel.archive): bookings checked out more than BOOKING_MONTHS
+# ago and read messages older than MESSAGE_DAYS move to archive tables.
+ARCHIVE = {
+    "BOOKING_MONTHS": 12,
+    "MESSAGE_DAYS": 90,
+    "BATCH_SIZE": 1000,
+}
+
+# Change feed (hotel.feed), served at /api/changes/. Streams poll the outbox
+# every POLL_INTERVAL seconds and end after MAX_DURATION (clients reconnect
+# with Last-Event-ID); events are kept for RETENTION (`prune_change_feed`).
+# Serve the stream through hotel_api.asgi (e.g. uvicorn) so an open
+# connection doesn't hold a worker thread.
+CHANGE_FEED = {
+    "POLL_INTERVAL": 1.0,
+    "HEARTBEAT": 15,
+    "MAX_DURATION": 300,
+    "BATCH_SIZE": 200,
+    "RETENTION": timedelta(days=7),
+}
+
+# Responses to POSTs sent with an Idempotency-Key header (hotel.idempotency)
+# are replayed to retries for TTL (`prune_idempotency_keys`); a request
+# still unanswered after PENDING_TIMEOUT can be taken over by a retry.
+IDEMPOTENCY = {
+    "TTL": timedelta(hours=24),
+    "PENDING_TIMEOUT": timedelta(seconds=60),
+}
+
+# Similar rooms (hotel.similarity): neighbours stored per room, refreshed
+# incrementally when a room changes (`build_room_neighbours` rebuilds all).
+SIMILAR_ROOMS = {
+    "K": 6,
+}
+
+# POST /api/batch/ (hotel.batch). Reads between writes run concurrently on
+# READ_WORKERS threads, each with its own database connection; 1 keeps the
+# whole batch on the request's connection.
+BATCH = {
+    "MAX_REQUESTS": 20,
+    "READ_WORKERS": 4,
+}
+
+# Waitlist (hotel.waitlist): freed nights are offered as BOOKING_HOLD_TTL
+# holds. MAX_NIGHTS caps a waitlisted stay; SCAN_LIMIT caps the entries
+# read per free gap (`bench_waitlist` times the matcher).
+WAITLIST = {
+    "MAX_NIGHTS": 30,
+    "SCAN_LIMIT": 200,
+}
+
+# Occupancy forecast at /api/admin/forecast/ (hotel.forecast): the next
+# HORIZON_DAYS nights, projected from the pace of the last HISTORY_DAYS.
+FORECAST = {
+    "HORIZON_DAYS": 90,
+    "HISTORY_DAYS": 365,
+}
+
+# ARI feed for channel managers (hotel.ari): room-type nights for the next
+# HORIZON_DAYS. Deltas are served BATCH_SIZE changes at a time and kept
+# for RETENTION; run `export_ari` daily to write the gzipped snapshots to
+# SNAPSHOT_DIR and prune older changes.
+ARI = {
+    "HORIZON_DAYS": 365,
+    "BATCH_SIZE": 5000,
+    "RETENTION": timedelta(days=7),
+    "SNAPSHOT_DIR": BASE_DIR / "var" / "ari",
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # DRF + JWT configuration
@@ -102,6 +252,29 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # orjson-backed JSON; falls back to stdlib json when orjson isn't installed.
+    # Swap back to rest_framework.renderers.JSONRenderer / parsers.JSONParser to disable.
+    "DEFAULT_RENDERER_CLASSES": (
+        "hotel.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "hotel.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Token buckets for the public write endpoints, see hotel.throttling.
+    # "<scope>" is per client IP, "<scope>_account" per username/email.
+    "DEFAULT_THROTTLE_RATES": {
+        "contact": "5/min",
+        "register": "10/hour",
+        "register_account": "3/hour",
+        "login": "20/min",
+        "login_account": "5/min",
+    },
+    # Use REMOTE_ADDR as the client IP; set to the number of trusted proxies
+    # when deployed behind a load balancer.
+    "NUM_PROXIES": 0,
 }
 
 SIMPLE_JWT = {
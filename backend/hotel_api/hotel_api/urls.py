@@ -1,7 +1,10 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from hotel.serving import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,5 +13,8 @@ urlpatterns = [
     path('api/', include('hotel.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media is served with cache headers and Range support (hotel.serving). In
+# production point MEDIA_SENDFILE at the web server so it sends the bytes.
+urlpatterns += [
+    re_path(r"^%s/(?P<path>.+)$" % re.escape(settings.MEDIA_URL.strip("/")), serve_media),
+]
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import {
   fetchRooms,
   createRoom,
@@ -19,11 +19,13 @@ import {
   updateTeamMember,
   deleteTeamMember,
   fetchContactMessages,
+  fetchAdminOverview,
   markMessageAsRead,
   deleteContactMessage,
+  subscribeChanges,
 } from "../../services/hotelApi";
 import type { Room } from "../../constants/types";
-import type { GalleryImage, AdminBooking, ContactMessage } from "../../services/hotelApi";
+import type { GalleryImage, AdminBooking, AdminOverview, ChangeEvent, ContactMessage, OverviewBooking } from "../../services/hotelApi";
 import type { AuthenticatedUser } from "../../services/authUser";
 import { logoutUser } from "../../services/authUser";
 import { useNavigate } from "react-router-dom";
@@ -61,6 +63,20 @@ const emptyRoom: RoomFormState = {
   galleryFiles: [],
 };
 
+type DashboardTab = "overview" | "rooms" | "gallery" | "bookings" | "users" | "team" | "messages";
+type DataSet = "rooms" | "gallery" | "bookings" | "users" | "team" | "messages";
+
+// Full lists are only fetched when a tab that shows them is first opened
+const TAB_DATA: Record<DashboardTab, DataSet[]> = {
+  overview: [],
+  rooms: ["rooms", "bookings"],
+  gallery: ["gallery"],
+  bookings: ["bookings"],
+  users: ["users"],
+  team: ["team"],
+  messages: ["messages"],
+};
+
 const AdminDashboard = () => {
   const navigate = useNavigate();
   const token = localStorage.getItem("token") || "";
@@ -70,7 +86,11 @@ const AdminDashboard = () => {
     navigate("/login");
   };
 
-  const [activeTab, setActiveTab] = useState<"overview" | "rooms" | "gallery" | "bookings" | "users" | "team" | "messages">("overview");
+  const [activeTab, setActiveTab] = useState<DashboardTab>("overview");
+  const [overview, setOverview] = useState<AdminOverview | null>(null);
+  const [overviewLoading, setOverviewLoading] = useState(true);
+  const [overviewError, setOverviewError] = useState("");
+  const [loaded, setLoaded] = useState<Partial<Record<DataSet, boolean>>>({});
   const [rooms, setRooms] = useState<Room[]>([]);
   const [loadingRooms, setLoadingRooms] = useState(true);
   const [roomForm, setRoomForm] = useState<RoomFormState>(emptyRoom);
@@ -109,45 +129,143 @@ const AdminDashboard = () => {
   const [messagesLoading, setMessagesLoading] = useState(true);
 
   useEffect(() => {
-    const load = async () => {
-      setLoadingRooms(true);
-      setGalleryLoading(true);
-      setGalleryError("");
-      setBookingsLoading(true);
-      setUsersLoading(true);
-      setTeamLoading(true);
-      setMessagesLoading(true);
+    const loadOverview = async () => {
+      setOverviewLoading(true);
+      setOverviewError("");
       try {
-        const [roomData, galleryData, bookingData, userData, teamData, messagesData] = await Promise.all([
-          fetchRooms(),
-          fetchGalleryImages(),
-          fetchAdminBookings(token),
-          fetchUsers(token),
-          fetchTeam(),
-          fetchContactMessages(token),
-        ]);
-        setRooms(roomData);
-        setGallery(galleryData);
-        setBookings(bookingData);
-        setUsers(userData);
-        setTeam(teamData);
-        setMessages(messagesData);
+        setOverview(await fetchAdminOverview(token));
       } catch (err) {
-        const message = err instanceof Error ? err.message : "Failed to load dashboard data.";
-        setGalleryError(message);
+        setOverviewError(err instanceof Error ? err.message : "Failed to load dashboard data.");
       } finally {
-        setLoadingRooms(false);
-        setGalleryLoading(false);
-        setBookingsLoading(false);
-        setUsersLoading(false);
-        setTeamLoading(false);
-        setMessagesLoading(false);
+        setOverviewLoading(false);
+      }
+    };
+
+    loadOverview();
+  }, [token]);
+
+  // Apply changes from the feed instead of polling: patch rows we already
+  // show, reload lists that gained rows (lazily, via `loaded`), and refresh
+  // the overview once a burst of changes has settled.
+  const overviewTimer = useRef<ReturnType<typeof setTimeout> | undefined>(undefined);
+  useEffect(() => {
+    const refreshOverview = () => {
+      clearTimeout(overviewTimer.current);
+      overviewTimer.current = setTimeout(() => {
+        fetchAdminOverview(token).then(setOverview).catch(() => undefined);
+      }, 1000);
+    };
+    const reload = (...sets: DataSet[]) =>
+      setLoaded((prev) => ({ ...prev, ...Object.fromEntries(sets.map((set) => [set, false])) }));
+
+    const applyBooking = ({ action, data }: ChangeEvent) => {
+      if (action !== "upsert") {
+        setBookings((prev) => prev.filter((b) => b.id !== data.id));
+        return;
+      }
+      setBookings((prev) => {
+        if (!prev.some((b) => b.id === data.id)) {
+          reload("bookings");
+          return prev;
+        }
+        return prev.map((b) => (b.id === data.id ? { ...b, ...(data as Partial<AdminBooking>), user: b.user } : b));
+      });
+    };
+
+    const applyMessage = ({ action, data }: ChangeEvent) => {
+      if (action !== "upsert") {
+        setMessages((prev) => prev.filter((m) => m.id !== data.id));
+        return;
       }
+      setMessages((prev) => {
+        if (!prev.some((m) => m.id === data.id)) {
+          reload("messages");
+          return prev;
+        }
+        return prev.map((m) => (m.id === data.id ? { ...m, is_read: Boolean(data.is_read) } : m));
+      });
     };
 
-    load();
+    const unsubscribe = subscribeChanges(token, {
+      onEvent: (event) => {
+        if (event.topic === "booking") applyBooking(event);
+        else if (event.topic === "message") applyMessage(event);
+        else reload("rooms");
+        refreshOverview();
+      },
+      onReset: () => {
+        reload("rooms", "bookings", "messages");
+        refreshOverview();
+      },
+    });
+    return () => {
+      unsubscribe();
+      clearTimeout(overviewTimer.current);
+    };
   }, [token]);
 
+  useEffect(() => {
+    const pending = TAB_DATA[activeTab].filter((set) => !loaded[set]);
+    if (pending.length === 0) return;
+    setLoaded((prev) => ({ ...prev, ...Object.fromEntries(pending.map((set) => [set, true])) }));
+
+    const loaders: Record<DataSet, () => Promise<void>> = {
+      rooms: async () => {
+        setLoadingRooms(true);
+        try {
+          setRooms(await fetchRooms());
+        } finally {
+          setLoadingRooms(false);
+        }
+      },
+      gallery: async () => {
+        setGalleryLoading(true);
+        setGalleryError("");
+        try {
+          setGallery(await fetchGalleryImages());
+        } catch (err) {
+          setGalleryError(err instanceof Error ? err.message : "Failed to load gallery.");
+        } finally {
+          setGalleryLoading(false);
+        }
+      },
+      bookings: async () => {
+        setBookingsLoading(true);
+        try {
+          setBookings(await fetchAdminBookings(token));
+        } finally {
+          setBookingsLoading(false);
+        }
+      },
+      users: async () => {
+        setUsersLoading(true);
+        try {
+          setUsers(await fetchUsers(token));
+        } finally {
+          setUsersLoading(false);
+        }
+      },
+      team: async () => {
+        setTeamLoading(true);
+        try {
+          setTeam(await fetchTeam());
+        } finally {
+          setTeamLoading(false);
+        }
+      },
+      messages: async () => {
+        setMessagesLoading(true);
+        try {
+          setMessages(await fetchContactMessages(token));
+        } finally {
+          setMessagesLoading(false);
+        }
+      },
+    };
+
+    pending.forEach((set) => loaders[set]().catch(() => undefined));
+  }, [activeTab, loaded, token]);
+
   const handleSaveRoom = async () => {
     if (!roomForm.number || !roomForm.type) return;
     setSavingRoom(true);
@@ -297,11 +415,30 @@ const AdminDashboard = () => {
     }
   };
 
-  const roomCount = rooms.length;
-  const featuredImages = useMemo(() => gallery.filter((g) => g.is_featured).length, [gallery]);
-  const bookingCount = bookings.length;
-  const userCount = users.length;
-  const unreadMessagesCount = useMemo(() => messages.filter((m) => !m.is_read).length, [messages]);
+  const unreadMessagesCount = useMemo(
+    () => (loaded.messages ? messages.filter((m) => !m.is_read).length : overview?.counts.unread_messages ?? 0),
+    [loaded.messages, messages, overview],
+  );
+
+  const renderMovements = (title: string, movement: { count: number; results: OverviewBooking[] } | undefined) => (
+    <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm space-y-2">
+      <p className="text-sm font-semibold">
+        {title} today ({movement?.count ?? 0})
+      </p>
+      {movement?.results.length ? (
+        movement.results.map((b) => (
+          <div key={b.id} className="text-xs text-gray-600 flex items-center justify-between">
+            <span>
+              Room {b.room_number} • {b.guest} • {b.guests} guests
+            </span>
+            <span className="uppercase text-[10px] px-2 py-1 rounded-full bg-gray-100">{b.status}</span>
+          </div>
+        ))
+      ) : (
+        <p className="text-xs text-gray-400">None</p>
+      )}
+    </div>
+  );
 
   const bookingsByRoom = useMemo(() => {
     const map: Record<number, AdminBooking[]> = {};
@@ -351,27 +488,68 @@ const AdminDashboard = () => {
         </div>
 
         {activeTab === "overview" && (
-          <div className="grid grid-cols-1 sm:grid-cols-3 gap-4">
-            <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
-              <p className="text-sm text-gray-500">Rooms</p>
-              <p className="text-2xl font-semibold">{roomCount}</p>
-            </div>
-            <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
-              <p className="text-sm text-gray-500">Gallery items</p>
-              <p className="text-2xl font-semibold">{gallery.length}</p>
-            </div>
-            <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
-              <p className="text-sm text-gray-500">Featured images</p>
-              <p className="text-2xl font-semibold">{featuredImages}</p>
-            </div>
-            <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
-              <p className="text-sm text-gray-500">Bookings</p>
-              <p className="text-2xl font-semibold">{bookingCount}</p>
-            </div>
-            <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
-              <p className="text-sm text-gray-500">Users</p>
-              <p className="text-2xl font-semibold">{userCount}</p>
-            </div>
+          <div className="space-y-4">
+            {overviewLoading ? (
+              <p className="text-gray-600">Loading overview...</p>
+            ) : overviewError || !overview ? (
+              <p className="text-red-600">{overviewError || "Failed to load dashboard data."}</p>
+            ) : (
+              <>
+                <div className="grid grid-cols-1 sm:grid-cols-3 gap-4">
+                  {[
+                    { label: "Rooms", value: `${overview.counts.available_rooms} / ${overview.counts.rooms} available` },
+                    { label: "In house tonight", value: overview.counts.in_house },
+                    { label: "Bookings", value: overview.counts.bookings },
+                    { label: "Pending bookings", value: overview.counts.bookings_by_status.pending ?? 0 },
+                    { label: "Gallery items", value: overview.counts.gallery_images },
+                    { label: "Featured images", value: overview.counts.featured_images },
+                    { label: "Users", value: overview.counts.users },
+                    { label: "Team members", value: overview.counts.team_members },
+                    { label: "Unread messages", value: unreadMessagesCount },
+                  ].map((card) => (
+                    <div key={card.label} className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm">
+                      <p className="text-sm text-gray-500">{card.label}</p>
+                      <p className="text-2xl font-semibold">{card.value}</p>
+                    </div>
+                  ))}
+                </div>
+
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                  {renderMovements("Arrivals", overview.arrivals)}
+                  {renderMovements("Departures", overview.departures)}
+                </div>
+
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                  <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm space-y-2">
+                    <p className="text-sm font-semibold">Recent bookings</p>
+                    {overview.recent_bookings.length ? (
+                      overview.recent_bookings.map((b) => (
+                        <div key={b.id} className="text-xs text-gray-600 flex items-center justify-between">
+                          <span>
+                            #{b.id} • {b.guest} • Room {b.room_number} • {b.check_in} → {b.check_out}
+                          </span>
+                          <span className="uppercase text-[10px] px-2 py-1 rounded-full bg-gray-100">{b.status}</span>
+                        </div>
+                      ))
+                    ) : (
+                      <p className="text-xs text-gray-400">No bookings yet</p>
+                    )}
+                  </div>
+                  <div className="p-4 rounded-2xl bg-white border border-[var(--color-border)] shadow-sm space-y-2">
+                    <p className="text-sm font-semibold">Unread messages</p>
+                    {overview.unread_messages.length ? (
+                      overview.unread_messages.map((m) => (
+                        <div key={m.id} className="text-xs text-gray-600">
+                          <span className="font-semibold">{m.subject}</span> — {m.name} ({m.email})
+                        </div>
+                      ))
+                    ) : (
+                      <p className="text-xs text-gray-400">Inbox zero</p>
+                    )}
+                  </div>
+                </div>
+              </>
+            )}
           </div>
         )}
 
@@ -571,23 +749,6 @@ const AdminDashboard = () => {
                     Available
                   </label>
                 </div>
-                <div className="grid grid-cols-2 gap-2">
-                  <input
-                    type="number"
-                    step="0.1"
-                    className="form-input"
-                    placeholder="Rating"
-                    value={roomForm.rating ?? 4.5}
-                    onChange={(e) => setRoomForm((p) => ({ ...p, rating: Number(e.target.value) }))}
-                  />
-                  <input
-                    type="number"
-                    className="form-input"
-                    placeholder="Reviews count"
-                    value={roomForm.reviewsCount ?? 0}
-                    onChange={(e) => setRoomForm((p) => ({ ...p, reviewsCount: Number(e.target.value) }))}
-                  />
-                </div>
                 <textarea
                   className="form-input"
                   placeholder="Description"
@@ -757,6 +918,7 @@ const AdminDashboard = () => {
                         <option value="pending">Pending</option>
                         <option value="confirmed">Confirmed</option>
                         <option value="cancelled">Cancelled</option>
+                        <option value="expired" disabled>Expired</option>
                       </select>
                     </div>
                     <p className="text-sm text-gray-600">Room: {b.room_detail?.number || b.room_detail?.type}</p>
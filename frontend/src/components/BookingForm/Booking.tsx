@@ -3,7 +3,7 @@ import { useState, useEffect } from "react";
 import Form from "./Form";
 import Invoice from "./Invoice";
 import type { Room } from "../../constants/types";
-import { createBooking, fetchRoomById } from "../../services/hotelApi";
+import { confirmBooking, createBooking, fetchRoomById } from "../../services/hotelApi";
 
 function Booking() {
   const { id } = useParams();
@@ -71,6 +71,16 @@ function Booking() {
     }
   };
 
+  const handleConfirm = async () => {
+    const token = localStorage.getItem("token");
+    try {
+      const confirmed = await confirmBooking(bookingDetails.bookingId, token || "");
+      setBookingDetails((prev: any) => ({ ...prev, status: confirmed.status }));
+    } catch (err: any) {
+      alert(err?.message || "Unable to confirm booking. Please try again.");
+    }
+  };
+
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center text-gray-600 mt-[10%]">
@@ -122,7 +132,7 @@ function Booking() {
           </div>
         </>
       ) : (
-        <Invoice bookingDetails={bookingDetails} /> // Only invoice shown here
+        <Invoice bookingDetails={bookingDetails} onConfirm={handleConfirm} /> // Only invoice shown here
       )}
     </div>
   );
@@ -19,9 +19,10 @@ interface InvoiceProps {
         paymentMethod: string;
         specialRequest: string;
     };
+    onConfirm?: () => void;
 }
 
-const Invoice: React.FC<InvoiceProps> = ({ bookingDetails }) => {
+const Invoice: React.FC<InvoiceProps> = ({ bookingDetails, onConfirm }) => {
     return (
         <div className="p-6 bg-white shadow-lg rounded-xl space-y-6 max-w-3xl mx-auto mt-25 capitalize">
             <h2 className="text-2xl font-bold mb-4">Booking Invoice</h2>
@@ -52,6 +53,20 @@ const Invoice: React.FC<InvoiceProps> = ({ bookingDetails }) => {
                     <p><strong>Special Request:</strong> {bookingDetails.specialRequest}</p>
                 )}
             </div>
+            {bookingDetails.status === "pending" && onConfirm && (
+                <div className="space-y-2 normal-case">
+                    <p className="text-sm text-gray-600">
+                        The room is held for you for a limited time. Confirm the booking to keep it.
+                    </p>
+                    <button
+                        type="button"
+                        onClick={onConfirm}
+                        className="px-4 py-2 rounded-lg bg-black text-white hover:opacity-90 transition"
+                    >
+                        Confirm booking
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
@@ -1,6 +1,12 @@
 import { useEffect, useState } from "react";
 import { getCurrentUser, updateCurrentUser, logoutUser } from "../../services/authUser";
-import { fetchUserBookings, type UserBooking } from "../../services/hotelApi";
+import {
+  confirmBooking,
+  fetchBookingSummary,
+  fetchUserBookings,
+  type BookingSummary,
+  type UserBooking,
+} from "../../services/hotelApi";
 
 export default function Profile() {
   const [form, setForm] = useState<{ username: string; email: string; avatar?: string | null }>({
@@ -15,21 +21,29 @@ export default function Profile() {
   const [success, setSuccess] = useState<string | null>(null);
   const [bookings, setBookings] = useState<UserBooking[]>([]);
   const [bookingsLoading, setBookingsLoading] = useState(true);
+  const [bookingsPage, setBookingsPage] = useState(1);
+  const [hasMoreBookings, setHasMoreBookings] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [summary, setSummary] = useState<BookingSummary | null>(null);
 
   useEffect(() => {
     const load = async () => {
       try {
         const token = localStorage.getItem("token");
-        const [me, bookingsData] = await Promise.all([
+        const emptyPage = { count: 0, next: null, results: [] };
+        const [me, bookingsData, summaryData] = await Promise.all([
           getCurrentUser(),
-          token ? fetchUserBookings(token).catch(() => []) : Promise.resolve([]),
+          token ? fetchUserBookings(token).catch(() => emptyPage) : Promise.resolve(emptyPage),
+          token ? fetchBookingSummary(token).catch(() => null) : Promise.resolve(null),
         ]);
         setForm({
           username: me?.username || "",
           email: me?.email || "",
           avatar: me?.avatar || null,
         });
-        setBookings(bookingsData);
+        setBookings(bookingsData.results);
+        setHasMoreBookings(Boolean(bookingsData.next));
+        setSummary(summaryData);
       } catch (err: any) {
         setError(err?.message || "Unable to load profile.");
       } finally {
@@ -40,6 +54,35 @@ export default function Profile() {
     load();
   }, []);
 
+  const loadMoreBookings = async () => {
+    const token = localStorage.getItem("token");
+    if (!token) return;
+    setLoadingMore(true);
+    try {
+      const nextPage = bookingsPage + 1;
+      const data = await fetchUserBookings(token, nextPage);
+      setBookings((prev) => [...prev, ...data.results]);
+      setBookingsPage(nextPage);
+      setHasMoreBookings(Boolean(data.next));
+    } catch (err: any) {
+      setError(err?.message || "Unable to load more bookings.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleConfirm = async (id: number) => {
+    const token = localStorage.getItem("token");
+    if (!token) return;
+    setError(null);
+    try {
+      const updated = await confirmBooking(id, token);
+      setBookings((prev) => prev.map((booking) => (booking.id === id ? { ...booking, status: updated.status } : booking)));
+    } catch (err: any) {
+      setError(err?.message || "Unable to confirm booking.");
+    }
+  };
+
   const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const { name, value } = e.target;
     setForm((prev) => ({ ...prev, [name]: value }));
@@ -76,6 +119,7 @@ export default function Profile() {
       case "confirmed":
         return "bg-green-100 text-green-700 border-green-200";
       case "cancelled":
+      case "expired":
         return "bg-red-100 text-red-700 border-red-200";
       case "pending":
         return "bg-yellow-100 text-yellow-700 border-yellow-200";
@@ -160,6 +204,44 @@ export default function Profile() {
           </form>
         </div>
 
+        {/* Booking Summary Section */}
+        {summary && summary.total_bookings > 0 && (
+          <div className="w-full bg-white shadow-lg rounded-2xl p-6 sm:p-8">
+            <h2 className="text-2xl font-bold mb-4 text-[var(--color-primary)]">Your Stays</h2>
+            <div className="grid grid-cols-1 sm:grid-cols-3 gap-4 mb-4">
+              <div className="border border-[var(--color-border)] rounded-xl p-4">
+                <p className="text-xs text-[var(--color-secondary)]">Bookings</p>
+                <p className="text-2xl font-semibold">{summary.total_bookings}</p>
+              </div>
+              <div className="border border-[var(--color-border)] rounded-xl p-4">
+                <p className="text-xs text-[var(--color-secondary)]">Nights</p>
+                <p className="text-2xl font-semibold">{summary.total_nights}</p>
+              </div>
+              <div className="border border-[var(--color-border)] rounded-xl p-4">
+                <p className="text-xs text-[var(--color-secondary)]">Total spend</p>
+                <p className="text-2xl font-semibold">NPR {Number(summary.total_spend).toLocaleString()}</p>
+              </div>
+            </div>
+            {summary.upcoming.length > 0 && (
+              <div className="text-sm text-[var(--color-secondary)] space-y-1">
+                <p className="font-medium">Upcoming ({summary.upcoming_count})</p>
+                {summary.upcoming.map((stay) => (
+                  <p key={stay.id}>
+                    Room {stay.room_number} - {new Date(stay.check_in).toLocaleDateString()} to{" "}
+                    {new Date(stay.check_out).toLocaleDateString()}
+                  </p>
+                ))}
+              </div>
+            )}
+            {summary.last_stay && (
+              <p className="text-xs text-gray-400 mt-3">
+                Last stay: Room {summary.last_stay.room_number}, checked out{" "}
+                {new Date(summary.last_stay.check_out).toLocaleDateString()}
+              </p>
+            )}
+          </div>
+        )}
+
         {/* Booking History Section */}
         <div className="w-full bg-white shadow-lg rounded-2xl p-6 sm:p-8">
           <h2 className="text-2xl font-bold mb-2 text-[var(--color-primary)]">Booking History</h2>
@@ -204,6 +286,15 @@ export default function Profile() {
                           Created: {new Date(booking.created_at).toLocaleString()}
                         </p>
                       </div>
+                      {booking.status === "pending" && (
+                        <button
+                          type="button"
+                          onClick={() => handleConfirm(booking.id)}
+                          className="mt-3 px-4 py-2 rounded-lg bg-black text-white text-sm hover:opacity-90 transition"
+                        >
+                          Confirm booking
+                        </button>
+                      )}
                     </div>
                     {booking.room_detail?.image && (
                       <div className="sm:w-32 w-full h-32 sm:h-auto">
@@ -217,6 +308,16 @@ export default function Profile() {
                   </div>
                 </div>
               ))}
+              {hasMoreBookings && (
+                <button
+                  type="button"
+                  onClick={loadMoreBookings}
+                  disabled={loadingMore}
+                  className="w-full px-4 py-2 rounded-lg border border-[var(--color-border)] text-sm hover:bg-gray-50 transition disabled:opacity-60"
+                >
+                  {loadingMore ? "Loading..." : "Load more"}
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -104,6 +104,22 @@ export const fetchRoomById = async (id: number): Promise<Room | null> => {
   }
 };
 
+export const confirmBooking = async (id: number, token: string) => {
+  if (!token) throw new Error("You need to log in first.");
+  return apiFetch(`/bookings/${id}/confirm/`, {
+    method: "POST",
+    headers: buildHeaders({ Authorization: `Bearer ${token}` }),
+  });
+};
+
+export const acceptWaitlistOffer = async (id: number, token: string) => {
+  if (!token) throw new Error("You need to log in first.");
+  return apiFetch(`/waitlist/${id}/accept/`, {
+    method: "POST",
+    headers: buildHeaders({ Authorization: `Bearer ${token}` }),
+  });
+};
+
 type BookingPayload = {
   roomId: number;
   checkIn: string;
@@ -175,8 +191,6 @@ export const createRoom = async (payload: Partial<Room>, token: string) => {
   if (payload.view) form.append("view", payload.view);
   if (payload.checkIn) form.append("check_in", payload.checkIn);
   if (payload.checkOut) form.append("check_out", payload.checkOut);
-  if (payload.rating !== undefined) form.append("rating", String(payload.rating));
-  if (payload.reviewsCount !== undefined) form.append("reviews_count", String(payload.reviewsCount));
   if (payload.cancellationPolicy) form.append("cancellation_policy", payload.cancellationPolicy);
   if (payload.roomService) form.append("room_service", payload.roomService);
   form.append("breakfast_included", String(payload.breakfastIncluded ?? false));
@@ -224,8 +238,6 @@ export const updateRoom = async (id: number, payload: Partial<Room>, token: stri
   if (payload.view) form.append("view", payload.view);
   if (payload.checkIn) form.append("check_in", payload.checkIn);
   if (payload.checkOut) form.append("check_out", payload.checkOut);
-  if (payload.rating !== undefined) form.append("rating", String(payload.rating));
-  if (payload.reviewsCount !== undefined) form.append("reviews_count", String(payload.reviewsCount));
   if (payload.cancellationPolicy) form.append("cancellation_policy", payload.cancellationPolicy);
   if (payload.roomService) form.append("room_service", payload.roomService);
   form.append("breakfast_included", String(payload.breakfastIncluded ?? false));
@@ -324,13 +336,47 @@ export type AdminBooking = {
   created_at: string;
 };
 
-export const fetchUserBookings = async (token: string): Promise<UserBooking[]> => {
+export type UserBookingPage = {
+  count: number;
+  next: string | null;
+  results: UserBooking[];
+};
+
+export const fetchUserBookings = async (token: string, page = 1): Promise<UserBookingPage> => {
   if (!token) throw new Error("Login required.");
-  const data = await apiFetch("/bookings/", {
+  const data = await apiFetch(`/bookings/?page=${page}`, {
     headers: buildHeaders({ Authorization: `Bearer ${token}` }),
   });
-  if (!Array.isArray(data)) return [];
-  return data as UserBooking[];
+  if (!data || !Array.isArray(data.results)) return { count: 0, next: null, results: [] };
+  return data as UserBookingPage;
+};
+
+export type BookingSummaryStay = {
+  id: number;
+  room: number;
+  room_number: string;
+  room_type: string;
+  check_in: string;
+  check_out: string;
+  guests: number;
+  status: string;
+};
+
+export type BookingSummary = {
+  total_bookings: number;
+  total_nights: number;
+  total_spend: string;
+  upcoming_count: number;
+  upcoming: BookingSummaryStay[];
+  last_stay: BookingSummaryStay | null;
+};
+
+export const fetchBookingSummary = async (token: string): Promise<BookingSummary | null> => {
+  if (!token) throw new Error("Login required.");
+  const data = await apiFetch("/auth/me/summary/", {
+    headers: buildHeaders({ Authorization: `Bearer ${token}` }),
+  });
+  return (data as BookingSummary) || null;
 };
 
 export const fetchAdminBookings = async (token: string): Promise<AdminBooking[]> => {
@@ -442,6 +488,67 @@ export const fetchContactMessages = async (token: string): Promise<ContactMessag
   return data as ContactMessage[];
 };
 
+export type OverviewBooking = {
+  id: number;
+  guest: string;
+  room_number: string;
+  check_in: string;
+  check_out: string;
+  guests: number;
+  status: string;
+  created_at: string;
+};
+
+export type AdminOverview = {
+  date: string;
+  counts: {
+    rooms: number;
+    available_rooms: number;
+    gallery_images: number;
+    featured_images: number;
+    bookings: number;
+    bookings_by_status: Record<string, number>;
+    users: number;
+    team_members: number;
+    messages: number;
+    unread_messages: number;
+    in_house: number;
+  };
+  arrivals: { count: number; results: OverviewBooking[] };
+  departures: { count: number; results: OverviewBooking[] };
+  recent_bookings: OverviewBooking[];
+  unread_messages: Pick<ContactMessage, "id" | "name" | "email" | "subject" | "created_at">[];
+};
+
+export const fetchAdminOverview = async (token: string): Promise<AdminOverview> => {
+  if (!token) throw new Error("Login required.");
+  return apiFetch("/admin/overview/", {
+    headers: buildHeaders({ Authorization: `Bearer ${token}` }),
+  });
+};
+
+export type ForecastCounts = {
+  on_the_books: number;
+  projected: number;
+  occupancy: number | null;
+};
+
+export type OccupancyForecast = {
+  hotel: string;
+  date: string;
+  history_days: number;
+  horizon_days: number;
+  rooms: Record<string, number>;
+  nights: (ForecastCounts & { date: string; room_types: Record<string, ForecastCounts> })[];
+};
+
+export const fetchOccupancyForecast = async (token: string): Promise<OccupancyForecast> => {
+  if (!token) throw new Error("Login required.");
+  return apiFetch("/admin/forecast/", {
+    headers: buildHeaders({ Authorization: `Bearer ${token}` }),
+  });
+};
+
 export const markMessageAsRead = async (id: number, token: string) => {
   if (!token) throw new Error("Login required.");
   return apiFetch(`/admin/messages/${id}/`, {
@@ -458,3 +565,94 @@ export const deleteContactMessage = async (id: number, token: string) => {
     headers: buildHeaders({ Authorization: `Bearer ${token}` }),
   });
 };
+
+export type ChangeEvent = {
+  id: number;
+  topic: "booking" | "room" | "message";
+  // "archive": moved to the archive tables, gone from the live lists
+  action: "upsert" | "delete" | "archive";
+  data: { id: number } & Record<string, unknown>;
+};
+
+type ChangeHandlers = {
+  onEvent: (event: ChangeEvent) => void;
+  // The server pruned events we never saw: reload everything
+  onReset?: () => void;
+};
+
+const RECONNECT_DELAY = 3000;
+
+// Follow /changes/ as Server-Sent Events. fetch() rather than EventSource so
+// the JWT can go in the Authorization header. Reconnects with the last
+// event id until the returned function is called.
+export const subscribeChanges = (token: string, { onEvent, onReset }: ChangeHandlers) => {
+  const controller = new AbortController();
+  let lastEventId = "";
+
+  const handleBlock = (block: string) => {
+    let event = "message";
+    let data = "";
+    for (const line of block.split("\n")) {
+      if (line.startsWith("id:")) lastEventId = line.slice(3).trim();
+      else if (line.startsWith("event:")) event = line.slice(6).trim();
+      else if (line.startsWith("data:")) data += line.slice(5).trim();
+    }
+    if (event === "reset") onReset?.();
+    else if (data && event !== "error") onEvent(JSON.parse(data) as ChangeEvent);
+  };
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const headers: Record<string, string> = { Accept: "text/event-stream" };
+        if (token) headers.Authorization = `Bearer ${token}`;
+        if (lastEventId) headers["Last-Event-ID"] = lastEventId;
+        const response = await fetch(`${API_BASE_URL}/changes/`, { headers, signal: controller.signal });
+        if (!response.ok || !response.body) throw new Error(`Change feed unavailable (${response.status}).`);
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          const blocks = buffer.split("\n\n");
+          buffer = blocks.pop() ?? "";
+          blocks.forEach(handleBlock);
+        }
+      } catch {
+        if (controller.signal.aborted) return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+};
+
+export type BatchCall = {
+  method?: "GET" | "HEAD" | "POST" | "PUT" | "PATCH" | "DELETE";
+  // Same form as apiFetch endpoints, e.g. "/rooms/?fields=id,number"
+  path: string;
+  body?: unknown;
+  headers?: Record<string, string>;
+};
+
+export type BatchResult<T = unknown> = {
+  status: number;
+  headers: Record<string, string>;
+  body: T;
+};
+
+// Several API calls in one round trip through /batch/. Results come back in
+// order; each carries its own status, so check it rather than relying on
+// the batch succeeding as a whole.
+export const batchRequests = async (calls: BatchCall[], token?: string): Promise<BatchResult[]> => {
+  const data = await apiFetch("/batch/", {
+    method: "POST",
+    headers: buildHeaders(token ? { Authorization: `Bearer ${token}` } : {}),
+    body: JSON.stringify({ requests: calls.map((call) => ({ ...call, path: `/api${call.path}` })) }),
+  });
+  return data.responses;
+};